@@ -2,6 +2,7 @@ import uuid
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from dataclasses import dataclass, asdict
+from typing import Sequence
 
 from issue_solver.models.supported_models import VersionedAIModel
 
@@ -24,9 +25,38 @@ class AgentMessageStore(ABC):
         pass
 
     @abstractmethod
-    async def get(self, process_id) -> list[AgentMessage]:
+    async def append_many(
+        self, process_id: str, messages: Sequence[AgentMessage]
+    ) -> None:
+        """Store messages built ahead of time, keeping their ids and order."""
         pass
 
+    @abstractmethod
+    async def get(
+        self, process_id, after: str | None = None, limit: int | None = None
+    ) -> list[AgentMessage]:
+        """Messages of a process in turn order, then append order within a turn.
+
+        `after` is the id of the last message already read, `limit` caps the page size.
+        """
+        pass
+
+    async def flush(self) -> None:
+        """Write messages still buffered, if the store buffers any."""
+
+
+def to_agent_message(
+    message_id: str, model: VersionedAIModel, turn: int, message, agent: str
+) -> AgentMessage:
+    return AgentMessage(
+        id=message_id,
+        type=message.__class__.__name__,
+        turn=turn,
+        agent=agent,
+        model=model,
+        payload=message if isinstance(message, dict) else asdict(message),
+    )
+
 
 class InMemoryAgentMessageStore(AgentMessageStore):
     def __init__(self):
@@ -50,6 +80,19 @@ class InMemoryAgentMessageStore(AgentMessageStore):
         )
         return message_id
 
-    async def get(self, process_id) -> list[AgentMessage]:
+    async def append_many(
+        self, process_id: str, messages: Sequence[AgentMessage]
+    ) -> None:
+        self._messages[process_id].extend(messages)
+
+    async def get(
+        self, process_id, after: str | None = None, limit: int | None = None
+    ) -> list[AgentMessage]:
         self._messages = getattr(self, "_messages", {})
-        return self._messages.get(process_id, [])
+        messages = sorted(
+            self._messages.get(process_id, []), key=lambda message: message.turn
+        )
+        if after is not None:
+            ids = [message.id for message in messages]
+            messages = messages[ids.index(after) + 1 :] if after in ids else []
+        return messages[:limit] if limit is not None else messages
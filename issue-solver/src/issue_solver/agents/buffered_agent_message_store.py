@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import uuid
+from typing import Sequence
+
+from issue_solver.agents.agent_message_store import (
+    AgentMessage,
+    AgentMessageStore,
+    to_agent_message,
+)
+from issue_solver.models.supported_models import VersionedAIModel
+
+DEFAULT_MAX_BATCH_SIZE = 50
+DEFAULT_FLUSH_INTERVAL_SECONDS = 1.0
+
+
+class BufferedAgentMessageStore(AgentMessageStore):
+    """Write-behind buffer in front of a message store.
+
+    Appends return as soon as the message is buffered. Buffered messages are written
+    in batches, in append order, once `max_batch_size` of them are pending or
+    `flush_interval_seconds` after the first one. A full buffer makes `append` wait
+    for its batch to be written, so a slow store slows the agent down instead of
+    letting the buffer grow. Call `flush` when the agent run ends.
+    """
+
+    def __init__(
+        self,
+        store: AgentMessageStore,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        flush_interval_seconds: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+        logger: logging.Logger | logging.LoggerAdapter | None = None,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.store = store
+        self.max_batch_size = max_batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.logger = logger or logging.getLogger(__name__)
+        self._pending: list[tuple[str, AgentMessage]] = []
+        self._lock = asyncio.Lock()
+        self._scheduled_flush: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def append(
+        self, process_id: str, model: VersionedAIModel, turn: int, message, agent: str
+    ) -> str:
+        agent_message = to_agent_message(str(uuid.uuid4()), model, turn, message, agent)
+        await self.append_many(process_id, [agent_message])
+        return agent_message.id
+
+    async def append_many(
+        self, process_id: str, messages: Sequence[AgentMessage]
+    ) -> None:
+        self._pending.extend((process_id, message) for message in messages)
+        if len(self._pending) >= self.max_batch_size:
+            await self.flush()
+        elif self._scheduled_flush is None or self._scheduled_flush.done():
+            self._scheduled_flush = asyncio.create_task(self._flush_after_interval())
+
+    async def get(
+        self, process_id, after: str | None = None, limit: int | None = None
+    ) -> list[AgentMessage]:
+        await self.flush()
+        return await self.store.get(process_id, after, limit)
+
+    async def flush(self) -> None:
+        """Write every pending message, one batch per run of messages of the same process.
+
+        Messages stay pending until their batch is written, so a failed flush can be retried.
+        """
+        async with self._lock:
+            while self._pending:
+                process_id = self._pending[0][0]
+                batch: list[AgentMessage] = []
+                for pending_process_id, message in self._pending:
+                    if (
+                        pending_process_id != process_id
+                        or len(batch) == self.max_batch_size
+                    ):
+                        break
+                    batch.append(message)
+                await self.store.append_many(process_id, batch)
+                del self._pending[: len(batch)]
+
+    async def _flush_after_interval(self) -> None:
+        await asyncio.sleep(self.flush_interval_seconds)
+        try:
+            await self.flush()
+        except Exception as e:
+            self.logger.error(f"Failed to flush {self.pending} agent messages: {e}")
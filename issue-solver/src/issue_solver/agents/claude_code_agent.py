@@ -100,3 +100,10 @@ class ClaudeCodeAgent(IssueResolvingAgent):
         except Exception as e:
             logger.error("Claude Code agent failed: %s", e)
             raise RuntimeError(f"Claude Code agent failed: {str(e)}", e)
+        finally:
+            if self.agent_messages:
+                try:
+                    await self.agent_messages.flush()
+                except Exception:
+                    # Raising here would replace the agent's own failure.
+                    logger.exception("Failed to flush agent messages")
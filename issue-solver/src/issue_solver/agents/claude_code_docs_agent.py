@@ -1,3 +1,4 @@
+import logging
 import os
 from pathlib import Path
 from claude_agent_sdk import (
@@ -24,6 +25,8 @@ from issue_solver.models.supported_models import (
     VersionedAIModel,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class ClaudeCodeDocsAgent(DocumentingAgent):
     def __init__(
@@ -101,3 +104,10 @@ class ClaudeCodeDocsAgent(DocumentingAgent):
 
         except Exception as e:
             raise RuntimeError(f"Claude Code agent failed: {str(e)}", e)
+        finally:
+            if self.agent_messages:
+                try:
+                    await self.agent_messages.flush()
+                except Exception:
+                    # Raising here would replace the agent's own failure.
+                    logger.exception("Failed to flush agent messages")
@@ -0,0 +1,65 @@
+import asyncio
+from datetime import UTC, datetime
+
+import boto3
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from issue_solver.database.event_archive import S3EventArchive
+from issue_solver.database.events_store_partitions import (
+    DEFAULT_MONTHS_AHEAD,
+    add_months,
+    cold_partitions,
+    ensure_monthly_partitions,
+)
+from issue_solver.database.postgres_event_store import PostgresEventStore
+from issue_solver.factories import create_database_pool
+
+
+class ArchiveEventsCommand(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+    database_url: str = Field(description="Database URL of the event store.")
+    knowledge_bucket_name: str = Field(
+        description="Bucket receiving the archived events."
+    )
+    months_kept: int = Field(
+        default=6, ge=1, description="Number of past months kept in the database."
+    )
+    months_ahead: int = Field(
+        default=DEFAULT_MONTHS_AHEAD,
+        ge=0,
+        description="Number of monthly partitions created ahead.",
+    )
+
+    def cli_cmd(self) -> None:
+        asyncio.run(main(self))
+
+
+async def main(settings: ArchiveEventsCommand) -> int:
+    pool = await create_database_pool(settings.database_url)
+    try:
+        await ensure_monthly_partitions(pool, settings.months_ahead)
+        event_store = PostgresEventStore(
+            pool,
+            archive=S3EventArchive(
+                s3_client=boto3.client("s3"),
+                bucket_name=settings.knowledge_bucket_name,
+            ),
+        )
+        this_month = datetime.now(UTC).date().replace(day=1)
+        archived = 0
+        for partition_name in await cold_partitions(
+            pool, before=add_months(this_month, 1 - settings.months_kept)
+        ):
+            archived_in_partition = await event_store.archive_partition(partition_name)
+            print(f"[archive-events] {partition_name}: {archived_in_partition} events")
+            archived += archived_in_partition
+    finally:
+        await pool.close()
+    print(f"[archive-events] archived {archived} events")
+    return archived
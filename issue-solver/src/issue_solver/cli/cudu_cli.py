@@ -7,6 +7,10 @@ from issue_solver.cli.prepare_command import PrepareCommand
 from issue_solver.cli.review_command import ReviewSettings
 from issue_solver.cli.solve_command import SolveCommand
 from issue_solver.cli.index_repository_command import IndexRepositoryCommand
+from issue_solver.cli.archive_events_command import ArchiveEventsCommand
+from issue_solver.cli.rebuild_process_summaries_command import (
+    RebuildProcessSummariesCommand,
+)
 
 
 class CuduCLI:
@@ -45,6 +49,18 @@ class CuduCLI:
                     cli_args=sub_args,
                     cli_cmd_method_name="cli_cmd",
                 )
+            elif subcmd == "rebuild-process-summaries":
+                CliApp.run(
+                    model_cls=RebuildProcessSummariesCommand,
+                    cli_args=sub_args,
+                    cli_cmd_method_name="cli_cmd",
+                )
+            elif subcmd == "archive-events":
+                CliApp.run(
+                    model_cls=ArchiveEventsCommand,
+                    cli_args=sub_args,
+                    cli_cmd_method_name="cli_cmd",
+                )
             elif subcmd in ("help", "-h", "--help"):
                 show_usage()
                 sys.exit(0)
@@ -74,6 +90,8 @@ def show_usage() -> None:
       review   👀 review a pull request or issue
       solve    🧩 solve an issue
       index-repository  🧠 index a repository into a knowledge base (full or delta)
+      rebuild-process-summaries  🧮 rebuild the process summaries from the event store
+      archive-events  🗄️ archive the events of finished processes from cold partitions
       help     🛟 show this message
     
     Examples:
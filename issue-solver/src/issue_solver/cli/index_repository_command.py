@@ -11,7 +11,6 @@ from issue_solver.cli.solve_command_settings import base_settings_to_env_script
 from issue_solver.events.domain import (
     CodeRepositoryIndexed,
     CodeRepositoryIntegrationFailed,
-    most_recent_event,
 )
 from issue_solver.events.event_store import EventStore
 from issue_solver.git_operations.git_helper import (
@@ -167,6 +166,8 @@ async def main(
             ),
         )
         raise
+    finally:
+        await deps.event_store.flush()
     return process_id
 
 
@@ -201,6 +202,7 @@ async def _resolve_from_commit_sha(
     if not settings.process_id:
         return None
 
-    events = await event_store.get(settings.process_id)
-    last_indexed = most_recent_event(events, CodeRepositoryIndexed)
+    last_indexed = await event_store.latest(
+        CodeRepositoryIndexed, process_id=settings.process_id
+    )
     return last_indexed.commit_sha if last_indexed else None
@@ -0,0 +1,35 @@
+import asyncio
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from issue_solver.database.event_archive import init_event_archive
+from issue_solver.database.postgres_event_store import PostgresEventStore
+from issue_solver.factories import create_database_pool
+
+
+class RebuildProcessSummariesCommand(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+    database_url: str = Field(description="Database URL of the event store.")
+    batch_size: int = Field(
+        default=500, description="Number of process streams replayed per batch."
+    )
+
+    def cli_cmd(self) -> None:
+        asyncio.run(main(self))
+
+
+async def main(settings: RebuildProcessSummariesCommand) -> int:
+    pool = await create_database_pool(settings.database_url)
+    try:
+        event_store = PostgresEventStore(pool, archive=init_event_archive())
+        rebuilt = await event_store.rebuild_summaries(batch_size=settings.batch_size)
+    finally:
+        await pool.close()
+    print(f"[rebuild-process-summaries] rebuilt {rebuilt} process summaries")
+    return rebuilt
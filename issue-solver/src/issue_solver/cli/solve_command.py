@@ -81,3 +81,5 @@ async def main(settings: SolveCommandSettings) -> None:
             ),
         )
         raise e
+    finally:
+        await dependencies.event_store.flush()
@@ -1,19 +1,27 @@
-from dataclasses import asdict
+from typing import Sequence
 
 import httpx
 
-from issue_solver.agents.agent_message_store import AgentMessageStore, AgentMessage
+from issue_solver.agents.agent_message_store import (
+    AgentMessageStore,
+    AgentMessage,
+    to_agent_message,
+)
+from issue_solver.cli.webhook_sender import WebhookSender
 from issue_solver.models.supported_models import VersionedAIModel
 from issue_solver.webapi.payloads import AgentMessageNotification
 
 
 class WebhookNotifyingAgentMessageStore(AgentMessageStore):
     def __init__(
-        self, store: AgentMessageStore, messages_webhook_url: str, http_client=httpx
+        self,
+        store: AgentMessageStore,
+        messages_webhook_url: str,
+        http_client: httpx.AsyncClient | None = None,
     ):
-        self.http_client = http_client
         self.store = store
         self.messages_webhook_url = messages_webhook_url
+        self.sender = WebhookSender(messages_webhook_url, http_client)
 
     async def append(
         self, process_id: str, model: VersionedAIModel, turn: int, message, agent: str
@@ -21,21 +29,31 @@ class WebhookNotifyingAgentMessageStore(AgentMessageStore):
         stored_message_id = await self.store.append(
             process_id, model, turn, message, agent
         )
-        self.http_client.post(
-            url=self.messages_webhook_url,
-            json=AgentMessageNotification(
-                process_id=process_id,
-                agent_message=AgentMessage(
-                    id=stored_message_id,
-                    payload=message if isinstance(message, dict) else asdict(message),
-                    model=model,
-                    turn=turn,
-                    agent=agent,
-                    type=message.__class__.__name__,
-                ),
-            ).model_dump(mode="json"),
+        await self._notify(
+            process_id,
+            [to_agent_message(stored_message_id, model, turn, message, agent)],
         )
         return stored_message_id
 
-    async def get(self, process_id) -> list[AgentMessage]:
-        return await self.store.get(process_id)
+    async def append_many(
+        self, process_id: str, messages: Sequence[AgentMessage]
+    ) -> None:
+        await self.store.append_many(process_id, messages)
+        await self._notify(process_id, messages)
+
+    async def get(
+        self, process_id, after: str | None = None, limit: int | None = None
+    ) -> list[AgentMessage]:
+        return await self.store.get(process_id, after, limit)
+
+    async def flush(self) -> None:
+        await self.store.flush()
+        await self.sender.flush()
+
+    async def _notify(self, process_id: str, messages: Sequence[AgentMessage]) -> None:
+        for agent_message in messages:
+            await self.sender.send(
+                AgentMessageNotification(
+                    process_id=process_id, agent_message=agent_message
+                ).model_dump(mode="json")
+            )
@@ -1,30 +1,122 @@
-from typing import Any, Type
+from typing import Any, AsyncGenerator, Collection, Sequence, Type
 
 import httpx
 
+from issue_solver.cli.webhook_sender import WebhookSender
+from issue_solver.events.credentials import (
+    IntegrationConnected,
+    IntegrationCredentials,
+)
 from issue_solver.events.domain import AnyDomainEvent, T
-from issue_solver.events.event_store import EventStore
+from issue_solver.events.event_store import (
+    DEFAULT_READ_ALL_BATCH_SIZE,
+    LOG_START,
+    EventStore,
+    GlobalPosition,
+    RecordedEvent,
+    StreamCursor,
+    StreamFilter,
+)
+from issue_solver.events.process_summary import ProcessSummary
+from issue_solver.events.snapshots import Snapshot
 from issue_solver.events.serializable_records import serialize
 
 
 class WebhookNotifyingEventStore(EventStore):
     def __init__(
-        self, event_store: EventStore, event_webhook_url: str, http_client=httpx
+        self,
+        event_store: EventStore,
+        event_webhook_url: str,
+        http_client: httpx.AsyncClient | None = None,
     ):
-        self.http_client = http_client
         self.event_store = event_store
         self.event_webhook_url = event_webhook_url
+        self.sender = WebhookSender(event_webhook_url, http_client)
 
-    async def append(self, process_id: str, *events: AnyDomainEvent) -> None:
-        await self.event_store.append(process_id, *events)
+    async def append(
+        self,
+        process_id: str,
+        *events: AnyDomainEvent,
+        expected_version: int | None = None,
+    ) -> None:
+        await self.event_store.append(
+            process_id, *events, expected_version=expected_version
+        )
         for event in events:
-            self.http_client.post(
-                url=self.event_webhook_url,
-                json=serialize(event).model_dump(mode="json"),
-            )
+            await self.sender.send(serialize(event).model_dump(mode="json"))
 
     async def get(self, process_id: str) -> list[AnyDomainEvent]:
         return await self.event_store.get(process_id)
 
+    async def get_since(self, process_id: str, position: int) -> list[AnyDomainEvent]:
+        return await self.event_store.get_since(process_id, position)
+
+    async def get_snapshot(self, process_id: str) -> Snapshot | None:
+        return await self.event_store.get_snapshot(process_id)
+
     async def find(self, criteria: dict[str, Any], event_type: Type[T]) -> list[T]:
         return await self.event_store.find(criteria, event_type)
+
+    async def latest(
+        self,
+        event_type: Type[T],
+        process_id: str | None = None,
+        criteria: dict[str, Any] | None = None,
+    ) -> T | None:
+        return await self.event_store.latest(event_type, process_id, criteria)
+
+    async def get_many(
+        self, process_ids: Collection[str]
+    ) -> dict[str, list[AnyDomainEvent]]:
+        return await self.event_store.get_many(process_ids)
+
+    async def find_streams(
+        self,
+        filters: Sequence[StreamFilter],
+        limit: int | None = None,
+        after: StreamCursor | None = None,
+        offset: int = 0,
+        status: str | None = None,
+    ) -> list[StreamCursor]:
+        return await self.event_store.find_streams(
+            filters, limit, after, offset, status
+        )
+
+    async def count_streams(
+        self, filters: Sequence[StreamFilter], status: str | None = None
+    ) -> int:
+        return await self.event_store.count_streams(filters, status)
+
+    async def get_summaries(
+        self, process_ids: Collection[str]
+    ) -> dict[str, ProcessSummary]:
+        return await self.event_store.get_summaries(process_ids)
+
+    async def get_credentials(
+        self,
+        connected_type: type[IntegrationConnected],
+        space_id: str | None = None,
+        knowledge_base_id: str | None = None,
+    ) -> IntegrationCredentials | None:
+        return await self.event_store.get_credentials(
+            connected_type, space_id, knowledge_base_id
+        )
+
+    def subscribe(
+        self,
+        stream_filter: StreamFilter | None = None,
+        process_id: str | None = None,
+        after_position: int = 0,
+    ) -> AsyncGenerator[AnyDomainEvent, None]:
+        return self.event_store.subscribe(stream_filter, process_id, after_position)
+
+    def read_all(
+        self,
+        from_checkpoint: GlobalPosition = LOG_START,
+        batch_size: int = DEFAULT_READ_ALL_BATCH_SIZE,
+    ) -> AsyncGenerator[RecordedEvent, None]:
+        return self.event_store.read_all(from_checkpoint, batch_size)
+
+    async def flush(self) -> None:
+        await self.event_store.flush()
+        await self.sender.flush()
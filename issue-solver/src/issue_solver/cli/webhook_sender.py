@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import random
+from typing import Any
+
+import httpx
+
+DEFAULT_MAX_QUEUE_SIZE = 1000
+DEFAULT_MAX_BATCH_SIZE = 50
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_RETRY_BASE_DELAY_SECONDS = 0.5
+DEFAULT_TIMEOUT_SECONDS = 10.0
+
+
+class WebhookSender:
+    """Posts payloads to a webhook from a background task, in the order they were sent.
+
+    Payloads waiting in the queue are posted together to the `<url>:batch` endpoint as
+    a JSON array, over one keep-alive connection. Failed posts are retried with
+    exponential backoff and full jitter, then dropped with an error log; items the
+    batch endpoint reports as failed are logged too. `send` only waits when the queue
+    is full. Call `flush` before exiting so nothing is lost.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        http_client: httpx.AsyncClient | None = None,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_base_delay_seconds: float = DEFAULT_RETRY_BASE_DELAY_SECONDS,
+        logger: logging.Logger | logging.LoggerAdapter | None = None,
+    ):
+        self.url = url
+        self.http_client = http_client
+        self.max_queue_size = max_queue_size
+        self.max_batch_size = max_batch_size
+        self.max_attempts = max_attempts
+        self.retry_base_delay_seconds = retry_base_delay_seconds
+        self.logger = logger or logging.getLogger(__name__)
+        self._owns_http_client = http_client is None
+        self._queue: asyncio.Queue[dict[str, Any]] | None = None
+        self._worker: asyncio.Task | None = None
+
+    @property
+    def batch_url(self) -> str:
+        return f"{self.url}:batch"
+
+    async def send(self, payload: dict[str, Any]) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run(self._queue))
+        await self._queue.put(payload)
+
+    async def flush(self) -> None:
+        """Wait for every payload sent so far to be posted, then release the connection."""
+        if self._queue is not None:
+            await self._queue.join()
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        if self._owns_http_client and self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+
+    async def _run(self, queue: asyncio.Queue[dict[str, Any]]) -> None:
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.max_batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await self._post(batch)
+            except Exception as e:
+                self.logger.error(
+                    f"Dropped {len(batch)} payloads for {self.url}: {e!r}"
+                )
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _post(self, batch: list[dict[str, Any]]) -> None:
+        url, body = (self.url, batch[0]) if len(batch) == 1 else (self.batch_url, batch)
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                response = await self._http_client().post(url=url, json=body)
+                response.raise_for_status()
+                if body is batch:
+                    self._log_failed_items(response)
+                return
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code < 500 or attempt == self.max_attempts:
+                    self.logger.error(f"Dropped {len(batch)} payloads for {url}: {e}")
+                    return
+            except httpx.HTTPError as e:
+                if attempt == self.max_attempts:
+                    self.logger.error(f"Dropped {len(batch)} payloads for {url}: {e!r}")
+                    return
+            await asyncio.sleep(
+                random.uniform(0, self.retry_base_delay_seconds * 2 ** (attempt - 1))
+            )
+
+    def _log_failed_items(self, response: httpx.Response) -> None:
+        try:
+            statuses = response.json()
+        except ValueError:
+            return
+        if not isinstance(statuses, list):
+            return
+        failures = [
+            status
+            for status in statuses
+            if isinstance(status, dict) and status.get("status") == "failed"
+        ]
+        if failures:
+            self.logger.error(
+                f"{len(failures)} payloads were not published by {self.batch_url}: {failures}"
+            )
+
+    def _http_client(self) -> httpx.AsyncClient:
+        if self.http_client is None:
+            self.http_client = httpx.AsyncClient(timeout=DEFAULT_TIMEOUT_SECONDS)
+        return self.http_client
@@ -0,0 +1,89 @@
+import asyncio
+import gzip
+import json
+import os
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+
+import boto3
+from botocore.client import BaseClient
+
+EVENTS_ARCHIVE_PREFIX = "events-archive"
+# Only streams whose later events no `latest` or `find` lookup needs: documentation
+# generations stay, their completions tell the previous version of each document.
+ARCHIVABLE_PROCESS_STATUSES: dict[str, tuple[str, ...]] = {
+    "issue_resolution": ("completed", "failed"),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ArchivedEvent:
+    position: int
+    event_type: str
+    data: str
+
+
+class EventArchive(ABC):
+    """Cold storage for the events of finished processes, one object per stream and partition."""
+
+    @abstractmethod
+    async def write(self, object_key: str, events: list[ArchivedEvent]) -> None:
+        pass
+
+    @abstractmethod
+    async def read(self, object_key: str) -> list[ArchivedEvent]:
+        pass
+
+
+class InMemoryEventArchive(EventArchive):
+    def __init__(self):
+        self.objects: dict[str, list[ArchivedEvent]] = {}
+
+    async def write(self, object_key: str, events: list[ArchivedEvent]) -> None:
+        self.objects[object_key] = list(events)
+
+    async def read(self, object_key: str) -> list[ArchivedEvent]:
+        return self.objects[object_key]
+
+
+class S3EventArchive(EventArchive):
+    """Stores each archived stream chunk as gzipped JSON lines."""
+
+    def __init__(
+        self,
+        s3_client: BaseClient,
+        bucket_name: str,
+        prefix: str = EVENTS_ARCHIVE_PREFIX,
+    ) -> None:
+        self.s3_client = s3_client
+        self.bucket_name = bucket_name
+        self.prefix = prefix
+
+    async def write(self, object_key: str, events: list[ArchivedEvent]) -> None:
+        body = gzip.compress(
+            "".join(json.dumps(asdict(event)) + "\n" for event in events).encode()
+        )
+        await asyncio.to_thread(
+            self.s3_client.put_object,
+            Bucket=self.bucket_name,
+            Key=f"{self.prefix}/{object_key}",
+            Body=body,
+            ContentType="application/gzip",
+        )
+
+    async def read(self, object_key: str) -> list[ArchivedEvent]:
+        response = await asyncio.to_thread(
+            self.s3_client.get_object,
+            Bucket=self.bucket_name,
+            Key=f"{self.prefix}/{object_key}",
+        )
+        lines = gzip.decompress(response["Body"].read()).decode().splitlines()
+        return [ArchivedEvent(**json.loads(line)) for line in lines if line]
+
+
+def init_event_archive() -> EventArchive | None:
+    """Archive in the knowledge bucket, when one is configured."""
+    bucket_name = os.environ.get("KNOWLEDGE_BUCKET_NAME")
+    if not bucket_name:
+        return None
+    return S3EventArchive(s3_client=boto3.client("s3"), bucket_name=bucket_name)
@@ -0,0 +1,50 @@
+import re
+from datetime import UTC, date, datetime
+
+import asyncpg
+
+PARTITION_NAME_PATTERN = re.compile(r"^events_store_(\d{4})_(\d{2})$")
+DEFAULT_MONTHS_AHEAD = 3
+
+
+async def ensure_monthly_partitions(
+    pool: asyncpg.Pool,
+    months_ahead: int = DEFAULT_MONTHS_AHEAD,
+    today: date | None = None,
+) -> list[str]:
+    """Create the partitions of this month and the next ones, if missing.
+
+    Appends outside of every monthly partition land in the default one, which is never
+    archived: run this at least monthly.
+    """
+    today = today or datetime.now(UTC).date()
+    months = [add_months(today.replace(day=1), i) for i in range(months_ahead + 1)]
+    return [
+        await pool.fetchval("SELECT ensure_events_store_partition($1)", month)
+        for month in months
+    ]
+
+
+async def cold_partitions(pool: asyncpg.Pool, before: date) -> list[str]:
+    """Monthly partitions whose whole month is before the given day, oldest first."""
+    rows = await pool.fetch(
+        """
+        SELECT inhrelid::regclass::text AS partition_name
+        FROM pg_inherits
+        WHERE inhparent = 'events_store'::regclass
+        """
+    )
+    partitions = []
+    for row in rows:
+        match = PARTITION_NAME_PATTERN.match(row["partition_name"])
+        if match is None:
+            continue
+        month = date(int(match[1]), int(match[2]), 1)
+        if add_months(month, 1) <= before:
+            partitions.append((month, row["partition_name"]))
+    return [partition_name for _, partition_name in sorted(partitions)]
+
+
+def add_months(month: date, months: int) -> date:
+    year, month_index = divmod(month.month - 1 + months, 12)
+    return month.replace(year=month.year + year, month=month_index + 1)
@@ -0,0 +1,39 @@
+"""index events store lookup keys
+
+Revision ID: 76f71adb26c2
+Revises: 7f2fb0a5222d
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "76f71adb26c2"
+down_revision: Union[str, None] = "7f2fb0a5222d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LOOKUP_KEYS = ["knowledge_base_id", "space_id", "prompt_id", "user_id"]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE INDEX idx_events_store_event_type ON events_store (event_type);
+    """)
+    for key in LOOKUP_KEYS:
+        op.execute(f"""
+            CREATE INDEX idx_events_store_{key}
+                ON events_store (event_type, (data->>'{key}'));
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for key in LOOKUP_KEYS:
+        op.execute(f"DROP INDEX IF EXISTS idx_events_store_{key};")
+    op.execute("DROP INDEX IF EXISTS idx_events_store_event_type;")
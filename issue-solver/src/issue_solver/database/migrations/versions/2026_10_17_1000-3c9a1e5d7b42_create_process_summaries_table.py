@@ -0,0 +1,45 @@
+"""create process summaries table
+
+Revision ID: 3c9a1e5d7b42
+Revises: 76f71adb26c2
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c9a1e5d7b42"
+down_revision: Union[str, None] = "76f71adb26c2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE TABLE process_summaries (
+                process_id         VARCHAR PRIMARY KEY,
+                type               VARCHAR NOT NULL,
+                status             VARCHAR NOT NULL,
+                run_id             VARCHAR,
+                space_id           VARCHAR,
+                knowledge_base_id  VARCHAR,
+                created_at         TIMESTAMP WITH TIME ZONE NOT NULL,
+                updated_at         TIMESTAMP WITH TIME ZONE NOT NULL,
+                event_count        INTEGER NOT NULL
+        );
+    """)
+    op.execute("""
+        CREATE INDEX idx_process_summaries_status ON process_summaries (status);
+    """)
+    # Existing streams are summarised by `cudu rebuild-process-summaries`, run after
+    # the upgrade, so that `ProcessSummary` stays the only definition of the projection.
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS process_summaries;")
@@ -0,0 +1,36 @@
+"""create events snapshots table
+
+Revision ID: a4e7c2f9d813
+Revises: 3c9a1e5d7b42
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4e7c2f9d813"
+down_revision: Union[str, None] = "3c9a1e5d7b42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE TABLE events_snapshots (
+                process_id  VARCHAR NOT NULL,
+                position    BIGINT  NOT NULL,
+                events      JSONB   NOT NULL,
+                created_at  TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP NOT NULL,
+                PRIMARY KEY (process_id, position)
+        );
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS events_snapshots;")
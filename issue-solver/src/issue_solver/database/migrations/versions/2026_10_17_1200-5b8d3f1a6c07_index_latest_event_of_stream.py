@@ -0,0 +1,31 @@
+"""index latest event of stream
+
+Revision ID: 5b8d3f1a6c07
+Revises: a4e7c2f9d813
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b8d3f1a6c07"
+down_revision: Union[str, None] = "a4e7c2f9d813"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE INDEX idx_events_store_stream_event_type
+            ON events_store (activity_id, event_type, occured_at DESC);
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS idx_events_store_stream_event_type;")
@@ -0,0 +1,35 @@
+"""add events outbox
+
+Revision ID: 9d2b6e4f1c83
+Revises: 5b8d3f1a6c07
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9d2b6e4f1c83"
+down_revision: Union[str, None] = "5b8d3f1a6c07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE TABLE events_outbox (
+            id BIGSERIAL PRIMARY KEY,
+            process_id VARCHAR NOT NULL,
+            body TEXT NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+        );
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS events_outbox;")
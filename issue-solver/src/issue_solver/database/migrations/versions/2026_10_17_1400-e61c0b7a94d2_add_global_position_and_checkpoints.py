@@ -0,0 +1,74 @@
+"""add global position and checkpoints
+
+Revision ID: e61c0b7a94d2
+Revises: 9d2b6e4f1c83
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e61c0b7a94d2"
+down_revision: Union[str, None] = "9d2b6e4f1c83"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE SEQUENCE events_store_global_position_seq AS BIGINT;")
+    op.execute("""
+        ALTER TABLE events_store
+            ADD COLUMN global_position BIGINT,
+            ADD COLUMN transaction_id  XID8 NOT NULL DEFAULT '0';
+    """)
+    op.execute("""
+        UPDATE events_store
+        SET global_position = ordered.global_position
+        FROM (SELECT event_id,
+                     ROW_NUMBER() OVER (ORDER BY occured_at, activity_id, position) AS global_position
+              FROM events_store) AS ordered
+        WHERE events_store.event_id = ordered.event_id;
+    """)
+    op.execute("""
+        SELECT setval('events_store_global_position_seq',
+                      COALESCE((SELECT MAX(global_position) FROM events_store), 0) + 1,
+                      false);
+    """)
+    op.execute("""
+        ALTER SEQUENCE events_store_global_position_seq
+            OWNED BY events_store.global_position;
+    """)
+    # Readers only see a position once every transaction that could take a lower one ended.
+    op.execute("""
+        ALTER TABLE events_store
+            ALTER COLUMN global_position SET DEFAULT nextval('events_store_global_position_seq'),
+            ALTER COLUMN global_position SET NOT NULL,
+            ALTER COLUMN transaction_id SET DEFAULT pg_current_xact_id();
+    """)
+    op.execute("""
+        CREATE UNIQUE INDEX idx_events_store_global_position
+            ON events_store (global_position);
+    """)
+    op.execute("""
+        CREATE TABLE event_checkpoints (
+            subscriber_name VARCHAR PRIMARY KEY,
+            position        BIGINT NOT NULL,
+            updated_at      TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+        );
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS event_checkpoints;")
+    op.execute("DROP INDEX IF EXISTS idx_events_store_global_position;")
+    op.execute("""
+        ALTER TABLE events_store
+            DROP COLUMN IF EXISTS transaction_id,
+            DROP COLUMN IF EXISTS global_position;
+    """)
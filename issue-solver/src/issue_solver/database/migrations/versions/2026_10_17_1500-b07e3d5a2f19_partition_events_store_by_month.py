@@ -0,0 +1,163 @@
+"""partition events store by month
+
+Revision ID: b07e3d5a2f19
+Revises: e61c0b7a94d2
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b07e3d5a2f19"
+down_revision: Union[str, None] = "e61c0b7a94d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LOOKUP_KEYS = ["knowledge_base_id", "space_id", "prompt_id", "user_id"]
+MONTHS_CREATED_AHEAD = 3
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TABLE events_store RENAME TO events_store_unpartitioned;")
+    op.execute("ALTER SEQUENCE events_store_global_position_seq OWNED BY NONE;")
+    op.execute("""
+        CREATE TABLE events_store (
+                event_id           VARCHAR NOT NULL,
+                activity_id        VARCHAR NOT NULL,
+                position           BIGINT  NOT NULL,
+                event_type         VARCHAR NOT NULL,
+                data               JSONB   NOT NULL,
+                metadata           JSONB   DEFAULT '{}'::jsonb,
+                occured_at         TIMESTAMP WITH TIME ZONE NOT NULL,
+                global_position    BIGINT  NOT NULL DEFAULT nextval('events_store_global_position_seq'),
+                transaction_id     XID8    NOT NULL DEFAULT pg_current_xact_id()
+        ) PARTITION BY RANGE (occured_at);
+    """)
+    op.execute("CREATE TABLE events_store_default PARTITION OF events_store DEFAULT;")
+    # Creates the partition of a month, moving in the events the default partition got for it.
+    op.execute("""
+        CREATE FUNCTION ensure_events_store_partition(month DATE) RETURNS TEXT AS $$
+        DECLARE
+            partition_name TEXT := format('events_store_%s', to_char(month, 'YYYY_MM'));
+            range_start    TIMESTAMP WITH TIME ZONE := date_trunc('month', month::timestamp) AT TIME ZONE 'UTC';
+            range_end      TIMESTAMP WITH TIME ZONE := (date_trunc('month', month::timestamp) + INTERVAL '1 month') AT TIME ZONE 'UTC';
+        BEGIN
+            IF to_regclass(partition_name) IS NOT NULL THEN
+                RETURN partition_name;
+            END IF;
+            EXECUTE format('CREATE TABLE %I (LIKE events_store INCLUDING DEFAULTS)', partition_name);
+            EXECUTE format(
+                'WITH moved AS (DELETE FROM events_store_default WHERE occured_at >= $1 AND occured_at < $2 RETURNING *)
+                 INSERT INTO %I SELECT * FROM moved',
+                partition_name) USING range_start, range_end;
+            EXECUTE format('ALTER TABLE events_store ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                           partition_name, range_start, range_end);
+            RETURN partition_name;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute(f"""
+        SELECT ensure_events_store_partition(month::date)
+        FROM generate_series(
+                date_trunc('month', COALESCE((SELECT MIN(occured_at) FROM events_store_unpartitioned), NOW()) AT TIME ZONE 'UTC'),
+                date_trunc('month', NOW() AT TIME ZONE 'UTC') + INTERVAL '{MONTHS_CREATED_AHEAD} months',
+                INTERVAL '1 month') AS month;
+    """)
+    op.execute("""
+        INSERT INTO events_store (event_id, activity_id, position, event_type, data, metadata,
+                                  occured_at, global_position, transaction_id)
+        SELECT event_id, activity_id, position, event_type, data, metadata,
+               occured_at, global_position, transaction_id
+        FROM events_store_unpartitioned;
+    """)
+    op.execute("DROP TABLE events_store_unpartitioned;")
+    op.execute("""
+        ALTER SEQUENCE events_store_global_position_seq
+            OWNED BY events_store.global_position;
+    """)
+    # Unique constraints must hold the partition key: appends lock their stream instead.
+    op.execute("ALTER TABLE events_store ADD PRIMARY KEY (event_id, occured_at);")
+    _create_indexes(stream_index_columns="activity_id, position")
+    op.execute("""
+        CREATE UNIQUE INDEX idx_events_store_global_position
+            ON events_store (global_position, occured_at);
+    """)
+    op.execute("""
+        CREATE TABLE events_archive (
+            process_id      VARCHAR NOT NULL,
+            first_position  BIGINT NOT NULL,
+            last_position   BIGINT NOT NULL,
+            object_key      VARCHAR NOT NULL,
+            archived_at     TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (process_id, first_position)
+        );
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS events_archive;")
+    op.execute("ALTER TABLE events_store RENAME TO events_store_partitioned;")
+    op.execute("ALTER SEQUENCE events_store_global_position_seq OWNED BY NONE;")
+    op.execute("""
+        CREATE TABLE events_store (
+                event_id           VARCHAR NOT NULL,
+                activity_id        VARCHAR NOT NULL,
+                position           BIGINT  NOT NULL,
+                event_type         VARCHAR NOT NULL,
+                data               JSONB   NOT NULL,
+                metadata           JSONB   DEFAULT '{}'::jsonb,
+                occured_at         TIMESTAMP WITH TIME ZONE NOT NULL,
+                global_position    BIGINT  NOT NULL DEFAULT nextval('events_store_global_position_seq'),
+                transaction_id     XID8    NOT NULL DEFAULT pg_current_xact_id()
+        );
+    """)
+    op.execute("""
+        INSERT INTO events_store (event_id, activity_id, position, event_type, data, metadata,
+                                  occured_at, global_position, transaction_id)
+        SELECT event_id, activity_id, position, event_type, data, metadata,
+               occured_at, global_position, transaction_id
+        FROM events_store_partitioned;
+    """)
+    op.execute("DROP TABLE events_store_partitioned;")
+    op.execute("DROP FUNCTION IF EXISTS ensure_events_store_partition(DATE);")
+    op.execute("""
+        ALTER SEQUENCE events_store_global_position_seq
+            OWNED BY events_store.global_position;
+    """)
+    op.execute("""
+        ALTER TABLE events_store
+            ADD PRIMARY KEY (event_id),
+            ADD UNIQUE (activity_id, position);
+    """)
+    _create_indexes(stream_index_columns="activity_id")
+    op.execute("""
+        CREATE UNIQUE INDEX idx_events_store_global_position
+            ON events_store (global_position);
+    """)
+
+
+def _create_indexes(stream_index_columns: str) -> None:
+    op.execute(f"""
+        CREATE INDEX idx_events_store_stream_id ON events_store ({stream_index_columns});
+    """)
+    op.execute("""
+        CREATE INDEX idx_events_store_created_at ON events_store (occured_at);
+    """)
+    op.execute("""
+        CREATE INDEX idx_events_store_event_type ON events_store (event_type);
+    """)
+    for key in LOOKUP_KEYS:
+        op.execute(f"""
+            CREATE INDEX idx_events_store_{key}
+                ON events_store (event_type, (data->>'{key}'));
+        """)
+    op.execute("""
+        CREATE INDEX idx_events_store_stream_event_type
+            ON events_store (activity_id, event_type, occured_at DESC);
+    """)
@@ -0,0 +1,73 @@
+"""create integration credentials table
+
+Revision ID: c5f1a8e3d270
+Revises: b07e3d5a2f19
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5f1a8e3d270"
+down_revision: Union[str, None] = "b07e3d5a2f19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE TABLE integration_credentials (
+                process_id         VARCHAR PRIMARY KEY,
+                integration_type   VARCHAR NOT NULL,
+                space_id           VARCHAR,
+                knowledge_base_id  VARCHAR,
+                connected_at       TIMESTAMP WITH TIME ZONE NOT NULL,
+                connected          JSONB NOT NULL,
+                rotated            JSONB
+        );
+    """)
+    op.execute("""
+        CREATE INDEX idx_integration_credentials_space
+            ON integration_credentials (integration_type, space_id, connected_at DESC);
+    """)
+    op.execute("""
+        CREATE INDEX idx_integration_credentials_knowledge_base
+            ON integration_credentials (integration_type, knowledge_base_id, connected_at DESC);
+    """)
+    op.execute("""
+        INSERT INTO integration_credentials (process_id, integration_type, space_id,
+                                             knowledge_base_id, connected_at, connected)
+        SELECT DISTINCT ON (activity_id)
+               activity_id,
+               event_type,
+               data->>'space_id',
+               data->>'knowledge_base_id',
+               occured_at,
+               jsonb_build_object('event_type', event_type, 'data', data)
+        FROM events_store
+        WHERE event_type IN ('repository_connected', 'notion_integration_authorized')
+        ORDER BY activity_id, occured_at DESC, position DESC;
+    """)
+    op.execute("""
+        UPDATE integration_credentials AS credentials
+        SET rotated = latest_rotation.rotated
+        FROM (
+            SELECT DISTINCT ON (activity_id)
+                   activity_id,
+                   jsonb_build_object('event_type', event_type, 'data', data) AS rotated
+            FROM events_store
+            WHERE event_type IN ('repository_token_rotated', 'notion_integration_token_refreshed')
+            ORDER BY activity_id, occured_at DESC, position DESC
+        ) AS latest_rotation
+        WHERE credentials.process_id = latest_rotation.activity_id;
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS integration_credentials;")
@@ -0,0 +1,36 @@
+"""index agent message store by process
+
+Revision ID: d2e6b9f4a183
+Revises: c5f1a8e3d270
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d2e6b9f4a183"
+down_revision: Union[str, None] = "c5f1a8e3d270"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        ALTER TABLE agent_message_store
+            ADD COLUMN position BIGINT GENERATED ALWAYS AS IDENTITY;
+    """)
+    op.execute("""
+        CREATE INDEX idx_agent_message_store_process_turn
+            ON agent_message_store (process_id, turn, created_at, position);
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS idx_agent_message_store_process_turn;")
+    op.execute("ALTER TABLE agent_message_store DROP COLUMN position;")
@@ -0,0 +1,31 @@
+"""add events outbox claims
+
+Revision ID: 8a3f5c2e7d91
+Revises: d2e6b9f4a183
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8a3f5c2e7d91"
+down_revision: Union[str, None] = "d2e6b9f4a183"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        ALTER TABLE events_outbox
+            ADD COLUMN claimed_until TIMESTAMP WITH TIME ZONE;
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE events_outbox DROP COLUMN claimed_until;")
@@ -0,0 +1,59 @@
+"""order global log by transaction
+
+Revision ID: 4e7b1d9c3a52
+Revises: 8a3f5c2e7d91
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4e7b1d9c3a52"
+down_revision: Union[str, None] = "8a3f5c2e7d91"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE INDEX idx_events_store_transaction_position
+            ON events_store (transaction_id, global_position);
+    """)
+    op.execute("""
+        ALTER TABLE event_checkpoints
+            ADD COLUMN transaction_id BIGINT NOT NULL DEFAULT 0;
+    """)
+    # Resume from the oldest transaction holding an event past the old checkpoint:
+    # events may be handled again, none is skipped.
+    op.execute("""
+        UPDATE event_checkpoints AS checkpoints
+        SET transaction_id = resumed.transaction_id,
+            position       = resumed.position
+        FROM (SELECT c.subscriber_name,
+                     COALESCE(next_event.transaction_id, last_event.transaction_id, 0) AS transaction_id,
+                     CASE
+                         WHEN next_event.transaction_id IS NOT NULL THEN 0
+                         ELSE COALESCE(last_event.global_position, c.position)
+                     END AS position
+              FROM event_checkpoints AS c
+                       LEFT JOIN LATERAL (SELECT MIN(transaction_id::text::bigint) AS transaction_id
+                                          FROM events_store
+                                          WHERE global_position > c.position) AS next_event ON TRUE
+                       LEFT JOIN LATERAL (SELECT transaction_id::text::bigint AS transaction_id,
+                                                 global_position
+                                          FROM events_store
+                                          ORDER BY transaction_id DESC, global_position DESC
+                                          LIMIT 1) AS last_event ON TRUE) AS resumed
+        WHERE checkpoints.subscriber_name = resumed.subscriber_name;
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE event_checkpoints DROP COLUMN transaction_id;")
+    op.execute("DROP INDEX IF EXISTS idx_events_store_transaction_position;")
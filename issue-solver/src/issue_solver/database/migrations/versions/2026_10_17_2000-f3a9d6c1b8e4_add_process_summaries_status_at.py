@@ -0,0 +1,33 @@
+"""add process summaries status_at
+
+Revision ID: f3a9d6c1b8e4
+Revises: 4e7b1d9c3a52
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f3a9d6c1b8e4"
+down_revision: Union[str, None] = "4e7b1d9c3a52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        ALTER TABLE process_summaries
+            ADD COLUMN status_at TIMESTAMP WITH TIME ZONE;
+    """)
+    # Filled in for existing streams by `cudu rebuild-process-summaries`, run after the
+    # upgrade, which replays them through `ProcessSummary`.
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE process_summaries DROP COLUMN status_at;")
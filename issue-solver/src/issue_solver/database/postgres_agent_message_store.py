@@ -1,20 +1,23 @@
 import json
 import uuid
 from dataclasses import asdict
+from typing import Sequence
+
+import asyncpg
 
 from issue_solver.agents.agent_message_store import AgentMessageStore, AgentMessage
 from issue_solver.models.supported_models import VersionedAIModel
 
 
 class PostgresAgentMessageStore(AgentMessageStore):
-    def __init__(self, connection):
-        self.connection = connection
+    def __init__(self, pool: asyncpg.Pool):
+        self.pool = pool
 
     async def append(
         self, process_id: str, model: VersionedAIModel, turn: int, message, agent: str
     ) -> str:
         message_id = str(uuid.uuid4())
-        await self.connection.execute(
+        await self.pool.execute(
             """
             INSERT INTO agent_message_store (message_id,
                                         process_id,
@@ -45,15 +48,53 @@ class PostgresAgentMessageStore(AgentMessageStore):
         )
         return message_id
 
-    async def get(self, process_id: str) -> list[AgentMessage]:
-        rows = await self.connection.fetch(
+    async def append_many(
+        self, process_id: str, messages: Sequence[AgentMessage]
+    ) -> None:
+        await self.pool.copy_records_to_table(
+            "agent_message_store",
+            records=[
+                (
+                    message.id,
+                    process_id,
+                    message.agent,
+                    str(message.model),
+                    message.turn,
+                    json.dumps(message.payload),
+                    message.type,
+                )
+                for message in messages
+            ],
+            columns=[
+                "message_id",
+                "process_id",
+                "agent",
+                "model",
+                "turn",
+                "message",
+                "message_type",
+            ],
+        )
+
+    async def get(
+        self, process_id: str, after: str | None = None, limit: int | None = None
+    ) -> list[AgentMessage]:
+        rows = await self.pool.fetch(
             """
-            SELECT message_id, process_id, agent, model, turn, message, message_type, created_at
+            SELECT message_id, agent, model, turn, message, message_type
             FROM agent_message_store
             WHERE process_id = $1
-            ORDER BY turn ASC
+              AND ($2::VARCHAR IS NULL
+                OR (turn, created_at, position) > (SELECT turn, created_at, position
+                                                   FROM agent_message_store
+                                                   WHERE process_id = $1
+                                                     AND message_id = $2))
+            ORDER BY turn, created_at, position
+            LIMIT $3
             """,
             process_id,
+            after,
+            limit,
         )
 
         messages: list[AgentMessage] = []
@@ -0,0 +1,37 @@
+import asyncpg
+
+from issue_solver.events.checkpoints import CheckpointStore
+from issue_solver.events.event_store import LOG_START, GlobalPosition
+
+
+class PostgresCheckpointStore(CheckpointStore):
+    def __init__(self, pool: asyncpg.Pool):
+        self.pool = pool
+
+    async def get(self, subscriber_name: str) -> GlobalPosition:
+        row = await self.pool.fetchrow(
+            """
+            SELECT transaction_id, position
+            FROM event_checkpoints
+            WHERE subscriber_name = $1
+            """,
+            subscriber_name,
+        )
+        if row is None:
+            return LOG_START
+        return GlobalPosition(row["transaction_id"], row["position"])
+
+    async def save(self, subscriber_name: str, position: GlobalPosition) -> None:
+        await self.pool.execute(
+            """
+            INSERT INTO event_checkpoints (subscriber_name, transaction_id, position, updated_at)
+            VALUES ($1, $2, $3, NOW())
+            ON CONFLICT (subscriber_name) DO UPDATE
+                SET transaction_id = EXCLUDED.transaction_id,
+                    position       = EXCLUDED.position,
+                    updated_at     = EXCLUDED.updated_at
+            """,
+            subscriber_name,
+            position.transaction_id,
+            position.position,
+        )
@@ -1,80 +1,424 @@
+import asyncio
 import json
+import re
 import uuid
-from typing import Any, Type
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Collection, Sequence, Type, cast
 
+import asyncpg
+
+from issue_solver.database.event_archive import (
+    ARCHIVABLE_PROCESS_STATUSES,
+    ArchivedEvent,
+    EventArchive,
+)
+from issue_solver.database.events_store_partitions import PARTITION_NAME_PATTERN
+from issue_solver.events.credentials import (
+    IntegrationConnected,
+    IntegrationCredentials,
+    IntegrationTokenRotated,
+    has_credentials_events,
+    project_credentials,
+)
 from issue_solver.events.domain import AnyDomainEvent, T
-from issue_solver.events.event_store import EventStore
+from issue_solver.events.event_store import (
+    DEFAULT_READ_ALL_BATCH_SIZE,
+    LOG_START,
+    ConcurrencyError,
+    EventStore,
+    GlobalPosition,
+    RecordedEvent,
+    StreamCursor,
+    StreamFilter,
+    subscription_matches,
+)
+from issue_solver.events.process_summary import ProcessSummary
+from issue_solver.events.snapshots import (
+    DEFAULT_SNAPSHOT_INTERVAL,
+    Snapshot,
+    compact,
+    crosses_snapshot_interval,
+)
 from issue_solver.events.serializable_records import (
+    ProcessTimelineEventRecords,
     deserialize,
+    deserialize_from_storage,
     get_record_type,
     serialize,
+    serialize_for_storage,
 )
 
 
+CRITERIA_KEY_PATTERN = re.compile(r"^[a-z_][a-z0-9_]*$")
+APPENDS_CHANNEL = "events_store_appends"
+HELD_BACK_APPENDS_POLL_SECONDS = 1.0
+
+
+def criteria_conditions(
+    criteria: dict[str, Any], first_parameter: int = 1
+) -> tuple[list[str], list[Any]]:
+    """Build `data->>'key' = $n` conditions, inlining keys so expression indexes apply."""
+    conditions: list[str] = []
+    parameters: list[Any] = []
+    for key, value in criteria.items():
+        if not CRITERIA_KEY_PATTERN.match(key):
+            raise ValueError(f"Invalid event criteria key: {key!r}")
+        conditions.append(f"data->>'{key}' = ${first_parameter + len(parameters)}")
+        parameters.append(value)
+    return conditions, parameters
+
+
+def stream_conditions_of(
+    filters: Sequence[StreamFilter], status: str | None
+) -> tuple[str, list[Any]]:
+    """Build the condition selecting the events that make a stream match the filters."""
+    query_params: list[Any] = []
+    filter_conditions = []
+    for one_filter in filters:
+        sql_conditions, criteria_params = criteria_conditions(
+            one_filter.criteria, first_parameter=len(query_params) + 1
+        )
+        query_params.extend(criteria_params)
+        query_params.append(get_record_type(one_filter.event_type))
+        sql_conditions.insert(0, f"event_type = ${len(query_params)}")
+        filter_conditions.append(f"({' AND '.join(sql_conditions)})")
+    stream_conditions = f"({' OR '.join(filter_conditions)})"
+    if status is not None:
+        query_params.append(status)
+        stream_conditions += f"""
+              AND activity_id IN (SELECT process_id
+                                  FROM process_summaries
+                                  WHERE status = ${len(query_params)})"""
+    return stream_conditions, query_params
+
+
 class PostgresEventStore(EventStore):
-    def __init__(self, connection):
-        self.connection = connection
+    def __init__(
+        self,
+        pool: asyncpg.Pool,
+        snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL,
+        outbox: bool = False,
+        archive: EventArchive | None = None,
+    ):
+        self.pool = pool
+        self.snapshot_interval = snapshot_interval
+        self.outbox = outbox
+        self.archive = archive
+        self._appends = AppendNotifications(pool)
 
-    async def append(self, process_id: str, *events: AnyDomainEvent) -> None:
-        for e in events:
-            await self.append_one_event(process_id, e)
+    async def append(
+        self,
+        process_id: str,
+        *events: AnyDomainEvent,
+        expected_version: int | None = None,
+    ) -> None:
+        if not events:
+            return
+        records = [await serialize_for_storage(event) for event in events]
+        await self._insert_records(process_id, events, records, expected_version)
 
-    async def append_one_event(self, process_id: str, event: AnyDomainEvent):
-        next_position = await self.connection.fetchval(
+    async def _insert_records(
+        self,
+        process_id: str,
+        events: Sequence[AnyDomainEvent],
+        records: list[ProcessTimelineEventRecords],
+        expected_version: int | None,
+    ) -> None:
+        async with self.pool.acquire() as connection, connection.transaction():
+            # Partitioned by time, the table can't keep positions unique within a stream:
+            # appends to a stream take turns, each reading the positions the last one wrote.
+            await connection.execute(
+                "SELECT pg_advisory_xact_lock(hashtextextended($1, 0))", process_id
+            )
+            version = await self._insert_records_in(
+                connection, process_id, records, expected_version
+            )
+            if self.outbox:
+                await self._insert_outbox_messages_in(connection, process_id, records)
+            await self._update_summary(connection, process_id, events)
+            await self._update_credentials(connection, process_id, events)
+            if crosses_snapshot_interval(
+                version - len(records), version, self.snapshot_interval
+            ):
+                await self._take_snapshot(connection, process_id, version)
+
+    async def _insert_outbox_messages_in(
+        self,
+        connection: asyncpg.Connection,
+        process_id: str,
+        records: list[ProcessTimelineEventRecords],
+    ) -> None:
+        """Messages for `OutboxRelay` to publish, committed or rolled back with the events."""
+        await connection.execute(
             """
-            SELECT COALESCE(MAX(position), 0) + 1
-            FROM events_store
-            WHERE activity_id = $1
+            INSERT INTO events_outbox (process_id, body)
+            SELECT $1, body
+            FROM unnest($2::text[]) WITH ORDINALITY AS messages (body, rank)
+            ORDER BY rank
+            """,
+            process_id,
+            [record.model_dump_json() for record in records],
+        )
+
+    async def _update_summary(
+        self,
+        connection: asyncpg.Connection,
+        process_id: str,
+        events: Sequence[AnyDomainEvent],
+    ) -> None:
+        previous = (await self._get_summaries_in(connection, [process_id])).get(
+            process_id
+        )
+        if previous is not None and previous.can_apply(events):
+            summary = previous.apply(events)
+        else:
+            stream = await self._get_in(connection, process_id)
+            summary = ProcessSummary.from_events(process_id, stream)
+        await save_summaries(connection, [summary])
+
+    async def _update_credentials(
+        self,
+        connection: asyncpg.Connection,
+        process_id: str,
+        events: Sequence[AnyDomainEvent],
+    ) -> None:
+        if not has_credentials_events(events):
+            return
+        row = await connection.fetchrow(
+            "SELECT connected, rotated FROM integration_credentials WHERE process_id = $1",
+            process_id,
+        )
+        credentials = project_credentials(_to_credentials(row) if row else None, events)
+        if credentials is not None:
+            await save_credentials(connection, credentials)
+
+    async def _take_snapshot(
+        self, connection: asyncpg.Connection, process_id: str, version: int
+    ) -> None:
+        previous = await self._get_snapshot_in(connection, process_id)
+        start = previous.position if previous else 0
+        events = compact(
+            [
+                *(previous.events if previous else []),
+                *await self._get_in(connection, process_id, after_position=start),
+            ]
+        )
+        records = [await serialize_for_storage(event) for event in events]
+        await connection.execute(
+            """
+            INSERT INTO events_snapshots (process_id, position, events)
+            VALUES ($1, $2, $3::jsonb)
+            ON CONFLICT (process_id, position) DO NOTHING
             """,
             process_id,
+            version,
+            json.dumps(
+                [
+                    {"event_type": record.type, "data": record.model_dump(mode="json")}
+                    for record in records
+                ]
+            ),
         )
-        record = serialize(event)
-        event_id = str(uuid.uuid4())
-        await self.connection.execute(
+
+    async def _insert_records_in(
+        self,
+        connection: asyncpg.Connection,
+        process_id: str,
+        records: list[ProcessTimelineEventRecords],
+        expected_version: int | None,
+    ) -> int:
+        """Insert the records and notify subscribers in one statement, returning the version."""
+        rows = await connection.fetch(
             """
-            INSERT INTO events_store (event_id,
-                                      activity_id,
-                                      position,
-                                      event_type,
-                                      data,
-                                      metadata,
-                                      occured_at)
-            VALUES ($1, $2, $3, $4, $5, $6, $7)
+            WITH inserted AS (
+                INSERT INTO events_store (event_id,
+                                          activity_id,
+                                          position,
+                                          event_type,
+                                          data,
+                                          metadata,
+                                          occured_at)
+                SELECT new_events.event_id,
+                       $1,
+                       stream.last_position + new_events.rank,
+                       new_events.event_type,
+                       new_events.data::jsonb,
+                       $6::jsonb,
+                       new_events.occured_at
+                FROM unnest($2::varchar[], $3::varchar[], $4::text[], $5::timestamptz[])
+                         WITH ORDINALITY AS new_events (event_id, event_type, data, occured_at, rank),
+                     (SELECT GREATEST(COALESCE(MAX(position), 0),
+                                      (SELECT COALESCE(MAX(last_position), 0)
+                                       FROM events_archive
+                                       WHERE process_id = $1)) AS last_position
+                      FROM events_store
+                      WHERE activity_id = $1) AS stream
+                WHERE $7::bigint IS NULL OR stream.last_position = $7::bigint
+                RETURNING position
+            ),
+            notified AS (
+                SELECT pg_notify($8, json_build_object('process_id', $1::varchar,
+                                                       'transaction_id',
+                                                       pg_current_xact_id()::text::bigint)::text)
+                FROM inserted
+                LIMIT 1
+            )
+            SELECT position
+            FROM inserted, notified
             """,
-            event_id,
             process_id,
-            next_position,
-            record.type,
-            record.model_dump_json(),
+            [str(uuid.uuid4()) for _ in records],
+            [record.type for record in records],
+            [record.model_dump_json() for record in records],
+            [record.occurred_at for record in records],
             json.dumps({}),
-            record.occurred_at,
+            expected_version,
+            APPENDS_CHANNEL,
         )
+        if len(rows) != len(records):
+            # Rolling the transaction back also drops the notification.
+            raise ConcurrencyError(
+                process_id,
+                expected_version,
+                await self._version(connection, process_id),
+            )
+        return max(row["position"] for row in rows)
 
-    async def get(self, process_id: str) -> list[AnyDomainEvent]:
-        rows = await self.connection.fetch(
+    async def _version(self, connection: asyncpg.Connection, process_id: str) -> int:
+        # Archived events left the table but keep their positions.
+        return await connection.fetchval(
             """
-            SELECT event_type, data, metadata, occured_at
-            FROM events_store
-            WHERE activity_id = $1
-            ORDER BY position ASC
+            SELECT GREATEST((SELECT COALESCE(MAX(position), 0)
+                             FROM events_store
+                             WHERE activity_id = $1),
+                            (SELECT COALESCE(MAX(last_position), 0)
+                             FROM events_archive
+                             WHERE process_id = $1))
             """,
             process_id,
         )
 
-        events: list[AnyDomainEvent] = []
+    async def get(self, process_id: str) -> list[AnyDomainEvent]:
+        return await self._get_in(self.pool, process_id)
+
+    async def get_since(self, process_id: str, position: int) -> list[AnyDomainEvent]:
+        return await self._get_in(self.pool, process_id, after_position=position)
+
+    async def _get_in(
+        self,
+        connection: asyncpg.Pool | asyncpg.Connection,
+        process_id: str,
+        after_position: int = 0,
+    ) -> list[AnyDomainEvent]:
+        streams = await self._get_many_in(connection, [process_id], after_position)
+        return streams[process_id]
+
+    async def get_many(
+        self, process_ids: Collection[str]
+    ) -> dict[str, list[AnyDomainEvent]]:
+        return await self._get_many_in(self.pool, process_ids)
+
+    async def _get_many_in(
+        self,
+        connection: asyncpg.Pool | asyncpg.Connection,
+        process_ids: Collection[str],
+        after_position: int = 0,
+    ) -> dict[str, list[AnyDomainEvent]]:
+        positioned_events: dict[str, list[tuple[int, AnyDomainEvent]]] = {
+            process_id: [] for process_id in process_ids
+        }
+        if not positioned_events:
+            return {}
+        rows = await connection.fetch(
+            """
+            SELECT activity_id, position, event_type, data, NULL AS object_key
+            FROM events_store
+            WHERE activity_id = ANY($1::varchar[])
+              AND position > $2
+            UNION ALL
+            SELECT process_id, first_position, NULL, NULL, object_key
+            FROM events_archive
+            WHERE process_id = ANY($1::varchar[])
+              AND last_position > $2
+            """,
+            list(positioned_events),
+            after_position,
+        )
         for row in rows:
-            event_type = row["event_type"]
-            data = row["data"]
-            domain_event = deserialize(event_type, data)
-            events.append(domain_event)
+            stream = positioned_events[row["activity_id"]]
+            if row["object_key"] is None:
+                stream.append(
+                    (
+                        row["position"],
+                        await deserialize_from_storage(row["event_type"], row["data"]),
+                    )
+                )
+                continue
+            for archived in await self._read_archive(
+                row["activity_id"], row["object_key"]
+            ):
+                if archived.position > after_position:
+                    stream.append(
+                        (
+                            archived.position,
+                            await deserialize_from_storage(
+                                archived.event_type, archived.data
+                            ),
+                        )
+                    )
+        return {
+            process_id: [event for _, event in sorted(stream, key=lambda p: p[0])]
+            for process_id, stream in positioned_events.items()
+        }
 
-        return events
+    async def _read_archive(
+        self, process_id: str, object_key: str
+    ) -> list[ArchivedEvent]:
+        if self.archive is None:
+            raise RuntimeError(
+                f"Events of process {process_id} are archived but no event archive is configured"
+            )
+        return await self.archive.read(object_key)
+
+    async def latest(
+        self,
+        event_type: Type[T],
+        process_id: str | None = None,
+        criteria: dict[str, Any] | None = None,
+    ) -> T | None:
+        event_record_type = get_record_type(event_type)
+        sql_conditions, query_params = criteria_conditions(criteria or {})
+        query_params.append(event_record_type)
+        sql_conditions.insert(0, f"event_type = ${len(query_params)}")
+        if process_id is not None:
+            query_params.append(process_id)
+            sql_conditions.append(f"activity_id = ${len(query_params)}")
+
+        row = await self.pool.fetchrow(
+            f"""
+            SELECT event_type, data
+            FROM events_store
+            WHERE {" AND ".join(sql_conditions)}
+            ORDER BY occured_at DESC, position ASC
+            LIMIT 1
+            """,
+            *query_params,
+        )
+        if row is None:
+            return None
+        event = await deserialize_from_storage(row["event_type"], row["data"])
+        if not isinstance(event, event_type):
+            raise ValueError(
+                f"Expected event type {event_record_type}, but got {row['event_type']}"
+            )
+        return event
 
     async def find(self, criteria: dict[str, Any], event_type: Type[T]) -> list[T]:
-        sql_conditions = [
-            f"data->>${i} = ${i + 1}" for i in range(1, len(criteria) * 2, 2)
-        ]
-        sql_conditions.append(f"event_type = ${len(criteria) * 2 + 1}")
+        event_record_type = get_record_type(event_type)
+        sql_conditions, query_params = criteria_conditions(criteria)
+        sql_conditions.insert(0, f"event_type = ${len(query_params) + 1}")
+        query_params.append(event_record_type)
 
         query = f"""
             SELECT event_type, data, metadata, occured_at
@@ -82,18 +426,12 @@ class PostgresEventStore(EventStore):
             WHERE {" AND ".join(sql_conditions)}
         """
 
-        query_params = []
-        for key, value in criteria.items():
-            query_params.extend([key, value])
-        event_record_type = get_record_type(event_type)
-        query_params.append(event_record_type)
-
-        rows = await self.connection.fetch(query, *query_params)
+        rows = await self.pool.fetch(query, *query_params)
         events: list[T] = []
 
         for row in rows:
             db_event_type = row["event_type"]
-            event = deserialize(db_event_type, row["data"])
+            event = await deserialize_from_storage(db_event_type, row["data"])
             if not isinstance(event, event_type):
                 raise ValueError(
                     f"Expected event type {event_record_type}, but got {db_event_type}"
@@ -101,3 +439,487 @@ class PostgresEventStore(EventStore):
             events.append(event)
 
         return events
+
+    async def find_streams(
+        self,
+        filters: Sequence[StreamFilter],
+        limit: int | None = None,
+        after: StreamCursor | None = None,
+        offset: int = 0,
+        status: str | None = None,
+    ) -> list[StreamCursor]:
+        if not filters:
+            return []
+        stream_conditions, query_params = stream_conditions_of(filters, status)
+        after_condition = ""
+        if after is not None:
+            # Streams started after the cursor have no matching event up to it: only
+            # events up to the cursor are grouped, their first one anchors the stream.
+            query_params.extend([after.anchored_at, after.process_id])
+            after_at, after_id = f"${len(query_params) - 1}", f"${len(query_params)}"
+            stream_conditions += f" AND occured_at <= {after_at}::timestamptz"
+            after_condition = f"""
+            HAVING (MIN(occured_at), activity_id) < ({after_at}::timestamptz, {after_id}::varchar)"""
+        query_params.extend([offset, limit])
+        rows = await self.pool.fetch(
+            f"""
+            SELECT activity_id, MIN(occured_at) AS anchored_at
+            FROM events_store
+            WHERE {stream_conditions}
+            GROUP BY activity_id{after_condition}
+            ORDER BY anchored_at DESC, activity_id DESC
+            OFFSET ${len(query_params) - 1} LIMIT ${len(query_params)}
+            """,
+            *query_params,
+        )
+        return [StreamCursor(row["activity_id"], row["anchored_at"]) for row in rows]
+
+    async def count_streams(
+        self, filters: Sequence[StreamFilter], status: str | None = None
+    ) -> int:
+        if not filters:
+            return 0
+        stream_conditions, query_params = stream_conditions_of(filters, status)
+        return await self.pool.fetchval(
+            f"""
+            SELECT COUNT(DISTINCT activity_id)
+            FROM events_store
+            WHERE {stream_conditions}
+            """,
+            *query_params,
+        )
+
+    async def get_snapshot(self, process_id: str) -> Snapshot | None:
+        return await self._get_snapshot_in(self.pool, process_id)
+
+    async def _get_snapshot_in(
+        self, connection: asyncpg.Pool | asyncpg.Connection, process_id: str
+    ) -> Snapshot | None:
+        row = await connection.fetchrow(
+            """
+            SELECT position, events
+            FROM events_snapshots
+            WHERE process_id = $1
+            ORDER BY position DESC
+            LIMIT 1
+            """,
+            process_id,
+        )
+        if row is None:
+            return None
+        return Snapshot(
+            process_id=process_id,
+            position=row["position"],
+            events=[
+                await deserialize_from_storage(
+                    item["event_type"], json.dumps(item["data"])
+                )
+                for item in json.loads(row["events"])
+            ],
+        )
+
+    async def get_summaries(
+        self, process_ids: Collection[str]
+    ) -> dict[str, ProcessSummary]:
+        return await self._get_summaries_in(self.pool, process_ids)
+
+    async def _get_summaries_in(
+        self,
+        connection: asyncpg.Pool | asyncpg.Connection,
+        process_ids: Collection[str],
+    ) -> dict[str, ProcessSummary]:
+        rows = await connection.fetch(
+            """
+            SELECT process_id, type, status, run_id, space_id, knowledge_base_id,
+                   created_at, updated_at, event_count, status_at
+            FROM process_summaries
+            WHERE process_id = ANY($1::varchar[])
+            """,
+            list(process_ids),
+        )
+        return {row["process_id"]: ProcessSummary(**row) for row in rows}
+
+    async def get_credentials(
+        self,
+        connected_type: type[IntegrationConnected],
+        space_id: str | None = None,
+        knowledge_base_id: str | None = None,
+    ) -> IntegrationCredentials | None:
+        conditions = ["integration_type = $1"]
+        parameters: list[Any] = [get_record_type(connected_type)]
+        for column, value in (
+            ("space_id", space_id),
+            ("knowledge_base_id", knowledge_base_id),
+        ):
+            if value is not None:
+                parameters.append(value)
+                conditions.append(f"{column} = ${len(parameters)}")
+        row = await self.pool.fetchrow(
+            f"""
+            SELECT connected, rotated
+            FROM integration_credentials
+            WHERE {" AND ".join(conditions)}
+            ORDER BY connected_at DESC
+            LIMIT 1
+            """,
+            *parameters,
+        )
+        return _to_credentials(row) if row else None
+
+    async def subscribe(
+        self,
+        stream_filter: StreamFilter | None = None,
+        process_id: str | None = None,
+        after_position: int = 0,
+    ) -> AsyncGenerator[AnyDomainEvent, None]:
+        if process_id is None:
+            appended_events = self._follow_log()
+        else:
+            appended_events = self._follow_stream(process_id, after_position)
+        async with aclosing(appended_events) as events:
+            async for event in events:
+                if subscription_matches(event, stream_filter):
+                    yield event
+
+    async def _follow_stream(
+        self, process_id: str, after_position: int
+    ) -> AsyncGenerator[AnyDomainEvent, None]:
+        notices: asyncio.Queue[AppendNotice | None] = asyncio.Queue()
+        await self._appends.add(notices)
+        position = after_position
+        try:
+            while True:
+                events = await self.get_since(process_id, position)
+                position += len(events)
+                for event in events:
+                    yield event
+                notice = await notices.get()
+                while notice is not None and notice.process_id != process_id:
+                    notice = await notices.get()
+                if notice is None:
+                    await self._appends.add(notices)
+        finally:
+            await self._appends.remove(notices)
+
+    async def _follow_log(self) -> AsyncGenerator[AnyDomainEvent, None]:
+        """Every stream's appends, read from the global log after a checkpoint.
+
+        Notices only wake the reader up, so nothing is tracked per stream and appends
+        missed while disconnected are read like any other. Transactions that committed
+        right before subscribing may be pushed too.
+        """
+        notices: asyncio.Queue[AppendNotice | None] = asyncio.Queue()
+        await self._appends.add(notices)
+        checkpoint = GlobalPosition(
+            await self.pool.fetchval(
+                "SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+            ),
+            0,
+        )
+        notified_transaction_id = 0
+        try:
+            while True:
+                async with aclosing(self.read_all(checkpoint)) as recorded_events:
+                    async for recorded in recorded_events:
+                        checkpoint = recorded.global_position
+                        yield recorded.event
+                # read_all holds a committed append back while an older transaction runs.
+                held_back = checkpoint.transaction_id < notified_transaction_id
+                try:
+                    notice = await asyncio.wait_for(
+                        notices.get(),
+                        HELD_BACK_APPENDS_POLL_SECONDS if held_back else None,
+                    )
+                except TimeoutError:
+                    continue
+                if notice is None:
+                    await self._appends.add(notices)
+                else:
+                    notified_transaction_id = max(
+                        notified_transaction_id, notice.transaction_id
+                    )
+        finally:
+            await self._appends.remove(notices)
+
+    async def read_all(
+        self,
+        from_checkpoint: GlobalPosition = LOG_START,
+        batch_size: int = DEFAULT_READ_ALL_BATCH_SIZE,
+    ) -> AsyncGenerator[RecordedEvent, None]:
+        # Only transactions older than every one still running when reading started are
+        # read, so none can commit later with a lower position. Each batch is its own
+        # short query: no transaction stays open while the caller handles events.
+        upper_transaction_id = await self.pool.fetchval(
+            "SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+        )
+        after = from_checkpoint
+        while True:
+            rows = await self.pool.fetch(
+                """
+                SELECT transaction_id::text::bigint AS transaction_id,
+                       global_position,
+                       activity_id,
+                       event_type,
+                       data
+                FROM events_store
+                WHERE (transaction_id, global_position) > ($1::bigint::text::xid8, $2::bigint)
+                  AND transaction_id < $3::bigint::text::xid8
+                ORDER BY transaction_id, global_position
+                LIMIT $4
+                """,
+                after.transaction_id,
+                after.position,
+                upper_transaction_id,
+                batch_size,
+            )
+            for row in rows:
+                after = GlobalPosition(row["transaction_id"], row["global_position"])
+                yield RecordedEvent(
+                    global_position=after,
+                    process_id=row["activity_id"],
+                    event=await deserialize_from_storage(
+                        row["event_type"], row["data"]
+                    ),
+                )
+            if len(rows) < batch_size:
+                return
+
+    async def archive_partition(
+        self,
+        partition_name: str,
+        archivable_statuses: dict[str, tuple[str, ...]] = ARCHIVABLE_PROCESS_STATUSES,
+    ) -> int:
+        """Move the events of finished processes out of a partition, into the archive.
+
+        The first event of each stream stays, so that listings still find the process.
+        Only `get`, `get_since` and `get_many` read archived events back: `latest`,
+        `find` and `read_all` skip them, which is why only the processes listed in
+        `archivable_statuses` are archived. Later appends to an archived stream carry on
+        from its archived positions.
+        """
+        if self.archive is None:
+            raise RuntimeError("No event archive is configured")
+        if not PARTITION_NAME_PATTERN.match(partition_name):
+            raise ValueError(f"Invalid events store partition: {partition_name!r}")
+        archivable = [
+            (process_type, status)
+            for process_type, type_statuses in archivable_statuses.items()
+            for status in type_statuses
+        ]
+        if not archivable:
+            return 0
+        process_types, statuses = zip(*archivable)
+        # Nothing is locked while writing to the archive: only the events written there
+        # are deleted, and events appended meanwhile stay for the next run.
+        rows = await self.pool.fetch(
+            f"""
+            SELECT e.event_id, e.activity_id, e.position, e.event_type, e.data
+            FROM {partition_name} AS e
+                     JOIN process_summaries AS s ON s.process_id = e.activity_id
+                     JOIN unnest($1::varchar[], $2::varchar[]) AS archivable (type, status)
+                          ON archivable.type = s.type AND archivable.status = s.status
+            WHERE e.position > 1
+            ORDER BY e.activity_id, e.position
+            """,
+            list(process_types),
+            list(statuses),
+        )
+        chunks: dict[str, list[ArchivedEvent]] = {}
+        for row in rows:
+            chunks.setdefault(row["activity_id"], []).append(
+                ArchivedEvent(row["position"], row["event_type"], row["data"])
+            )
+        archived_chunks = []
+        for process_id, events in chunks.items():
+            object_key = f"{process_id}/{partition_name}-{events[0].position}.jsonl.gz"
+            await self.archive.write(object_key, events)
+            archived_chunks.append(
+                (process_id, events[0].position, events[-1].position, object_key)
+            )
+        async with self.pool.acquire() as connection, connection.transaction():
+            await connection.executemany(
+                """
+                INSERT INTO events_archive (process_id, first_position, last_position, object_key)
+                VALUES ($1, $2, $3, $4)
+                ON CONFLICT (process_id, first_position) DO UPDATE
+                    SET last_position = EXCLUDED.last_position,
+                        object_key    = EXCLUDED.object_key,
+                        archived_at   = NOW()
+                """,
+                archived_chunks,
+            )
+            await connection.execute(
+                f"DELETE FROM {partition_name} WHERE event_id = ANY($1::varchar[])",
+                [row["event_id"] for row in rows],
+            )
+        return len(rows)
+
+    async def rebuild_summaries(self, batch_size: int = 500) -> int:
+        """Recompute every process summary from its stream, a batch of streams at a time."""
+        rebuilt = 0
+        last_process_id = ""
+        while True:
+            process_ids = [
+                row["activity_id"]
+                for row in await self.pool.fetch(
+                    """
+                    SELECT DISTINCT activity_id
+                    FROM events_store
+                    WHERE activity_id > $1
+                    ORDER BY activity_id
+                    LIMIT $2
+                    """,
+                    last_process_id,
+                    batch_size,
+                )
+            ]
+            if not process_ids:
+                return rebuilt
+            streams = await self.get_many(process_ids)
+            async with self.pool.acquire() as connection:
+                await save_summaries(
+                    connection,
+                    [
+                        ProcessSummary.from_events(process_id, events)
+                        for process_id, events in streams.items()
+                    ],
+                )
+            rebuilt += len(process_ids)
+            last_process_id = process_ids[-1]
+
+
+@dataclass(frozen=True, slots=True)
+class AppendNotice:
+    process_id: str
+    transaction_id: int
+
+
+class AppendNotifications:
+    """Listens to appends on a single connection, fanning notices out to subscribers.
+
+    Subscribers get `None` when the connection was lost and listening resumed.
+    """
+
+    def __init__(self, pool: asyncpg.Pool):
+        self.pool = pool
+        self.connection: asyncpg.Connection | None = None
+        self.subscribers: set[asyncio.Queue[AppendNotice | None]] = set()
+        self._lock = asyncio.Lock()
+
+    async def add(self, subscriber: asyncio.Queue[AppendNotice | None]) -> None:
+        async with self._lock:
+            self.subscribers.add(subscriber)
+            if self.connection is None:
+                connection = await self.pool.acquire()
+                connection.add_termination_listener(self._on_terminated)
+                await connection.add_listener(APPENDS_CHANNEL, self._on_notification)
+                self.connection = connection
+
+    async def remove(self, subscriber: asyncio.Queue[AppendNotice | None]) -> None:
+        async with self._lock:
+            self.subscribers.discard(subscriber)
+            if self.subscribers or self.connection is None:
+                return
+            connection, self.connection = self.connection, None
+            connection.remove_termination_listener(self._on_terminated)
+            await connection.remove_listener(APPENDS_CHANNEL, self._on_notification)
+            await self.pool.release(connection)
+
+    def _on_notification(
+        self, connection: asyncpg.Connection, pid: int, channel: str, payload: str
+    ) -> None:
+        notice = AppendNotice(**json.loads(payload))
+        for subscriber in self.subscribers:
+            subscriber.put_nowait(notice)
+
+    def _on_terminated(self, connection: asyncpg.Connection) -> None:
+        # The pool already took the lost connection back.
+        self.connection = None
+        for subscriber in self.subscribers:
+            subscriber.put_nowait(None)
+
+
+async def save_summaries(
+    connection: asyncpg.Connection, summaries: list[ProcessSummary]
+) -> None:
+    await connection.executemany(
+        """
+        INSERT INTO process_summaries (process_id, type, status, run_id, space_id,
+                                       knowledge_base_id, created_at, updated_at, event_count,
+                                       status_at)
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+        ON CONFLICT (process_id) DO UPDATE
+            SET type              = EXCLUDED.type,
+                status            = EXCLUDED.status,
+                run_id            = EXCLUDED.run_id,
+                space_id          = EXCLUDED.space_id,
+                knowledge_base_id = EXCLUDED.knowledge_base_id,
+                created_at        = EXCLUDED.created_at,
+                updated_at        = EXCLUDED.updated_at,
+                event_count       = EXCLUDED.event_count,
+                status_at         = EXCLUDED.status_at
+        """,
+        [
+            (
+                summary.process_id,
+                summary.type,
+                summary.status,
+                summary.run_id,
+                summary.space_id,
+                summary.knowledge_base_id,
+                summary.created_at,
+                summary.updated_at,
+                summary.event_count,
+                summary.status_at,
+            )
+            for summary in summaries
+        ],
+    )
+
+
+async def save_credentials(
+    connection: asyncpg.Connection, credentials: IntegrationCredentials
+) -> None:
+    connected = serialize(credentials.connected)
+    rotated = serialize(credentials.rotated) if credentials.rotated else None
+    await connection.execute(
+        """
+        INSERT INTO integration_credentials (process_id, integration_type, space_id,
+                                             knowledge_base_id, connected_at, connected, rotated)
+        VALUES ($1, $2, $3, $4, $5, $6::jsonb, $7::jsonb)
+        ON CONFLICT (process_id) DO UPDATE
+            SET integration_type  = EXCLUDED.integration_type,
+                space_id          = EXCLUDED.space_id,
+                knowledge_base_id = EXCLUDED.knowledge_base_id,
+                connected_at      = EXCLUDED.connected_at,
+                connected         = EXCLUDED.connected,
+                rotated           = EXCLUDED.rotated
+        """,
+        credentials.process_id,
+        connected.type,
+        credentials.space_id,
+        credentials.knowledge_base_id,
+        credentials.connected.occurred_at,
+        _to_stored_record(connected),
+        _to_stored_record(rotated) if rotated else None,
+    )
+
+
+def _to_stored_record(record: ProcessTimelineEventRecords) -> str:
+    return json.dumps(
+        {"event_type": record.type, "data": record.model_dump(mode="json")}
+    )
+
+
+def _to_credentials(row: asyncpg.Record) -> IntegrationCredentials:
+    return IntegrationCredentials(
+        connected=cast(IntegrationConnected, _from_stored_record(row["connected"])),
+        rotated=cast(IntegrationTokenRotated, _from_stored_record(row["rotated"]))
+        if row["rotated"]
+        else None,
+    )
+
+
+def _from_stored_record(stored: str) -> AnyDomainEvent:
+    item = json.loads(stored)
+    return deserialize(item["event_type"], json.dumps(item["data"]))
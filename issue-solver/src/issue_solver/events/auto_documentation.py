@@ -2,13 +2,15 @@ from __future__ import annotations
 
 from dataclasses import dataclass, replace
 from datetime import datetime
-from typing import Sequence, assert_never
+from typing import TYPE_CHECKING, Sequence, assert_never
 
 from issue_solver.events.domain import (
     DocumentationPromptsDefined,
     DocumentationPromptsRemoved,
 )
-from issue_solver.events.event_store import EventStore
+
+if TYPE_CHECKING:
+    from issue_solver.events.event_store import EventStore
 
 
 AutoDocumentationEvent = DocumentationPromptsDefined | DocumentationPromptsRemoved
@@ -0,0 +1,314 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Callable, Collection, Hashable, Sequence, Type
+
+from issue_solver.events.credentials import (
+    IntegrationConnected,
+    IntegrationCredentials,
+    has_credentials_events,
+)
+from issue_solver.events.domain import AnyDomainEvent, T
+from issue_solver.events.event_store import (
+    DEFAULT_READ_ALL_BATCH_SIZE,
+    LOG_START,
+    ConcurrencyError,
+    EventStore,
+    GlobalPosition,
+    RecordedEvent,
+    StreamCursor,
+    StreamFilter,
+)
+from issue_solver.events.process_summary import ProcessSummary
+from issue_solver.events.snapshots import Snapshot
+
+DEFAULT_CACHE_MAX_ENTRIES = 1000
+
+
+@dataclass
+class CacheMetrics:
+    hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass
+class _CachedStream:
+    """Events of a stream after `start`, complete up to `start + len(events)`."""
+
+    start: int
+    events: list[AnyDomainEvent]
+    expires_at: float
+    stale: bool = False
+
+    @property
+    def version(self) -> int:
+        return self.start + len(self.events)
+
+
+class CachingEventStore(EventStore):
+    """Keeps recently read streams, snapshots and lookups in bounded LRU caches.
+
+    Streams are append-only, so a cached stream is never wrong, only short: appends
+    through this store extend it or mark it stale, and the next read only fetches
+    the events after its cached position. Other processes appending to the same
+    streams are only seen once `ttl_seconds` expires. Appends through this store
+    drop the `find`, `latest` and `get_credentials` results they may change.
+    """
+
+    def __init__(
+        self,
+        event_store: EventStore,
+        ttl_seconds: float,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be positive")
+        self._event_store = event_store
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.metrics = CacheMetrics()
+        self._streams: OrderedDict[str, _CachedStream] = OrderedDict()
+        self._snapshots: OrderedDict[str, tuple[Snapshot | None, float]] = OrderedDict()
+        self._queries: OrderedDict[tuple, tuple[Any, float]] = OrderedDict()
+
+    async def append(
+        self,
+        process_id: str,
+        *events: AnyDomainEvent,
+        expected_version: int | None = None,
+    ) -> None:
+        appended_types = tuple({type(event) for event in events})
+        credentials_changed = has_credentials_events(events)
+        self._drop_queries(
+            lambda kind, event_type, key_process_id: (
+                credentials_changed
+                if kind == "credentials"
+                else issubclass(event_type, appended_types)
+                and key_process_id in (None, process_id)
+            )
+        )
+        self._snapshots.pop(process_id, None)
+        cached = self._streams.get(process_id)
+        try:
+            await self._event_store.append(
+                process_id, *events, expected_version=expected_version
+            )
+        except ConcurrencyError:
+            if cached:
+                cached.stale = True
+            raise
+        if cached is None:
+            return
+        if expected_version is not None and expected_version == cached.version:
+            cached.events.extend(events)
+        else:
+            cached.stale = True
+
+    async def get(self, process_id: str) -> list[AnyDomainEvent]:
+        return await self.get_since(process_id, 0)
+
+    async def get_since(self, process_id: str, position: int) -> list[AnyDomainEvent]:
+        cached = self._streams.get(process_id)
+        if cached is None or cached.start > position:
+            self.metrics.misses += 1
+            events = await self._event_store.get_since(process_id, position)
+            self._remember(
+                self._streams,
+                process_id,
+                _CachedStream(position, list(events), self._expires_at()),
+            )
+            return list(events)
+        self.metrics.hits += 1
+        self._streams.move_to_end(process_id)
+        if cached.stale or self._expired(cached.expires_at):
+            await self._refresh(process_id, cached)
+        return cached.events[position - cached.start :]
+
+    async def get_snapshot(self, process_id: str) -> Snapshot | None:
+        cached = self._snapshots.get(process_id)
+        if cached is not None and not self._expired(cached[1]):
+            self.metrics.hits += 1
+            self._snapshots.move_to_end(process_id)
+            return cached[0]
+        self.metrics.misses += 1
+        snapshot = await self._event_store.get_snapshot(process_id)
+        self._remember(self._snapshots, process_id, (snapshot, self._expires_at()))
+        return snapshot
+
+    async def find(self, criteria: dict[str, Any], event_type: Type[T]) -> list[T]:
+        key = _query_key("find", event_type, None, criteria)
+        return list(
+            await self._cached_query(
+                key, lambda: self._event_store.find(criteria, event_type)
+            )
+        )
+
+    async def latest(
+        self,
+        event_type: Type[T],
+        process_id: str | None = None,
+        criteria: dict[str, Any] | None = None,
+    ) -> T | None:
+        key = _query_key("latest", event_type, process_id, criteria or {})
+        return await self._cached_query(
+            key, lambda: self._event_store.latest(event_type, process_id, criteria)
+        )
+
+    async def get_many(
+        self, process_ids: Collection[str]
+    ) -> dict[str, list[AnyDomainEvent]]:
+        cached_ids = [
+            process_id
+            for process_id in process_ids
+            if (cached := self._streams.get(process_id)) and cached.start == 0
+        ]
+        missing_ids = [
+            process_id for process_id in process_ids if process_id not in cached_ids
+        ]
+        events_by_process_id = {
+            process_id: await self.get(process_id) for process_id in cached_ids
+        }
+        if missing_ids:
+            self.metrics.misses += len(missing_ids)
+            fetched = await self._event_store.get_many(missing_ids)
+            for process_id, events in fetched.items():
+                self._remember(
+                    self._streams,
+                    process_id,
+                    _CachedStream(0, list(events), self._expires_at()),
+                )
+                events_by_process_id[process_id] = list(events)
+        return events_by_process_id
+
+    async def find_streams(
+        self,
+        filters: Sequence[StreamFilter],
+        limit: int | None = None,
+        after: StreamCursor | None = None,
+        offset: int = 0,
+        status: str | None = None,
+    ) -> list[StreamCursor]:
+        return await self._event_store.find_streams(
+            filters, limit, after, offset, status
+        )
+
+    async def count_streams(
+        self, filters: Sequence[StreamFilter], status: str | None = None
+    ) -> int:
+        return await self._event_store.count_streams(filters, status)
+
+    async def get_summaries(
+        self, process_ids: Collection[str]
+    ) -> dict[str, ProcessSummary]:
+        return await self._event_store.get_summaries(process_ids)
+
+    async def get_credentials(
+        self,
+        connected_type: type[IntegrationConnected],
+        space_id: str | None = None,
+        knowledge_base_id: str | None = None,
+    ) -> IntegrationCredentials | None:
+        key = ("credentials", connected_type, None, space_id, knowledge_base_id)
+        return await self._cached_query(
+            key,
+            lambda: self._event_store.get_credentials(
+                connected_type, space_id, knowledge_base_id
+            ),
+        )
+
+    def subscribe(
+        self,
+        stream_filter: StreamFilter | None = None,
+        process_id: str | None = None,
+        after_position: int = 0,
+    ) -> AsyncGenerator[AnyDomainEvent, None]:
+        return self._event_store.subscribe(stream_filter, process_id, after_position)
+
+    def read_all(
+        self,
+        from_checkpoint: GlobalPosition = LOG_START,
+        batch_size: int = DEFAULT_READ_ALL_BATCH_SIZE,
+    ) -> AsyncGenerator[RecordedEvent, None]:
+        return self._event_store.read_all(from_checkpoint, batch_size)
+
+    async def flush(self) -> None:
+        await self._event_store.flush()
+
+    def invalidate(self, process_id: str | None = None) -> None:
+        """Forget a stream, or everything, e.g. when notified of an append elsewhere."""
+        if process_id is None:
+            self._queries.clear()
+            self._streams.clear()
+            self._snapshots.clear()
+            return
+        self._drop_queries(
+            lambda kind, event_type, key_process_id: key_process_id
+            in (None, process_id)
+        )
+        self._streams.pop(process_id, None)
+        self._snapshots.pop(process_id, None)
+
+    def _drop_queries(self, affected: Callable[[str, type, str | None], bool]) -> None:
+        """Drop the query results `affected(kind, event_type, process_id)` selects."""
+        for key in [key for key in self._queries if affected(*key[:3])]:
+            del self._queries[key]
+
+    async def _refresh(self, process_id: str, cached: _CachedStream) -> None:
+        self.metrics.refreshes += 1
+        version = cached.version
+        events = await self._event_store.get_since(process_id, version)
+        # Concurrent reads may have refreshed the stream meanwhile: only add what they didn't.
+        cached.events.extend(events[cached.version - version :])
+        cached.stale = False
+        cached.expires_at = self._expires_at()
+
+    async def _cached_query(self, key: tuple | None, query: Callable) -> Any:
+        if key is None:
+            return await query()
+        cached = self._queries.get(key)
+        if cached is not None and not self._expired(cached[1]):
+            self.metrics.hits += 1
+            self._queries.move_to_end(key)
+            return cached[0]
+        self.metrics.misses += 1
+        result = await query()
+        self._remember(self._queries, key, (result, self._expires_at()))
+        return result
+
+    def _remember(self, cache: OrderedDict, key: Hashable, value: Any) -> None:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.max_entries:
+            cache.popitem(last=False)
+            self.metrics.evictions += 1
+
+    def _expires_at(self) -> float:
+        return self.clock() + self.ttl_seconds
+
+    def _expired(self, expires_at: float) -> bool:
+        return self.clock() >= expires_at
+
+
+def _query_key(
+    kind: str,
+    event_type: type,
+    process_id: str | None,
+    criteria: dict[str, Any],
+) -> tuple | None:
+    key = (kind, event_type, process_id, frozenset(criteria.items()))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
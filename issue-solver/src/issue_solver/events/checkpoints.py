@@ -0,0 +1,59 @@
+from abc import ABC, abstractmethod
+from contextlib import aclosing
+from typing import Awaitable, Callable
+
+from issue_solver.events.event_store import (
+    DEFAULT_READ_ALL_BATCH_SIZE,
+    LOG_START,
+    EventStore,
+    GlobalPosition,
+    RecordedEvent,
+)
+
+
+class CheckpointStore(ABC):
+    """Global position up to which each named subscriber handled the events."""
+
+    @abstractmethod
+    async def get(self, subscriber_name: str) -> GlobalPosition:
+        pass
+
+    @abstractmethod
+    async def save(self, subscriber_name: str, position: GlobalPosition) -> None:
+        pass
+
+
+class InMemoryCheckpointStore(CheckpointStore):
+    def __init__(self):
+        self.positions: dict[str, GlobalPosition] = {}
+
+    async def get(self, subscriber_name: str) -> GlobalPosition:
+        return self.positions.get(subscriber_name, LOG_START)
+
+    async def save(self, subscriber_name: str, position: GlobalPosition) -> None:
+        self.positions[subscriber_name] = position
+
+
+async def catch_up(
+    event_store: EventStore,
+    checkpoints: CheckpointStore,
+    subscriber_name: str,
+    handle: Callable[[RecordedEvent], Awaitable[None]],
+    batch_size: int = DEFAULT_READ_ALL_BATCH_SIZE,
+) -> int:
+    """Handle the events recorded since the subscriber's checkpoint, saving it every batch.
+
+    Events handled after the last saved checkpoint are handled again if this fails midway.
+    """
+    handled = 0
+    position = await checkpoints.get(subscriber_name)
+    async with aclosing(event_store.read_all(position, batch_size)) as recorded_events:
+        async for recorded_event in recorded_events:
+            await handle(recorded_event)
+            handled += 1
+            position = recorded_event.global_position
+            if handled % batch_size == 0:
+                await checkpoints.save(subscriber_name, position)
+    if handled % batch_size:
+        await checkpoints.save(subscriber_name, position)
+    return handled
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
-from typing import Sequence
+from typing import Sequence, cast
 
+from issue_solver.events.credentials import IntegrationCredentials
 from issue_solver.events.domain import (
     DomainEvent,
     most_recent_event,
@@ -8,10 +9,11 @@ from issue_solver.events.domain import (
     CodeRepositoryConnected,
 )
 from issue_solver.events.event_store import EventStore
+from issue_solver.events.snapshots import load_latest_events
 
 
 async def get_access_token(event_store: EventStore, process_id: str) -> str | None:
-    events = await event_store.get(process_id)
+    events = await load_latest_events(event_store, process_id)
     return get_most_recent_access_token(events)
 
 
@@ -70,8 +72,11 @@ async def get_connected_repo_event(
     connected_repo_event = None
     if space_id:
         # Find any repository connected to this space, regardless of which user connected it
-        events = await event_store.find({"space_id": space_id}, CodeRepositoryConnected)
-        connected_repo_event = most_recent_event(events, CodeRepositoryConnected)
+        credentials = await event_store.get_credentials(
+            CodeRepositoryConnected, space_id=space_id
+        )
+        if credentials:
+            connected_repo_event = cast(CodeRepositoryConnected, credentials.connected)
     return connected_repo_event
 
 
@@ -85,18 +90,30 @@ async def get_repo_credentials(
     event_store: EventStore,
     knowledge_base_id: str,
 ) -> RepoCredentials | None:
-    repo_events = await event_store.find(
-        {"knowledge_base_id": knowledge_base_id}, CodeRepositoryConnected
+    return to_repo_credentials(
+        await event_store.get_credentials(
+            CodeRepositoryConnected, knowledge_base_id=knowledge_base_id
+        )
     )
-    code_repository_connected = most_recent_event(repo_events, CodeRepositoryConnected)
-    if not code_repository_connected:
-        return None
-    access_token = await get_access_token(
-        event_store, code_repository_connected.process_id
+
+
+async def get_space_repo_credentials(
+    event_store: EventStore, space_id: str
+) -> RepoCredentials | None:
+    return to_repo_credentials(
+        await event_store.get_credentials(CodeRepositoryConnected, space_id=space_id)
     )
+
+
+def to_repo_credentials(
+    credentials: IntegrationCredentials | None,
+) -> RepoCredentials | None:
+    if credentials is None:
+        return None
+    code_repository_connected = cast(CodeRepositoryConnected, credentials.connected)
     return RepoCredentials(
         url=code_repository_connected.url,
-        access_token=access_token,
+        access_token=get_most_recent_access_token(credentials.events),
     )
 
 
@@ -0,0 +1,99 @@
+from dataclasses import dataclass, replace
+from typing import Sequence
+
+from issue_solver.events.domain import (
+    AnyDomainEvent,
+    CodeRepositoryConnected,
+    CodeRepositoryTokenRotated,
+    NotionIntegrationAuthorized,
+    NotionIntegrationTokenRefreshed,
+)
+
+IntegrationConnected = CodeRepositoryConnected | NotionIntegrationAuthorized
+IntegrationTokenRotated = CodeRepositoryTokenRotated | NotionIntegrationTokenRefreshed
+CREDENTIALS_EVENT_TYPES = (
+    CodeRepositoryConnected,
+    CodeRepositoryTokenRotated,
+    NotionIntegrationAuthorized,
+    NotionIntegrationTokenRefreshed,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class IntegrationCredentials:
+    """Projection of an integration stream: its latest connection and latest token rotation."""
+
+    connected: IntegrationConnected
+    rotated: IntegrationTokenRotated | None = None
+
+    @property
+    def process_id(self) -> str:
+        return self.connected.process_id
+
+    @property
+    def space_id(self) -> str | None:
+        return self.connected.space_id
+
+    @property
+    def knowledge_base_id(self) -> str | None:
+        return getattr(self.connected, "knowledge_base_id", None)
+
+    @property
+    def events(self) -> list[AnyDomainEvent]:
+        return [self.connected, *([self.rotated] if self.rotated else [])]
+
+    @classmethod
+    def from_events(
+        cls, events: Sequence[AnyDomainEvent]
+    ) -> "IntegrationCredentials | None":
+        return project_credentials(None, events)
+
+    def matches(
+        self,
+        connected_type: type[IntegrationConnected],
+        space_id: str | None = None,
+        knowledge_base_id: str | None = None,
+    ) -> bool:
+        return (
+            isinstance(self.connected, connected_type)
+            and (space_id is None or self.space_id == space_id)
+            and (
+                knowledge_base_id is None or self.knowledge_base_id == knowledge_base_id
+            )
+        )
+
+
+def has_credentials_events(events: Sequence[AnyDomainEvent]) -> bool:
+    return any(isinstance(event, CREDENTIALS_EVENT_TYPES) for event in events)
+
+
+def project_credentials(
+    credentials: IntegrationCredentials | None, events: Sequence[AnyDomainEvent]
+) -> IntegrationCredentials | None:
+    """Credentials after appending events; rotations before any connection are ignored."""
+    for event in events:
+        if isinstance(event, (CodeRepositoryConnected, NotionIntegrationAuthorized)):
+            if (
+                credentials is None
+                or event.occurred_at >= credentials.connected.occurred_at
+            ):
+                credentials = IntegrationCredentials(
+                    event, credentials.rotated if credentials else None
+                )
+        elif isinstance(
+            event, (CodeRepositoryTokenRotated, NotionIntegrationTokenRefreshed)
+        ):
+            if credentials is not None and (
+                credentials.rotated is None
+                or event.occurred_at >= credentials.rotated.occurred_at
+            ):
+                credentials = replace(credentials, rotated=event)
+    return credentials
+
+
+def latest_credentials(
+    candidates: Sequence[IntegrationCredentials],
+) -> IntegrationCredentials | None:
+    if not candidates:
+        return None
+    return max(candidates, key=lambda credentials: credentials.connected.occurred_at)
@@ -1,38 +1,262 @@
+import asyncio
 from abc import abstractmethod, ABC
 from collections import defaultdict
-from typing import Any, Type
-from issue_solver.events.domain import AnyDomainEvent, T
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Collection,
+    Sequence,
+    Type,
+    cast,
+)
+from issue_solver.events.credentials import (
+    IntegrationConnected,
+    IntegrationCredentials,
+    latest_credentials,
+)
+from issue_solver.events.domain import AnyDomainEvent, T, most_recent_event
+from issue_solver.events.process_summary import ProcessSummary, to_status
+from issue_solver.events.snapshots import (
+    DEFAULT_SNAPSHOT_INTERVAL,
+    Snapshot,
+    compact,
+    crosses_snapshot_interval,
+)
+
+DEFAULT_APPEND_ATTEMPTS = 3
+DEFAULT_READ_ALL_BATCH_SIZE = 500
+
+
+class ConcurrencyError(Exception):
+    def __init__(
+        self,
+        process_id: str,
+        expected_version: int | None,
+        actual_version: int | None = None,
+    ):
+        self.process_id = process_id
+        self.expected_version = expected_version
+        self.actual_version = actual_version
+        super().__init__(
+            f"Concurrent append on process {process_id}: expected version {expected_version}, got {actual_version}"
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class StreamFilter:
+    """Selects the streams holding at least one event of this type matching the criteria."""
+
+    event_type: Type[AnyDomainEvent]
+    criteria: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class StreamCursor:
+    """Keyset position of a stream: when its first matching event occurred."""
+
+    process_id: str
+    anchored_at: datetime
+
+
+@dataclass(frozen=True, slots=True, order=True)
+class GlobalPosition:
+    """Position in the global log of all streams: by transaction, then by insert.
+
+    Positions are taken at insert but transactions commit in any order, so the
+    transaction comes first: no later commit can land before a position already read.
+    """
+
+    transaction_id: int
+    position: int
+
+
+LOG_START = GlobalPosition(0, 0)
+
+
+@dataclass(frozen=True, slots=True)
+class RecordedEvent:
+    """An event with its position in the global log of all streams."""
+
+    global_position: GlobalPosition
+    process_id: str
+    event: AnyDomainEvent
 
 
 class EventStore(ABC):
     @abstractmethod
-    async def append(self, process_id: str, *events: AnyDomainEvent) -> None:
+    async def append(
+        self,
+        process_id: str,
+        *events: AnyDomainEvent,
+        expected_version: int | None = None,
+    ) -> None:
         pass
 
     @abstractmethod
     async def get(self, process_id: str) -> list[AnyDomainEvent]:
         pass
 
+    @abstractmethod
+    async def get_since(self, process_id: str, position: int) -> list[AnyDomainEvent]:
+        """Events of the stream after the given position (positions start at 1)."""
+        pass
+
+    @abstractmethod
+    async def get_snapshot(self, process_id: str) -> Snapshot | None:
+        pass
+
     @abstractmethod
     async def find(self, criteria: dict[str, Any], event_type: Type[T]) -> list[T]:
         pass
 
+    @abstractmethod
+    async def latest(
+        self,
+        event_type: Type[T],
+        process_id: str | None = None,
+        criteria: dict[str, Any] | None = None,
+    ) -> T | None:
+        """Most recent event of a type, within a stream and/or matching the criteria."""
+        pass
+
+    @abstractmethod
+    async def get_many(
+        self, process_ids: Collection[str]
+    ) -> dict[str, list[AnyDomainEvent]]:
+        pass
+
+    @abstractmethod
+    async def find_streams(
+        self,
+        filters: Sequence[StreamFilter],
+        limit: int | None = None,
+        after: StreamCursor | None = None,
+        offset: int = 0,
+        status: str | None = None,
+    ) -> list[StreamCursor]:
+        """Page through matching streams, most recently started first."""
+        pass
+
+    @abstractmethod
+    async def count_streams(
+        self, filters: Sequence[StreamFilter], status: str | None = None
+    ) -> int:
+        """Number of streams `find_streams` pages through."""
+        pass
+
+    @abstractmethod
+    async def get_summaries(
+        self, process_ids: Collection[str]
+    ) -> dict[str, ProcessSummary]:
+        """Summaries of the given processes; unknown processes are left out."""
+        pass
+
+    @abstractmethod
+    async def get_credentials(
+        self,
+        connected_type: type[IntegrationConnected],
+        space_id: str | None = None,
+        knowledge_base_id: str | None = None,
+    ) -> IntegrationCredentials | None:
+        """Credentials of the most recent integration of this type in a space and/or knowledge base."""
+        pass
+
+    @abstractmethod
+    def subscribe(
+        self,
+        stream_filter: StreamFilter | None = None,
+        process_id: str | None = None,
+        after_position: int = 0,
+    ) -> AsyncGenerator[AnyDomainEvent, None]:
+        """Events appended from now on, matching the filter and/or within a stream.
+
+        Within a stream, the events after `after_position` are replayed first. Close
+        the iterator (e.g. with `contextlib.aclosing`) to stop listening.
+        """
+        pass
+
+    @abstractmethod
+    def read_all(
+        self,
+        from_checkpoint: GlobalPosition = LOG_START,
+        batch_size: int = DEFAULT_READ_ALL_BATCH_SIZE,
+    ) -> AsyncGenerator[RecordedEvent, None]:
+        """Events of every stream after a global position, in the order they were recorded.
+
+        Stops at the last event committed when reading started.
+        """
+        pass
+
+    async def flush(self) -> None:
+        """Deliver notifications still pending, if the store sends any in the background."""
+
 
 class InMemoryEventStore(EventStore):
-    def __init__(self):
-        self.events_by_process_id = defaultdict(list)
+    def __init__(self, snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL):
+        self.events_by_process_id: dict[str, list[AnyDomainEvent]] = defaultdict(list)
+        self.snapshots: dict[str, Snapshot] = {}
+        self.snapshot_interval = snapshot_interval
+        self.subscribers: list[asyncio.Queue[tuple[str, list[AnyDomainEvent]]]] = []
+        self.recorded_events: list[RecordedEvent] = []
 
-    async def append(self, process_id: str, *events: AnyDomainEvent) -> None:
+    async def append(
+        self,
+        process_id: str,
+        *events: AnyDomainEvent,
+        expected_version: int | None = None,
+    ) -> None:
         if process_id not in self.events_by_process_id:
             self.events_by_process_id[process_id] = []
+        actual_version = len(self.events_by_process_id[process_id])
+        if expected_version is not None and expected_version != actual_version:
+            raise ConcurrencyError(process_id, expected_version, actual_version)
         for e in events:
             self.events_by_process_id[process_id].append(e)
+            self.recorded_events.append(
+                RecordedEvent(
+                    GlobalPosition(0, len(self.recorded_events) + 1), process_id, e
+                )
+            )
+        for subscriber in self.subscribers:
+            subscriber.put_nowait((process_id, list(events)))
+        version = len(self.events_by_process_id[process_id])
+        if crosses_snapshot_interval(actual_version, version, self.snapshot_interval):
+            previous = self.snapshots.get(process_id)
+            self.snapshots[process_id] = Snapshot(
+                process_id,
+                version,
+                compact(
+                    [
+                        *(previous.events if previous else []),
+                        *await self.get_since(
+                            process_id, previous.position if previous else 0
+                        ),
+                    ]
+                ),
+            )
 
     async def get(self, process_id: str) -> list[AnyDomainEvent]:
         return self.events_by_process_id.get(process_id, [])
 
+    async def get_since(self, process_id: str, position: int) -> list[AnyDomainEvent]:
+        return self.events_by_process_id.get(process_id, [])[position:]
+
+    async def get_snapshot(self, process_id: str) -> Snapshot | None:
+        return self.snapshots.get(process_id)
+
+    async def get_many(
+        self, process_ids: Collection[str]
+    ) -> dict[str, list[AnyDomainEvent]]:
+        return {
+            process_id: self.events_by_process_id.get(process_id, [])
+            for process_id in process_ids
+        }
+
     async def find(self, criteria: dict[str, Any], event_type: Type[T]) -> list[T]:
-        result = []
+        result: list[T] = []
         for process_id, events in self.events_by_process_id.items():
             for event in events:
                 if isinstance(event, event_type):
@@ -42,3 +266,170 @@ class InMemoryEventStore(EventStore):
                     if match:
                         result.append(event)
         return result
+
+    async def latest(
+        self,
+        event_type: Type[T],
+        process_id: str | None = None,
+        criteria: dict[str, Any] | None = None,
+    ) -> T | None:
+        streams = (
+            [self.events_by_process_id.get(process_id, [])]
+            if process_id is not None
+            else self.events_by_process_id.values()
+        )
+        stream_filter = StreamFilter(
+            cast(Type[AnyDomainEvent], event_type), criteria or {}
+        )
+        return most_recent_event(
+            [
+                event
+                for events in streams
+                for event in events
+                if _matches(event, stream_filter)
+            ],
+            event_type,
+        )
+
+    async def find_streams(
+        self,
+        filters: Sequence[StreamFilter],
+        limit: int | None = None,
+        after: StreamCursor | None = None,
+        offset: int = 0,
+        status: str | None = None,
+    ) -> list[StreamCursor]:
+        matching = self._matching_streams(filters, status)
+        matching.sort(key=lambda s: (s.anchored_at, s.process_id), reverse=True)
+        if after is not None:
+            matching = [
+                s
+                for s in matching
+                if (s.anchored_at, s.process_id) < (after.anchored_at, after.process_id)
+            ]
+        page = matching[offset:]
+        if limit is not None:
+            page = page[:limit]
+        return page
+
+    async def count_streams(
+        self, filters: Sequence[StreamFilter], status: str | None = None
+    ) -> int:
+        return len(self._matching_streams(filters, status))
+
+    def _matching_streams(
+        self, filters: Sequence[StreamFilter], status: str | None
+    ) -> list[StreamCursor]:
+        matching = []
+        for process_id, events in self.events_by_process_id.items():
+            anchors = [
+                event.occurred_at
+                for event in events
+                if any(_matches(event, one_filter) for one_filter in filters)
+            ]
+            if anchors and (status is None or to_status(events) == status):
+                matching.append(StreamCursor(process_id, min(anchors)))
+        return matching
+
+    async def get_summaries(
+        self, process_ids: Collection[str]
+    ) -> dict[str, ProcessSummary]:
+        return {
+            process_id: ProcessSummary.from_events(process_id, events)
+            for process_id in process_ids
+            if (events := self.events_by_process_id.get(process_id))
+        }
+
+    async def get_credentials(
+        self,
+        connected_type: type[IntegrationConnected],
+        space_id: str | None = None,
+        knowledge_base_id: str | None = None,
+    ) -> IntegrationCredentials | None:
+        return latest_credentials(
+            [
+                credentials
+                for events in self.events_by_process_id.values()
+                if (credentials := IntegrationCredentials.from_events(events))
+                and credentials.matches(connected_type, space_id, knowledge_base_id)
+            ]
+        )
+
+    async def subscribe(
+        self,
+        stream_filter: StreamFilter | None = None,
+        process_id: str | None = None,
+        after_position: int = 0,
+    ) -> AsyncGenerator[AnyDomainEvent, None]:
+        appended: asyncio.Queue[tuple[str, list[AnyDomainEvent]]] = asyncio.Queue()
+        self.subscribers.append(appended)
+        try:
+            if process_id is not None:
+                for event in self.events_by_process_id.get(process_id, [])[
+                    after_position:
+                ]:
+                    if subscription_matches(event, stream_filter):
+                        yield event
+            while True:
+                appended_process_id, events = await appended.get()
+                if process_id is not None and appended_process_id != process_id:
+                    continue
+                for event in events:
+                    if subscription_matches(event, stream_filter):
+                        yield event
+        finally:
+            self.subscribers.remove(appended)
+
+    async def read_all(
+        self,
+        from_checkpoint: GlobalPosition = LOG_START,
+        batch_size: int = DEFAULT_READ_ALL_BATCH_SIZE,
+    ) -> AsyncGenerator[RecordedEvent, None]:
+        for recorded_event in self.recorded_events[from_checkpoint.position :]:
+            yield recorded_event
+
+
+def subscription_matches(
+    event: AnyDomainEvent, stream_filter: StreamFilter | None
+) -> bool:
+    return stream_filter is None or _matches(event, stream_filter)
+
+
+def _matches(event: AnyDomainEvent, stream_filter: StreamFilter) -> bool:
+    return isinstance(event, stream_filter.event_type) and all(
+        getattr(event, key) == value for key, value in stream_filter.criteria.items()
+    )
+
+
+async def append_with_retry(
+    event_store: EventStore,
+    process_id: str,
+    decide: Callable[[list[AnyDomainEvent]], Sequence[AnyDomainEvent]],
+    history: Sequence[AnyDomainEvent] | None = None,
+    version: int | None = None,
+    max_attempts: int = DEFAULT_APPEND_ATTEMPTS,
+) -> list[AnyDomainEvent]:
+    """Append the events decided from the current stream, replaying the decision on concurrent writes.
+
+    The whole stream is read unless `history` is given along with the `version` it
+    was read at, e.g. from `load_latest_events_and_version`. Replays then add the
+    events appended since to that history, reading nothing else.
+    """
+    if history is None or version is None:
+        history = await event_store.get(process_id)
+        version = len(history)
+    attempt = 1
+    while True:
+        new_events = list(decide(list(history)))
+        if not new_events:
+            return []
+        try:
+            await event_store.append(process_id, *new_events, expected_version=version)
+            return new_events
+        except ConcurrencyError:
+            if attempt == max_attempts:
+                raise
+            attempt += 1
+            appended = await event_store.get_since(process_id, version)
+            history = [*history, *appended]
+            version += len(appended)
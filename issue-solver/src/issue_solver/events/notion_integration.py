@@ -1,11 +1,10 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Self
+from typing import Self, cast
 
 from issue_solver.events.domain import (
     NotionIntegrationAuthorized,
     NotionIntegrationTokenRefreshed,
-    most_recent_event,
 )
 from issue_solver.events.event_store import EventStore
 
@@ -40,26 +39,28 @@ class NotionCredentials:
 async def get_notion_integration_event(
     event_store: EventStore, space_id: str
 ) -> NotionIntegrationAuthorized | None:
-    events = await event_store.find({"space_id": space_id}, NotionIntegrationAuthorized)
-    return most_recent_event(events, NotionIntegrationAuthorized)
+    return await event_store.latest(
+        NotionIntegrationAuthorized, criteria={"space_id": space_id}
+    )
 
 
 async def get_integration_by_process(
     event_store: EventStore, process_id: str
 ) -> NotionIntegrationAuthorized | None:
-    events = await event_store.get(process_id)
-    return most_recent_event(events, NotionIntegrationAuthorized)
+    return await event_store.latest(NotionIntegrationAuthorized, process_id=process_id)
 
 
 async def get_notion_credentials(
     event_store: EventStore, space_id: str
 ) -> NotionCredentials | None:
-    notion_connected = await get_notion_integration_event(event_store, space_id)
-    if not notion_connected:
+    credentials = await event_store.get_credentials(
+        NotionIntegrationAuthorized, space_id=space_id
+    )
+    if not credentials:
         return None
 
-    events = await event_store.get(notion_connected.process_id)
-    latest_rotation = most_recent_event(events, NotionIntegrationTokenRefreshed)
+    notion_connected = cast(NotionIntegrationAuthorized, credentials.connected)
+    latest_rotation = cast(NotionIntegrationTokenRefreshed | None, credentials.rotated)
     if latest_rotation and latest_rotation.occurred_at > notion_connected.occurred_at:
         return NotionCredentials.create_from(latest_rotation)
     return NotionCredentials.create_from(notion_connected)
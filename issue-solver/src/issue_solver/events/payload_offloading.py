@@ -0,0 +1,309 @@
+import asyncio
+import hashlib
+import json
+import os
+from abc import ABC, abstractmethod
+from dataclasses import fields, replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable, TypeVar, get_args, get_origin
+
+import boto3
+from botocore.exceptions import ClientError
+from pydantic import BaseModel, ConfigDict
+
+DEFAULT_OFFLOAD_THRESHOLD_BYTES = 64 * 1024
+EVENT_PAYLOADS_PREFIX = "event-payloads"
+
+R = TypeVar("R", bound=BaseModel)
+E = TypeVar("E")
+
+
+class PayloadBlobStore(ABC):
+    """Content-addressed storage for the large fields of event records.
+
+    Calls block: event stores run them in a thread, unless a mapping nobody loaded
+    beforehand is read (see `OffloadedDict`).
+    """
+
+    @abstractmethod
+    def put(self, blob_key: str, content: bytes) -> None:
+        pass
+
+    @abstractmethod
+    def get(self, blob_key: str) -> bytes:
+        pass
+
+
+class LocalPayloadBlobStore(PayloadBlobStore):
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def put(self, blob_key: str, content: bytes) -> None:
+        path = self.directory / blob_key
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+
+    def get(self, blob_key: str) -> bytes:
+        return (self.directory / blob_key).read_bytes()
+
+
+class S3PayloadBlobStore(PayloadBlobStore):
+    def __init__(
+        self, s3_client: Any, bucket_name: str, prefix: str = EVENT_PAYLOADS_PREFIX
+    ) -> None:
+        self.s3_client = s3_client
+        self.bucket_name = bucket_name
+        self.prefix = prefix
+
+    def put(self, blob_key: str, content: bytes) -> None:
+        key = f"{self.prefix}/{blob_key}"
+        try:
+            self.s3_client.head_object(Bucket=self.bucket_name, Key=key)
+            return
+        except ClientError as e:
+            if e.response["Error"]["Code"] not in ("404", "NoSuchKey", "NotFound"):
+                raise
+        self.s3_client.put_object(Bucket=self.bucket_name, Key=key, Body=content)
+
+    def get(self, blob_key: str) -> bytes:
+        response = self.s3_client.get_object(
+            Bucket=self.bucket_name, Key=f"{self.prefix}/{blob_key}"
+        )
+        return response["Body"].read()
+
+
+class BlobReference(BaseModel):
+    """Stands for a field value kept in the payload blob store."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    blob_key: str
+    size: int
+
+
+def _get_offload_threshold() -> int:
+    return int(
+        os.environ.get(
+            "EVENT_PAYLOAD_OFFLOAD_THRESHOLD", DEFAULT_OFFLOAD_THRESHOLD_BYTES
+        )
+    )
+
+
+def _get_payload_blob_store() -> PayloadBlobStore | None:
+    return _payload_blob_store(
+        os.environ.get("EVENT_PAYLOADS_BUCKET_NAME"),
+        os.environ.get("EVENT_PAYLOADS_DIRECTORY"),
+    )
+
+
+@lru_cache(maxsize=4)
+def _payload_blob_store(
+    bucket_name: str | None, directory: str | None
+) -> PayloadBlobStore | None:
+    if bucket_name:
+        return S3PayloadBlobStore(boto3.client("s3"), bucket_name)
+    if directory:
+        return LocalPayloadBlobStore(Path(directory))
+    return None
+
+
+class OffloadedDict(dict):
+    """Mapping kept in the payload blob store, only fetched when first read.
+
+    Reading events back doesn't wait on the blob store: `load_payloads` fetches the
+    mappings that are going to be read concurrently, anything else fetches on access.
+    """
+
+    def __init__(self, reference: BlobReference, blob_store: PayloadBlobStore) -> None:
+        super().__init__()
+        self.reference = reference
+        self.blob_store = blob_store
+        self.loaded = False
+
+    def load(self) -> "OffloadedDict":
+        if not self.loaded:
+            self._fill(self.blob_store.get(self.reference.blob_key))
+        return self
+
+    def _fill(self, content: bytes) -> None:
+        if not self.loaded:
+            dict.update(self, json.loads(content))
+            self.loaded = True
+
+    def __reduce__(self) -> tuple:
+        return dict, (dict(self.load()),)
+
+
+def _loading(name: str) -> Any:
+    method = getattr(dict, name)
+
+    def loading_method(self: OffloadedDict, *args: Any, **kwargs: Any) -> Any:
+        return method(self.load(), *args, **kwargs)
+
+    loading_method.__name__ = name
+    return loading_method
+
+
+for _name in (
+    "__contains__",
+    "__eq__",
+    "__getitem__",
+    "__iter__",
+    "__len__",
+    "__ne__",
+    "__or__",
+    "__repr__",
+    "__reversed__",
+    "__ror__",
+    "copy",
+    "get",
+    "items",
+    "keys",
+    "values",
+):
+    setattr(OffloadedDict, _name, _loading(_name))
+
+
+class OffloadedStr(str):
+    """Text read back from the payload blob store, still knowing where it is kept."""
+
+    reference: BlobReference
+
+    def __new__(cls, content: str, reference: BlobReference) -> "OffloadedStr":
+        text = super().__new__(cls, content)
+        text.reference = reference
+        return text
+
+
+def loaded(value: Any) -> Any:
+    """Field value to put in a record: offloaded mappings are fetched by now."""
+    return value.load() if isinstance(value, OffloadedDict) else value
+
+
+def referenced(event: E) -> E:
+    """The event with blob store values as references, serialized without fetching them."""
+    update = {
+        field.name: value.reference
+        for field in fields(event)  # type: ignore[arg-type]
+        if isinstance(
+            value := getattr(event, field.name), (OffloadedDict, OffloadedStr)
+        )
+    }
+    return replace(event, **update) if update else event  # type: ignore[type-var]
+
+
+async def load_payloads(events: Iterable[object]) -> None:
+    """Fetch the offloaded mappings of events concurrently, before reading them."""
+    pending = [
+        value
+        for event in events
+        for field in fields(event)  # type: ignore[arg-type]
+        if isinstance(value := getattr(event, field.name), OffloadedDict)
+        and not value.loaded
+    ]
+    contents = await asyncio.gather(
+        *(
+            asyncio.to_thread(value.blob_store.get, value.reference.blob_key)
+            for value in pending
+        )
+    )
+    for value, content in zip(pending, contents):
+        value._fill(content)
+
+
+def inline_dict(value: dict[str, Any] | BlobReference) -> dict[str, Any]:
+    """Domain value of a record field, once its offloaded payload is resolved."""
+    if isinstance(value, BlobReference):
+        raise RuntimeError(f"Event payload {value.blob_key} has not been resolved")
+    return value
+
+
+def inline_str(value: str | BlobReference) -> str:
+    """Domain value of a record field, once its offloaded payload is resolved."""
+    if isinstance(value, BlobReference):
+        raise RuntimeError(f"Event payload {value.blob_key} has not been resolved")
+    return value
+
+
+@lru_cache(maxsize=None)
+def _offloadable_fields(record_class: type[BaseModel]) -> dict[str, type]:
+    """Fields that may hold a blob reference, with the type of their inline value."""
+    offloadable = {}
+    for name, field in record_class.model_fields.items():
+        arguments = get_args(field.annotation)
+        if BlobReference in arguments:
+            (value_type,) = (
+                get_origin(argument) or argument
+                for argument in arguments
+                if argument is not BlobReference
+            )
+            offloadable[name] = value_type
+    return offloadable
+
+
+async def offload_payloads(record: R, event: object) -> R:
+    """The record of `event`, its large fields moved to the payload blob store.
+
+    Values read back from the blob store keep their reference: stored events are never
+    written again.
+    """
+    update: dict[str, Any] = {}
+    for name in _offloadable_fields(type(record)):
+        value = getattr(event, name)
+        if isinstance(value, BlobReference):
+            continue
+        if isinstance(value, (OffloadedDict, OffloadedStr)):
+            update[name] = value.reference
+            continue
+        content = (
+            json.dumps(value) if isinstance(value, dict) else str(value)
+        ).encode()
+        if len(content) <= _get_offload_threshold():
+            continue
+        blob_store = _get_payload_blob_store()
+        if blob_store is None:
+            continue
+        reference = BlobReference(
+            blob_key=f"sha256/{hashlib.sha256(content).hexdigest()}",
+            size=len(content),
+        )
+        await asyncio.to_thread(blob_store.put, reference.blob_key, content)
+        update[name] = reference
+    return record.model_copy(update=update) if update else record
+
+
+async def resolve_payloads(record: R) -> R:
+    """The record with its offloaded fields read back from the payload blob store.
+
+    Mappings are only fetched when read. Text can't wait: it is fetched right away,
+    all fields of the record at once.
+    """
+    update: dict[str, Any] = {}
+    texts: dict[str, BlobReference] = {}
+    blob_store = None
+    for name, value_type in _offloadable_fields(type(record)).items():
+        reference = getattr(record, name)
+        if not isinstance(reference, BlobReference):
+            continue
+        blob_store = _get_payload_blob_store()
+        if blob_store is None:
+            raise RuntimeError(
+                f"Event payload {reference.blob_key} is offloaded but no payload blob store is configured"
+            )
+        if value_type is dict:
+            update[name] = OffloadedDict(reference, blob_store)
+        else:
+            texts[name] = reference
+    if blob_store is not None and texts:
+        contents = await asyncio.gather(
+            *(
+                asyncio.to_thread(blob_store.get, reference.blob_key)
+                for reference in texts.values()
+            )
+        )
+        for (name, reference), content in zip(texts.items(), contents):
+            update[name] = OffloadedStr(content.decode(), reference)
+    return record.model_copy(update=update) if update else record
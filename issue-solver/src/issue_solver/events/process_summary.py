@@ -0,0 +1,224 @@
+from dataclasses import dataclass, replace
+from datetime import UTC, datetime
+from typing import Sequence
+
+from issue_solver.events.auto_documentation import AutoDocumentationSetup
+from issue_solver.events.domain import (
+    AnyDomainEvent,
+    CodeRepositoryConnected,
+    CodeRepositoryTokenRotated,
+    CodeRepositoryIndexed,
+    RepositoryIndexationRequested,
+    IssueResolutionRequested,
+    IssueResolutionStarted,
+    IssueResolutionCompleted,
+    IssueResolutionFailed,
+    CodeRepositoryIntegrationFailed,
+    EnvironmentConfigurationProvided,
+    EnvironmentConfigurationValidated,
+    EnvironmentValidationFailed,
+    IssueResolutionEnvironmentPrepared,
+    NotionIntegrationAuthorized,
+    NotionIntegrationTokenRefreshed,
+    NotionIntegrationAuthorizationFailed,
+    DocumentationPromptsDefined,
+    DocumentationPromptsRemoved,
+    DocumentationGenerationRequested,
+    DocumentationGenerationStarted,
+    DocumentationGenerationCompleted,
+    DocumentationGenerationFailed,
+)
+
+DocumentationGenerationEvent = (
+    DocumentationGenerationRequested
+    | DocumentationGenerationStarted
+    | DocumentationGenerationCompleted
+    | DocumentationGenerationFailed
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ProcessSummary:
+    """Narrow projection of a process stream, kept up to date on every append."""
+
+    process_id: str
+    type: str
+    status: str
+    run_id: str | None
+    space_id: str | None
+    knowledge_base_id: str | None
+    created_at: datetime
+    updated_at: datetime
+    event_count: int
+    status_at: datetime | None = None
+
+    @classmethod
+    def from_events(
+        cls, process_id: str, events: Sequence[AnyDomainEvent]
+    ) -> "ProcessSummary":
+        if not events:
+            raise ValueError("No events provided to summarize process.")
+        return cls(
+            process_id=process_id,
+            type=infer_process_type(events),
+            status=to_status(events),
+            run_id=extract_run_id(events),
+            space_id=_first_attribute(events, "space_id"),
+            knowledge_base_id=_first_attribute(events, "knowledge_base_id"),
+            created_at=min(_utc(event.occurred_at) for event in events),
+            updated_at=max(_utc(event.occurred_at) for event in events),
+            event_count=len(events),
+            status_at=status_changed_at(events),
+        )
+
+    def can_apply(self, events: Sequence[AnyDomainEvent]) -> bool:
+        """Prompt removals need the whole documentation history to tell the status,
+        and summaries stored without `status_at` can't tell which status is the latest."""
+        if self.status_at is None and self.status != "unknown":
+            return False
+        return not any(
+            isinstance(event, DocumentationPromptsRemoved) for event in events
+        )
+
+    def apply(self, events: Sequence[AnyDomainEvent]) -> "ProcessSummary":
+        """Summary after appending events, without replaying the stream."""
+        if not events:
+            return self
+        if not self.can_apply(events):
+            raise ValueError("The whole stream is needed to summarize these events.")
+        status, status_at = self.status, self.status_at
+        changed_at = status_changed_at(events)
+        # As in `to_status`, the latest event wins, and the appended one on ties.
+        if changed_at is not None and (status_at is None or changed_at >= status_at):
+            status, status_at = to_status(events), changed_at
+        return replace(
+            self,
+            status=status,
+            status_at=status_at,
+            run_id=self.run_id or extract_run_id(events),
+            space_id=self.space_id or _first_attribute(events, "space_id"),
+            knowledge_base_id=self.knowledge_base_id
+            or _first_attribute(events, "knowledge_base_id"),
+            created_at=min(self.created_at, *(_utc(e.occurred_at) for e in events)),
+            updated_at=max(self.updated_at, *(_utc(e.occurred_at) for e in events)),
+            event_count=self.event_count + len(events),
+        )
+
+
+def infer_process_type(events: Sequence[AnyDomainEvent]) -> str:
+    if not events:
+        raise ValueError("No events provided to infer process type.")
+    first_event = events[0]
+    if isinstance(first_event, IssueResolutionRequested):
+        return "issue_resolution"
+    if isinstance(first_event, EnvironmentConfigurationProvided):
+        return "dev_environment_setup"
+    if isinstance(first_event, NotionIntegrationAuthorized):
+        return "notion_integration"
+    if isinstance(
+        first_event, (DocumentationPromptsDefined, DocumentationPromptsRemoved)
+    ):
+        return "docs_setup"
+    if isinstance(first_event, DocumentationGenerationEvent):
+        return "docs_generation"
+    return "code_repository_integration"
+
+
+def to_status(events: Sequence[AnyDomainEvent]) -> str:
+    status_affecting_events = _status_affecting(events)
+
+    if not status_affecting_events:
+        return "unknown"
+
+    status_affecting_events.sort(key=lambda event: event.occurred_at)
+    last_event = status_affecting_events[-1]
+    match last_event:
+        case CodeRepositoryConnected() | NotionIntegrationAuthorized():
+            status = "connected"
+        case CodeRepositoryIndexed():
+            status = "indexed"
+        case RepositoryIndexationRequested():
+            status = "indexing"
+        case IssueResolutionEnvironmentPrepared():
+            status = "starting"
+        case IssueResolutionRequested():
+            status = "requested"
+        case IssueResolutionStarted():
+            status = "in_progress"
+        case IssueResolutionCompleted():
+            status = "completed"
+        case (
+            IssueResolutionFailed()
+            | CodeRepositoryIntegrationFailed()
+            | EnvironmentValidationFailed()
+            | NotionIntegrationAuthorizationFailed()
+        ):
+            status = "failed"
+        case EnvironmentConfigurationProvided():
+            status = "configuring"
+        case EnvironmentConfigurationValidated():
+            status = "ready"
+        case DocumentationPromptsDefined():
+            status = "configured"
+        case DocumentationPromptsRemoved():
+            status = "configured" if _auto_doc_prompts_remaining(events) else "removed"
+        case DocumentationGenerationRequested():
+            status = "requested"
+        case DocumentationGenerationStarted():
+            status = "in_progress"
+        case DocumentationGenerationCompleted():
+            status = "completed"
+        case DocumentationGenerationFailed():
+            status = "failed"
+        case _:
+            status = "unknown"
+    return status
+
+
+def status_changed_at(events: Sequence[AnyDomainEvent]) -> datetime | None:
+    """When the event `to_status` tells the status from occurred."""
+    status_affecting_events = _status_affecting(events)
+    if not status_affecting_events:
+        return None
+    return max(_utc(event.occurred_at) for event in status_affecting_events)
+
+
+def _status_affecting(events: Sequence[AnyDomainEvent]) -> list[AnyDomainEvent]:
+    return [
+        event
+        for event in events
+        if not isinstance(event, CodeRepositoryTokenRotated)
+        and not isinstance(event, NotionIntegrationTokenRefreshed)
+    ]
+
+
+def extract_run_id(events: Sequence[AnyDomainEvent]) -> str | None:
+    for event in events:
+        if isinstance(event, DocumentationGenerationEvent):
+            return getattr(event, "run_id", None)
+    return None
+
+
+def _auto_doc_prompts_remaining(events: Sequence[AnyDomainEvent]) -> bool:
+    doc_events = [
+        event
+        for event in events
+        if isinstance(event, (DocumentationPromptsDefined, DocumentationPromptsRemoved))
+    ]
+    if not doc_events:
+        return False
+    knowledge_base_id = doc_events[0].knowledge_base_id
+    setup = AutoDocumentationSetup.from_events(knowledge_base_id, doc_events)
+    return bool(setup.docs_prompts)
+
+
+def _first_attribute(events: Sequence[AnyDomainEvent], name: str) -> str | None:
+    for event in events:
+        value = getattr(event, name, None)
+        if value:
+            return value
+    return None
+
+
+def _utc(moment: datetime) -> datetime:
+    return moment if moment.tzinfo else moment.replace(tzinfo=UTC)
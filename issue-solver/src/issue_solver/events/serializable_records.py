@@ -1,6 +1,6 @@
 import os
 from datetime import datetime
-from typing import Any, Literal, Self, Type, assert_never
+from typing import Any, Literal, Self, Type
 
 from cryptography.fernet import Fernet
 
@@ -38,6 +38,15 @@ from issue_solver.events.domain import (
 )
 from pydantic import BaseModel, Field, AliasChoices
 
+from issue_solver.events.payload_offloading import (
+    BlobReference,
+    inline_dict,
+    inline_str,
+    loaded,
+    offload_payloads,
+    referenced,
+    resolve_payloads,
+)
 from issue_solver.issues.issue import IssueInfo
 from issue_solver.models.supported_models import (
     SupportedAIModel,
@@ -47,71 +56,33 @@ from issue_solver.models.supported_models import (
 
 
 def get_record_type(event_type: Type[T]) -> str:
-    match event_type:
-        case type() if event_type is CodeRepositoryConnected:
-            return "repository_connected"
-        case type() if event_type is CodeRepositoryTokenRotated:
-            return "repository_token_rotated"
-        case type() if event_type is CodeRepositoryIntegrationFailed:
-            return "repository_integration_failed"
-        case type() if event_type is CodeRepositoryIndexed:
-            return "repository_indexed"
-        case type() if event_type is RepositoryIndexationRequested:
-            return "repository_indexation_requested"
-        case type() if event_type is IssueResolutionRequested:
-            return "issue_resolution_requested"
-        case type() if event_type is IssueResolutionStarted:
-            return "issue_resolution_started"
-        case type() if event_type is IssueResolutionCompleted:
-            return "issue_resolution_completed"
-        case type() if event_type is IssueResolutionFailed:
-            return "issue_resolution_failed"
-        case type() if event_type is EnvironmentConfigurationProvided:
-            return "environment_configuration_provided"
-        case type() if event_type is EnvironmentConfigurationValidated:
-            return "environment_configuration_validated"
-        case type() if event_type is EnvironmentValidationFailed:
-            return "environment_validation_failed"
-        case type() if event_type is IssueResolutionEnvironmentPrepared:
-            return "issue_resolution_environment_prepared"
-        case type() if event_type is NotionIntegrationAuthorized:
-            return "notion_integration_authorized"
-        case type() if event_type is NotionIntegrationTokenRefreshed:
-            return "notion_integration_token_refreshed"
-        case type() if event_type is NotionIntegrationAuthorizationFailed:
-            return "notion_integration_authorization_failed"
-        case type() if event_type is DocumentationPromptsDefined:
-            return "documentation_prompts_defined"
-        case type() if event_type is DocumentationPromptsRemoved:
-            return "documentation_prompts_removed"
-        case type() if event_type is DocumentationGenerationRequested:
-            return "documentation_generation_requested"
-        case type() if event_type is DocumentationGenerationStarted:
-            return "documentation_generation_started"
-        case type() if event_type is DocumentationGenerationCompleted:
-            return "documentation_generation_completed"
-        case type() if event_type is DocumentationGenerationFailed:
-            return "documentation_generation_failed"
-        case _:
-            raise Exception(f"Unknown event type: {event_type}")
-
-
-def _get_encryption_key() -> bytes | None:
-    key_str = os.environ.get("TOKEN_ENCRYPTION_KEY")
-    if not key_str:
-        return None
-    return key_str.encode()
+    record_class = RECORD_CLASSES_BY_EVENT_TYPE.get(event_type)
+    if record_class is None:
+        raise Exception(f"Unknown event type: {event_type}")
+    return record_class.model_fields["type"].default
+
+
+_fernet: Fernet | None = None
+
+
+def _get_fernet() -> Fernet | None:
+    """Built once TOKEN_ENCRYPTION_KEY is set, then kept: the key can't change."""
+    global _fernet
+    if _fernet is None:
+        key_str = os.environ.get("TOKEN_ENCRYPTION_KEY")
+        if key_str:
+            _fernet = Fernet(key_str.encode())
+    return _fernet
 
 
 def _encrypt_token(plain_token: str) -> str:
     if not plain_token:
         return plain_token
 
-    key = _get_encryption_key()
-    if not key:
+    fernet = _get_fernet()
+    if not fernet:
         return plain_token
 
-    fernet = Fernet(key)
     encrypted_bytes = fernet.encrypt(plain_token.encode())
     return encrypted_bytes.decode()
 
@@ -120,12 +91,11 @@ def _decrypt_token(token: str) -> str:
     if not token:
         return token
 
-    key = _get_encryption_key()
-    if not key:
+    fernet = _get_fernet()
+    if not fernet:
         return token
 
     try:
-        fernet = Fernet(key)
         decrypted_bytes = fernet.decrypt(token.encode())
         return decrypted_bytes.decode()
     except Exception:
@@ -415,7 +385,7 @@ class CodeRepositoryIndexedRecord(BaseModel):
     occurred_at: datetime
     branch: str
     commit_sha: str
-    stats: dict[str, Any]
+    stats: BlobReference | dict[str, Any] = Field(union_mode="left_to_right")
     knowledge_base_id: str
     process_id: str
 
@@ -427,7 +397,7 @@ class CodeRepositoryIndexedRecord(BaseModel):
             occurred_at=self.occurred_at,
             branch=self.branch,
             commit_sha=self.commit_sha,
-            stats=self.stats,
+            stats=inline_dict(self.stats),
             knowledge_base_id=self.knowledge_base_id,
             process_id=self.process_id,
         )
@@ -438,7 +408,7 @@ class CodeRepositoryIndexedRecord(BaseModel):
             occurred_at=event.occurred_at,
             branch=event.branch,
             commit_sha=event.commit_sha,
-            stats=event.stats,
+            stats=loaded(event.stats),
             knowledge_base_id=event.knowledge_base_id,
             process_id=event.process_id,
         )
@@ -682,8 +652,8 @@ class EnvironmentConfigurationValidatedRecord(BaseModel):
     snapshot_id: str
     occurred_at: datetime
     process_id: str
-    stdout: str
-    stderr: str
+    stdout: BlobReference | str = Field(union_mode="left_to_right")
+    stderr: BlobReference | str = Field(union_mode="left_to_right")
     return_code: int
 
     def safe_copy(self) -> Self:
@@ -694,8 +664,8 @@ class EnvironmentConfigurationValidatedRecord(BaseModel):
             snapshot_id=self.snapshot_id,
             occurred_at=self.occurred_at,
             process_id=self.process_id,
-            stdout=self.stdout,
-            stderr=self.stderr,
+            stdout=inline_str(self.stdout),
+            stderr=inline_str(self.stderr),
             return_code=self.return_code,
         )
 
@@ -716,8 +686,8 @@ class EnvironmentValidationFailedRecord(BaseModel):
     occurred_at: datetime
     process_id: str
     phase: Phase | None = None
-    stdout: str
-    stderr: str
+    stdout: BlobReference | str = Field(union_mode="left_to_right")
+    stderr: BlobReference | str = Field(union_mode="left_to_right")
     return_code: int
 
     def safe_copy(self) -> Self:
@@ -728,8 +698,8 @@ class EnvironmentValidationFailedRecord(BaseModel):
             occurred_at=self.occurred_at,
             process_id=self.process_id,
             phase=self.phase if self.phase is not None else Phase.PROJECT_SETUP,
-            stdout=self.stdout,
-            stderr=self.stderr,
+            stdout=inline_str(self.stdout),
+            stderr=inline_str(self.stderr),
             return_code=self.return_code,
         )
 
@@ -991,145 +961,60 @@ def obfuscate(secret: str) -> str:
     return "*" * (len(secret) - 4) + secret[-4:]
 
 
+RECORD_CLASSES_BY_EVENT_TYPE: dict[type, type[ProcessTimelineEventRecords]] = {
+    CodeRepositoryConnected: CodeRepositoryConnectedRecord,
+    CodeRepositoryTokenRotated: CodeRepositoryTokenRotatedRecord,
+    CodeRepositoryIntegrationFailed: CodeRepositoryIntegrationFailedRecord,
+    CodeRepositoryIndexed: CodeRepositoryIndexedRecord,
+    RepositoryIndexationRequested: RepositoryIndexationRequestedRecord,
+    IssueResolutionRequested: IssueResolutionRequestedRecord,
+    IssueResolutionStarted: IssueResolutionStartedRecord,
+    IssueResolutionCompleted: IssueResolutionCompletedRecord,
+    IssueResolutionFailed: IssueResolutionFailedRecord,
+    EnvironmentConfigurationProvided: EnvironmentConfigurationProvidedRecord,
+    IssueResolutionEnvironmentPrepared: IssueResolutionEnvironmentPreparedRecord,
+    EnvironmentConfigurationValidated: EnvironmentConfigurationValidatedRecord,
+    EnvironmentValidationFailed: EnvironmentValidationFailedRecord,
+    NotionIntegrationAuthorized: NotionIntegrationAuthorizedRecord,
+    NotionIntegrationTokenRefreshed: NotionIntegrationTokenRefreshedRecord,
+    NotionIntegrationAuthorizationFailed: NotionIntegrationAuthorizationFailedRecord,
+    DocumentationPromptsDefined: DocumentationPromptsDefinedRecord,
+    DocumentationPromptsRemoved: DocumentationPromptsRemovedRecord,
+    DocumentationGenerationRequested: DocumentationGenerationRequestedRecord,
+    DocumentationGenerationStarted: DocumentationGenerationStartedRecord,
+    DocumentationGenerationCompleted: DocumentationGenerationCompletedRecord,
+    DocumentationGenerationFailed: DocumentationGenerationFailedRecord,
+}
+
+RECORD_CLASSES_BY_RECORD_TYPE: dict[str, type[ProcessTimelineEventRecords]] = {
+    record_class.model_fields["type"].default: record_class
+    for record_class in RECORD_CLASSES_BY_EVENT_TYPE.values()
+}
+
+
 def serialize(event: AnyDomainEvent) -> ProcessTimelineEventRecords:
-    match event:
-        case CodeRepositoryConnected():
-            return CodeRepositoryConnectedRecord.create_from(event)
-        case CodeRepositoryTokenRotated():
-            return CodeRepositoryTokenRotatedRecord.create_from(event)
-        case CodeRepositoryIntegrationFailed():
-            return CodeRepositoryIntegrationFailedRecord.create_from(event)
-        case CodeRepositoryIndexed():
-            return CodeRepositoryIndexedRecord.create_from(event)
-        case RepositoryIndexationRequested():
-            return RepositoryIndexationRequestedRecord.create_from(event)
-        case IssueResolutionRequested():
-            return IssueResolutionRequestedRecord.create_from(event)
-        case IssueResolutionStarted():
-            return IssueResolutionStartedRecord.create_from(event)
-        case IssueResolutionCompleted():
-            return IssueResolutionCompletedRecord.create_from(event)
-        case IssueResolutionFailed():
-            return IssueResolutionFailedRecord.create_from(event)
-        case EnvironmentConfigurationProvided():
-            return EnvironmentConfigurationProvidedRecord.create_from(event)
-        case IssueResolutionEnvironmentPrepared():
-            return IssueResolutionEnvironmentPreparedRecord.create_from(event)
-        case EnvironmentConfigurationValidated():
-            return EnvironmentConfigurationValidatedRecord.create_from(event)
-        case EnvironmentValidationFailed():
-            return EnvironmentValidationFailedRecord.create_from(event)
-        case NotionIntegrationAuthorized():
-            return NotionIntegrationAuthorizedRecord.create_from(event)
-        case NotionIntegrationTokenRefreshed():
-            return NotionIntegrationTokenRefreshedRecord.create_from(event)
-        case NotionIntegrationAuthorizationFailed():
-            return NotionIntegrationAuthorizationFailedRecord.create_from(event)
-        case DocumentationPromptsDefined():
-            return DocumentationPromptsDefinedRecord.create_from(event)
-        case DocumentationPromptsRemoved():
-            return DocumentationPromptsRemovedRecord.create_from(event)
-        case DocumentationGenerationRequested():
-            return DocumentationGenerationRequestedRecord.create_from(event)
-        case DocumentationGenerationStarted():
-            return DocumentationGenerationStartedRecord.create_from(event)
-        case DocumentationGenerationCompleted():
-            return DocumentationGenerationCompletedRecord.create_from(event)
-        case DocumentationGenerationFailed():
-            return DocumentationGenerationFailedRecord.create_from(event)
-        case _:
-            assert_never(event)
+    record_class = RECORD_CLASSES_BY_EVENT_TYPE.get(type(event))
+    if record_class is None:
+        raise Exception(f"Unknown event type: {type(event)}")
+    return record_class.create_from(event)  # type: ignore[arg-type]
 
 
 def deserialize(event_type: str, data: str) -> AnyDomainEvent:
-    match event_type:
-        case "repository_connected":
-            return CodeRepositoryConnectedRecord.model_validate_json(
-                data
-            ).to_domain_event()
-        case "repository_token_rotated":
-            return CodeRepositoryTokenRotatedRecord.model_validate_json(
-                data
-            ).to_domain_event()
-        case "repository_integration_failed":
-            return CodeRepositoryIntegrationFailedRecord.model_validate_json(
-                data
-            ).to_domain_event()
-        case "repository_indexed":
-            return CodeRepositoryIndexedRecord.model_validate_json(
-                data
-            ).to_domain_event()
-        case "repository_indexation_requested":
-            return RepositoryIndexationRequestedRecord.model_validate_json(
-                data
-            ).to_domain_event()
-        case "issue_resolution_requested":
-            return IssueResolutionRequestedRecord.model_validate_json(
-                data
-            ).to_domain_event()
-        case "issue_resolution_started":
-            return IssueResolutionStartedRecord.model_validate_json(
-                data
-            ).to_domain_event()
-        case "issue_resolution_completed":
-            return IssueResolutionCompletedRecord.model_validate_json(
-                data
-            ).to_domain_event()
-        case "issue_resolution_failed":
-            return IssueResolutionFailedRecord.model_validate_json(
-                data
-            ).to_domain_event()
-        case "environment_configuration_provided":
-            return EnvironmentConfigurationProvidedRecord.model_validate_json(
-                data
-            ).to_domain_event()
-        case "issue_resolution_environment_prepared":
-            return IssueResolutionEnvironmentPreparedRecord.model_validate_json(
-                data
-            ).to_domain_event()
-        case "environment_configuration_validated":
-            return EnvironmentConfigurationValidatedRecord.model_validate_json(
-                data
-            ).to_domain_event()
-        case "environment_validation_failed":
-            return EnvironmentValidationFailedRecord.model_validate_json(
-                data
-            ).to_domain_event()
-        case "notion_integration_authorized":
-            return NotionIntegrationAuthorizedRecord.model_validate_json(
-                data
-            ).to_domain_event()
-        case "notion_integration_token_refreshed":
-            return NotionIntegrationTokenRefreshedRecord.model_validate_json(
-                data
-            ).to_domain_event()
-        case "notion_integration_authorization_failed":
-            return NotionIntegrationAuthorizationFailedRecord.model_validate_json(
-                data
-            ).to_domain_event()
-        case "documentation_prompts_defined":
-            return DocumentationPromptsDefinedRecord.model_validate_json(
-                data
-            ).to_domain_event()
-        case "documentation_prompts_removed":
-            return DocumentationPromptsRemovedRecord.model_validate_json(
-                data
-            ).to_domain_event()
-        case "documentation_generation_requested":
-            return DocumentationGenerationRequestedRecord.model_validate_json(
-                data
-            ).to_domain_event()
-        case "documentation_generation_started":
-            return DocumentationGenerationStartedRecord.model_validate_json(
-                data
-            ).to_domain_event()
-        case "documentation_generation_completed":
-            return DocumentationGenerationCompletedRecord.model_validate_json(
-                data
-            ).to_domain_event()
-        case "documentation_generation_failed":
-            return DocumentationGenerationFailedRecord.model_validate_json(
-                data
-            ).to_domain_event()
-        case _:
-            raise Exception(f"Unknown event type: {event_type}")
+    return _parse(event_type, data).to_domain_event()
+
+
+async def serialize_for_storage(event: AnyDomainEvent) -> ProcessTimelineEventRecords:
+    """Serialize an event, its large fields kept in the payload blob store."""
+    return await offload_payloads(serialize(referenced(event)), event)
+
+
+async def deserialize_from_storage(event_type: str, data: str) -> AnyDomainEvent:
+    """Deserialize a stored event, its offloaded fields read back when needed."""
+    return (await resolve_payloads(_parse(event_type, data))).to_domain_event()
+
+
+def _parse(event_type: str, data: str) -> ProcessTimelineEventRecords:
+    record_class = RECORD_CLASSES_BY_RECORD_TYPE.get(event_type)
+    if record_class is None:
+        raise Exception(f"Unknown event type: {event_type}")
+    return record_class.model_validate_json(data)
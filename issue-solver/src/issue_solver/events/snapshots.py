@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Sequence
+
+from issue_solver.events.domain import AnyDomainEvent
+
+if TYPE_CHECKING:
+    from issue_solver.events.event_store import EventStore
+
+DEFAULT_SNAPSHOT_INTERVAL = 100
+
+
+@dataclass(frozen=True, slots=True)
+class Snapshot:
+    """Most recent event of each type in a stream, up to `position`."""
+
+    process_id: str
+    position: int
+    events: list[AnyDomainEvent]
+
+
+def compact(events: Sequence[AnyDomainEvent]) -> list[AnyDomainEvent]:
+    """Keep the most recent event of each type, in stream order."""
+    latest_by_type: dict[type, AnyDomainEvent] = {}
+    for event in events:
+        latest = latest_by_type.get(type(event))
+        if latest is None or event.occurred_at >= latest.occurred_at:
+            latest_by_type.pop(type(event), None)
+            latest_by_type[type(event)] = event
+    return list(latest_by_type.values())
+
+
+def crosses_snapshot_interval(
+    previous_version: int, version: int, interval: int
+) -> bool:
+    return version // interval > previous_version // interval
+
+
+async def load_latest_events(
+    event_store: EventStore, process_id: str
+) -> list[AnyDomainEvent]:
+    """Most recent event of each type in a stream, reading only the events after its last snapshot.
+
+    Enough for `most_recent_event` lookups, not for replaying the full history.
+    """
+    events, _ = await load_latest_events_and_version(event_store, process_id)
+    return events
+
+
+async def load_latest_events_and_version(
+    event_store: EventStore, process_id: str
+) -> tuple[list[AnyDomainEvent], int]:
+    """`load_latest_events`, with the version of the stream they were read at."""
+    snapshot = await event_store.get_snapshot(process_id)
+    if snapshot is None:
+        events = await event_store.get(process_id)
+        return compact(events), len(events)
+    since = await event_store.get_since(process_id, snapshot.position)
+    return compact([*snapshot.events, *since]), snapshot.position + len(since)
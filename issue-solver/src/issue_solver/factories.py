@@ -1,32 +1,114 @@
+import os
+from urllib.parse import urlparse
+
 import asyncpg
-from redis import Redis
+from redis.asyncio import Redis
 
 from issue_solver.agents.agent_message_store import (
     AgentMessageStore,
     InMemoryAgentMessageStore,
 )
+from issue_solver.agents.buffered_agent_message_store import (
+    BufferedAgentMessageStore,
+)
 from issue_solver.cli.webhook_notifying_agent_message_store import (
     WebhookNotifyingAgentMessageStore,
 )
 from issue_solver.cli.webhook_notifying_event_store import WebhookNotifyingEventStore
+from issue_solver.database.event_archive import EventArchive
 from issue_solver.database.postgres_agent_message_store import PostgresAgentMessageStore
 from issue_solver.database.postgres_event_store import PostgresEventStore
+from issue_solver.events.caching_event_store import CachingEventStore
 from issue_solver.events.event_store import EventStore, InMemoryEventStore
+from issue_solver.queueing.outbox import OutboxRelay
 from issue_solver.queueing.sqs_events_publishing import SQSQueueingEventStore
 from issue_solver.streaming.streaming_agent_message_store import (
     StreamingAgentMessageStore,
 )
 
 
+DEFAULT_POOL_MIN_SIZE = 1
+DEFAULT_POOL_MAX_SIZE = 10
+DEFAULT_STATEMENT_CACHE_SIZE = 100
+STATEMENT_CACHE_MODES = ("auto", "enabled", "disabled")
+TRANSACTION_POOLER_PORTS = (6432, 6543)
+
+
+def is_transaction_pooler(database_url: str) -> bool:
+    """Guess from the port whether the URL points at a transaction-mode pooler.
+
+    Hosts don't tell: Supabase's pooler serves session mode on 5432, where statements
+    can be cached. Set DATABASE_STATEMENT_CACHE for poolers on other ports.
+    """
+    return urlparse(database_url).port in TRANSACTION_POOLER_PORTS
+
+
+def get_statement_cache_size(database_url: str, mode: str | None = None) -> int:
+    """Prepared statements cached per connection, from `mode` or DATABASE_STATEMENT_CACHE.
+
+    A transaction-mode pooler hands each transaction a different server connection,
+    where statements prepared by an earlier transaction do not exist, so caching is
+    only enabled automatically on direct connections.
+    """
+    mode = (mode or os.environ.get("DATABASE_STATEMENT_CACHE") or "auto").lower()
+    if mode not in STATEMENT_CACHE_MODES:
+        raise ValueError(
+            f"Invalid statement cache mode {mode!r}, expected one of {STATEMENT_CACHE_MODES}"
+        )
+    if mode == "disabled" or (mode == "auto" and is_transaction_pooler(database_url)):
+        return 0
+    return DEFAULT_STATEMENT_CACHE_SIZE
+
+
+async def create_database_pool(
+    database_url: str,
+    min_size: int = DEFAULT_POOL_MIN_SIZE,
+    max_size: int = DEFAULT_POOL_MAX_SIZE,
+    statement_cache: str | None = None,
+) -> asyncpg.Pool:
+    return await asyncpg.create_pool(
+        database_url.replace("+asyncpg", ""),
+        min_size=min_size,
+        max_size=max_size,
+        statement_cache_size=get_statement_cache_size(database_url, statement_cache),
+    )
+
+
 async def init_event_store(
     database_url: str | None = None,
     queue_url: str | None = None,
     webhook_base_url: str | None = None,
+    pool: asyncpg.Pool | None = None,
+    archive: EventArchive | None = None,
+    cache_max_entries: int | None = None,
+    cache_ttl_seconds: float | None = None,
 ) -> EventStore:
     if queue_url and webhook_base_url:
         raise ValueError("Cannot provide both queue_url and webhook_base_url")
+    if queue_url and pool is None and database_url:
+        pool = await create_database_pool(database_url)
+    if queue_url and pool:
+        return SQSQueueingEventStore(
+            with_cache(
+                PostgresEventStore(pool, outbox=True, archive=archive),
+                cache_max_entries,
+                cache_ttl_seconds,
+            ),
+            queue_url=queue_url,
+            relay=OutboxRelay(pool, queue_url),
+        )
     event_store = (
-        await persistent_event_store(database_url)
+        with_cache(
+            PostgresEventStore(pool, archive=archive),
+            cache_max_entries,
+            cache_ttl_seconds,
+        )
+        if pool
+        else with_cache(
+            await persistent_event_store(database_url, archive),
+            cache_max_entries,
+            cache_ttl_seconds,
+        )
         if database_url
         else InMemoryEventStore()
     )
@@ -41,12 +123,37 @@ async def init_event_store(
     )
 
 
-async def persistent_event_store(database_url: str) -> EventStore:
-    return PostgresEventStore(
-        connection=await asyncpg.connect(
-            database_url,
-            statement_cache_size=0,
+def with_cache(
+    event_store: EventStore,
+    max_entries: int | None = None,
+    ttl_seconds: float | None = None,
+) -> EventStore:
+    """Wrap in a read cache when EVENT_STORE_CACHE_MAX_ENTRIES (or `max_entries`) is set.
+
+    Other processes append to the same streams, so the cache requires a TTL
+    (EVENT_STORE_CACHE_TTL_SECONDS or `ttl_seconds`) bounding how long it may miss them.
+    """
+    max_entries = (
+        max_entries
+        if max_entries is not None
+        else int(os.environ.get("EVENT_STORE_CACHE_MAX_ENTRIES") or 0)
+    )
+    if max_entries <= 0:
+        return event_store
+    if ttl_seconds is None and os.environ.get("EVENT_STORE_CACHE_TTL_SECONDS"):
+        ttl_seconds = float(os.environ["EVENT_STORE_CACHE_TTL_SECONDS"])
+    if ttl_seconds is None or ttl_seconds <= 0:
+        raise ValueError(
+            "EVENT_STORE_CACHE_TTL_SECONDS must be set when the event store cache is enabled"
         )
+    return CachingEventStore(event_store, ttl_seconds, max_entries)
+
+
+async def persistent_event_store(
+    database_url: str, archive: EventArchive | None = None
+) -> EventStore:
+    return PostgresEventStore(
+        pool=await create_database_pool(database_url), archive=archive
     )
 
 
@@ -58,13 +165,13 @@ async def init_agent_message_store(
     database_url: str | None = None,
     redis_url: str | None = None,
     webhook_base_url: str | None = None,
+    pool: asyncpg.Pool | None = None,
 ) -> AgentMessageStore | None:
     agent_message_store = (
-        PostgresAgentMessageStore(
-            connection=await asyncpg.connect(
-                database_url.replace("+asyncpg", ""),
-                statement_cache_size=0,
-            )
+        BufferedAgentMessageStore(PostgresAgentMessageStore(pool))
+        if pool
+        else BufferedAgentMessageStore(
+            PostgresAgentMessageStore(pool=await create_database_pool(database_url))
         )
         if database_url
         else InMemoryAgentMessageStore()
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+from typing import Any
+
+import asyncpg
+
+from issue_solver.queueing.sqs_events_publishing import (
+    SQS_MAX_BATCH_SIZE,
+    get_sqs_client,
+)
+
+DEFAULT_IDLE_INTERVAL_SECONDS = 1.0
+DEFAULT_CLAIM_TIMEOUT_SECONDS = 60.0
+
+
+class OutboxRelay:
+    """Publishes the messages of `events_outbox` to SQS, at least once, in insertion order.
+
+    A batch is claimed in a short transaction, sent, then deleted in another one once
+    SQS accepted it: no transaction stays open during the send. Rejected messages are
+    released for the next drain, and so is a batch whose relay crashed, once its claim
+    times out after `claim_timeout_seconds`.
+    """
+
+    def __init__(
+        self,
+        pool: asyncpg.Pool,
+        queue_url: str,
+        sqs_client: Any | None = None,
+        batch_size: int = SQS_MAX_BATCH_SIZE,
+        claim_timeout_seconds: float = DEFAULT_CLAIM_TIMEOUT_SECONDS,
+        logger: logging.Logger | logging.LoggerAdapter | None = None,
+    ):
+        if not 1 <= batch_size <= SQS_MAX_BATCH_SIZE:
+            raise ValueError(f"batch_size must be between 1 and {SQS_MAX_BATCH_SIZE}")
+        self.pool = pool
+        self.queue_url = queue_url
+        self.sqs_client = sqs_client
+        self.batch_size = batch_size
+        self.claim_timeout_seconds = claim_timeout_seconds
+        self.logger = logger or logging.getLogger(__name__)
+        self.running = False
+        self._wake_up = asyncio.Event()
+
+    def wake(self) -> None:
+        self._wake_up.set()
+
+    async def relay_once(self, process_id: str | None = None) -> tuple[int, int]:
+        """Send one batch of pending messages, returning how many were claimed and sent.
+
+        With a `process_id`, only the messages of that process are claimed.
+        """
+        rows = await self._claim(process_id)
+        if not rows:
+            return 0, 0
+        sqs_client = self.sqs_client or get_sqs_client()
+        try:
+            response = await asyncio.to_thread(
+                sqs_client.send_message_batch,
+                QueueUrl=self.queue_url,
+                Entries=[
+                    {"Id": str(index), "MessageBody": row["body"]}
+                    for index, row in enumerate(rows)
+                ],
+            )
+        except Exception:
+            await self._release([row["id"] for row in rows])
+            raise
+        for failure in response.get("Failed", []):
+            self.logger.error(
+                f"Failed to publish outbox message {rows[int(failure['Id'])]['id']}: {failure.get('Message')}"
+            )
+        sent_ids = [
+            rows[int(success["Id"])]["id"] for success in response.get("Successful", [])
+        ]
+        async with self.pool.acquire() as connection, connection.transaction():
+            await connection.execute(
+                "DELETE FROM events_outbox WHERE id = ANY($1::bigint[])", sent_ids
+            )
+            await self._release_in(
+                connection, [row["id"] for row in rows if row["id"] not in sent_ids]
+            )
+        return len(rows), len(sent_ids)
+
+    async def _claim(self, process_id: str | None) -> list[asyncpg.Record]:
+        rows = await self.pool.fetch(
+            """
+            UPDATE events_outbox
+            SET claimed_until = NOW() + make_interval(secs => $2)
+            WHERE id IN (SELECT id
+                         FROM events_outbox
+                         WHERE (claimed_until IS NULL OR claimed_until < NOW())
+                           AND ($3::varchar IS NULL OR process_id = $3::varchar)
+                         ORDER BY id
+                         LIMIT $1 FOR UPDATE SKIP LOCKED)
+            RETURNING id, body
+            """,
+            self.batch_size,
+            self.claim_timeout_seconds,
+            process_id,
+        )
+        return sorted(rows, key=lambda row: row["id"])
+
+    async def _release(self, ids: list[int]) -> None:
+        async with self.pool.acquire() as connection:
+            await self._release_in(connection, ids)
+
+    @staticmethod
+    async def _release_in(connection: asyncpg.Connection, ids: list[int]) -> None:
+        if ids:
+            await connection.execute(
+                "UPDATE events_outbox SET claimed_until = NULL WHERE id = ANY($1::bigint[])",
+                ids,
+            )
+
+    async def drain(self, process_id: str | None = None) -> int:
+        """Send pending messages until the outbox is empty or a batch partly fails.
+
+        With a `process_id`, only the messages of that process are sent.
+        """
+        total_sent = 0
+        while True:
+            claimed, sent = await self.relay_once(process_id)
+            total_sent += sent
+            if claimed < self.batch_size or sent < claimed:
+                return total_sent
+
+    async def run(self, idle_interval: float = DEFAULT_IDLE_INTERVAL_SECONDS) -> None:
+        """Drain on every wake-up, and every `idle_interval` for messages of other processes."""
+        self.running = True
+        try:
+            while True:
+                self._wake_up.clear()
+                try:
+                    await self.drain()
+                except Exception as e:
+                    self.logger.error(f"Failed to relay outbox messages: {e}")
+                try:
+                    await asyncio.wait_for(self._wake_up.wait(), idle_interval)
+                except TimeoutError:
+                    pass
+        finally:
+            self.running = False
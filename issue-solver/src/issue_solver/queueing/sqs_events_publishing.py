@@ -1,15 +1,56 @@
+import asyncio
 import logging
 import os
-from typing import Any, Type
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    Collection,
+    Sequence,
+    Type,
+)
 
 import boto3
-from botocore.exceptions import ClientError
+from botocore.exceptions import BotoCoreError, ClientError
 from fastapi import HTTPException
 
+from issue_solver.events.credentials import (
+    IntegrationConnected,
+    IntegrationCredentials,
+)
 from issue_solver.events.domain import AnyDomainEvent, T
-from issue_solver.events.event_store import EventStore
+from issue_solver.events.event_store import (
+    DEFAULT_READ_ALL_BATCH_SIZE,
+    LOG_START,
+    EventStore,
+    GlobalPosition,
+    RecordedEvent,
+    StreamCursor,
+    StreamFilter,
+)
+from issue_solver.events.process_summary import ProcessSummary
+from issue_solver.events.snapshots import Snapshot
 from issue_solver.events.serializable_records import serialize
 
+if TYPE_CHECKING:
+    from issue_solver.queueing.outbox import OutboxRelay
+
+
+SQS_MAX_BATCH_SIZE = 10
+
+
+def get_sqs_client() -> Any:
+    """SQS client shared by publishers, one per region and endpoint."""
+    return _sqs_client(
+        os.environ.get("AWS_REGION", "eu-west-3"), os.environ.get("AWS_ENDPOINT_URL")
+    )
+
+
+@lru_cache
+def _sqs_client(region_name: str, endpoint_url: str | None) -> Any:
+    return boto3.client("sqs", region_name=region_name, endpoint_url=endpoint_url)
+
 
 def publish(
     event: AnyDomainEvent,
@@ -19,9 +60,7 @@ def publish(
     """Publish a CodeRepositoryConnected event to SQS."""
     try:
         logger.info(f"Publishing event for process ID: {event.process_id}")
-        sqs_client = boto3.client(
-            "sqs", region_name=os.environ.get("AWS_REGION", "eu-west-3")
-        )
+        sqs_client = get_sqs_client()
 
         queue_url = queue_url or os.environ.get("PROCESS_QUEUE_URL")
         if not queue_url:
@@ -43,18 +82,165 @@ def publish(
         )
 
 
+def publish_batch(
+    events: Sequence[AnyDomainEvent],
+    logger: logging.Logger | logging.LoggerAdapter,
+    queue_url: str,
+) -> None:
+    """Publish events to SQS, ten per request."""
+    errors = send_batch(events, queue_url)
+    if any(errors):
+        failures = {index: error for index, error in enumerate(errors) if error}
+        logger.error(f"Failed to publish events: {failures}")
+        raise HTTPException(status_code=500, detail="Failed to send message to SQS")
+
+
+def send_batch(
+    events: Sequence[AnyDomainEvent], queue_url: str, sqs_client: Any = None
+) -> list[str | None]:
+    """Send events to SQS, ten per request, and return the error of each event, if any.
+
+    A failed request fails all the events it carried; the next ones are still sent.
+    """
+    sqs_client = sqs_client or get_sqs_client()
+    errors: list[str | None] = [None] * len(events)
+    for start in range(0, len(events), SQS_MAX_BATCH_SIZE):
+        batch = events[start : start + SQS_MAX_BATCH_SIZE]
+        try:
+            response = sqs_client.send_message_batch(
+                QueueUrl=queue_url,
+                Entries=[
+                    {
+                        "Id": str(start + index),
+                        "MessageBody": serialize(event).model_dump_json(),
+                    }
+                    for index, event in enumerate(batch)
+                ],
+            )
+        except (BotoCoreError, ClientError) as e:
+            for index in range(start, start + len(batch)):
+                errors[index] = str(e)
+            continue
+        for failure in response.get("Failed", []):
+            errors[int(failure["Id"])] = failure.get("Message") or failure["Code"]
+    return errors
+
+
 class SQSQueueingEventStore(EventStore):
-    def __init__(self, event_store: EventStore, queue_url: str) -> None:
+    """Publishes appended events to SQS.
+
+    With a relay, the wrapped store writes the messages to the outbox in the append
+    transaction: the relay is woken up if it runs in the background. Otherwise only
+    the messages of the appended process are sent right away, messages left over by
+    other processes wait for a background or scheduled relay. Without a relay,
+    events are published after the append.
+    """
+
+    def __init__(
+        self,
+        event_store: EventStore,
+        queue_url: str,
+        relay: "OutboxRelay | None" = None,
+    ) -> None:
         self.queue_url = queue_url
+        self.relay = relay
         self._event_store = event_store
 
-    async def append(self, process_id: str, *events: AnyDomainEvent) -> None:
-        await self._event_store.append(process_id, *events)
-        for event in events:
-            publish(event, logging.getLogger(__name__), self.queue_url)
+    async def append(
+        self,
+        process_id: str,
+        *events: AnyDomainEvent,
+        expected_version: int | None = None,
+    ) -> None:
+        await self._event_store.append(
+            process_id, *events, expected_version=expected_version
+        )
+        if self.relay is None:
+            await asyncio.to_thread(
+                publish_batch, events, logging.getLogger(__name__), self.queue_url
+            )
+        elif self.relay.running:
+            self.relay.wake()
+        else:
+            try:
+                await self.relay.drain(process_id)
+            except Exception as e:
+                # The messages stay in the outbox for the next drain.
+                logging.getLogger(__name__).error(
+                    f"Failed to relay events of process ID {process_id}: {e}"
+                )
 
     async def get(self, process_id: str) -> list[AnyDomainEvent]:
         return await self._event_store.get(process_id)
 
+    async def get_since(self, process_id: str, position: int) -> list[AnyDomainEvent]:
+        return await self._event_store.get_since(process_id, position)
+
+    async def get_snapshot(self, process_id: str) -> Snapshot | None:
+        return await self._event_store.get_snapshot(process_id)
+
     async def find(self, criteria: dict[str, Any], event_type: Type[T]) -> list[T]:
         return await self._event_store.find(criteria, event_type)
+
+    async def latest(
+        self,
+        event_type: Type[T],
+        process_id: str | None = None,
+        criteria: dict[str, Any] | None = None,
+    ) -> T | None:
+        return await self._event_store.latest(event_type, process_id, criteria)
+
+    async def get_many(
+        self, process_ids: Collection[str]
+    ) -> dict[str, list[AnyDomainEvent]]:
+        return await self._event_store.get_many(process_ids)
+
+    async def find_streams(
+        self,
+        filters: Sequence[StreamFilter],
+        limit: int | None = None,
+        after: StreamCursor | None = None,
+        offset: int = 0,
+        status: str | None = None,
+    ) -> list[StreamCursor]:
+        return await self._event_store.find_streams(
+            filters, limit, after, offset, status
+        )
+
+    async def count_streams(
+        self, filters: Sequence[StreamFilter], status: str | None = None
+    ) -> int:
+        return await self._event_store.count_streams(filters, status)
+
+    async def get_summaries(
+        self, process_ids: Collection[str]
+    ) -> dict[str, ProcessSummary]:
+        return await self._event_store.get_summaries(process_ids)
+
+    async def get_credentials(
+        self,
+        connected_type: type[IntegrationConnected],
+        space_id: str | None = None,
+        knowledge_base_id: str | None = None,
+    ) -> IntegrationCredentials | None:
+        return await self._event_store.get_credentials(
+            connected_type, space_id, knowledge_base_id
+        )
+
+    def subscribe(
+        self,
+        stream_filter: StreamFilter | None = None,
+        process_id: str | None = None,
+        after_position: int = 0,
+    ) -> AsyncGenerator[AnyDomainEvent, None]:
+        return self._event_store.subscribe(stream_filter, process_id, after_position)
+
+    def read_all(
+        self,
+        from_checkpoint: GlobalPosition = LOG_START,
+        batch_size: int = DEFAULT_READ_ALL_BATCH_SIZE,
+    ) -> AsyncGenerator[RecordedEvent, None]:
+        return self._event_store.read_all(from_checkpoint, batch_size)
+
+    async def flush(self) -> None:
+        await self._event_store.flush()
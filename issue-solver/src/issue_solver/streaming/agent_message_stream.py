@@ -0,0 +1,178 @@
+import asyncio
+import json
+from contextlib import aclosing, suppress
+from typing import AsyncGenerator, cast
+
+from redis.asyncio import Redis
+
+from issue_solver.agents.agent_message_store import AgentMessage, AgentMessageStore
+from issue_solver.events.domain import (
+    AnyDomainEvent,
+    DocumentationGenerationCompleted,
+    DocumentationGenerationFailed,
+    IssueResolutionCompleted,
+    IssueResolutionFailed,
+)
+from issue_solver.events.event_store import EventStore
+from issue_solver.streaming.streaming_agent_message_store import get_messages_stream
+
+TERMINAL_EVENT_TYPES = (
+    IssueResolutionCompleted,
+    IssueResolutionFailed,
+    DocumentationGenerationCompleted,
+    DocumentationGenerationFailed,
+)
+REPLAY_PAGE_SIZE = 100
+POLL_INTERVAL_SECONDS = 1.0
+STREAM_START = "0-0"
+
+StreamEntry = tuple[str, dict[str, str]]
+
+
+def is_finished(events: list[AnyDomainEvent]) -> bool:
+    """Whether no agent is running, or will run, for a process anymore."""
+    return not events or isinstance(events[-1], TERMINAL_EVENT_TYPES)
+
+
+async def tail_agent_messages(
+    process_id: str,
+    agent_message_store: AgentMessageStore,
+    event_store: EventStore,
+    redis_client: Redis,
+    after: str | None = None,
+    poll_interval_seconds: float = POLL_INTERVAL_SECONDS,
+) -> AsyncGenerator[AgentMessage, None]:
+    """Messages of a process after the message `after`, live until the process ends.
+
+    Resumes from the process message stream in Redis when `after` is still in it.
+    Otherwise replays the stored messages, then reads the stream from where it was
+    before the replay; messages found in both are only yielded once. Once the
+    process reaches a terminal event, the rest of the stream is read, then the store
+    one last time from `after`.
+    """
+    seen: set[str] = set()
+    stream = get_messages_stream(process_id)
+    events = await event_store.get(process_id)
+    already_finished, position = is_finished(events), len(events)
+
+    entry_id = await find_entry_id(redis_client, stream, after) if after else None
+    if entry_id is None:
+        entry_id = await last_entry_id(redis_client, stream)
+        async for message in _replay(agent_message_store, process_id, after, seen):
+            yield message
+
+    finished = asyncio.Event()
+    watcher: asyncio.Task | None = None
+    if already_finished:
+        finished.set()
+    else:
+        watcher = asyncio.create_task(
+            _wait_for_terminal_event(event_store, process_id, position, finished)
+        )
+    try:
+        while True:
+            done = finished.is_set()
+            entries = await _read_entries(
+                redis_client,
+                stream,
+                entry_id,
+                block_ms=None if done else max(1, int(poll_interval_seconds * 1000)),
+            )
+            for entry_id, message in entries:
+                if message.id not in seen:
+                    seen.add(message.id)
+                    yield message
+            if done and not entries:
+                break
+    finally:
+        if watcher:
+            watcher.cancel()
+            with suppress(asyncio.CancelledError):
+                await watcher
+
+    # Agents flush their messages before the process ends: pick up any not streamed.
+    # A message whose publication failed is only stored, maybe before the last one
+    # streamed: replay from the resume point, skipping the messages already yielded.
+    async for message in _replay(agent_message_store, process_id, after, seen):
+        yield message
+
+
+async def find_entry_id(
+    redis_client: Redis, stream: str, message_id: str
+) -> str | None:
+    """Id of the stream entry of a message, searching from the most recent ones."""
+    end = "+"
+    while entries := cast(
+        list[StreamEntry],
+        await redis_client.xrevrange(stream, end, "-", REPLAY_PAGE_SIZE),
+    ):
+        for entry_id, fields in entries:
+            if fields["message_id"] == message_id:
+                return entry_id
+        end = f"({entries[-1][0]}"
+    return None
+
+
+async def last_entry_id(redis_client: Redis, stream: str) -> str:
+    entries = cast(list[StreamEntry], await redis_client.xrevrange(stream, "+", "-", 1))
+    return entries[0][0] if entries else STREAM_START
+
+
+def from_published(data: str | bytes) -> AgentMessage:
+    message = json.loads(data)
+    model = message["model"]
+    if isinstance(model, dict):
+        model = "-".join(filter(None, [model["ai_model"], model.get("version")]))
+    return AgentMessage(**{**message, "model": model})
+
+
+async def _read_entries(
+    redis_client: Redis, stream: str, entry_id: str, block_ms: int | None
+) -> list[tuple[str, AgentMessage]]:
+    response = cast(
+        list[tuple[str, list[StreamEntry]]] | None,
+        await redis_client.xread(
+            {stream: entry_id}, count=REPLAY_PAGE_SIZE, block=block_ms
+        ),
+    )
+    return [
+        (read_entry_id, from_published(fields["message"]))
+        for _, entries in response or []
+        for read_entry_id, fields in entries
+    ]
+
+
+async def _replay(
+    agent_message_store: AgentMessageStore,
+    process_id: str,
+    after: str | None,
+    seen: set[str],
+) -> AsyncGenerator[AgentMessage, None]:
+    while True:
+        page = await agent_message_store.get(
+            process_id, after=after, limit=REPLAY_PAGE_SIZE
+        )
+        for message in page:
+            if message.id not in seen:
+                seen.add(message.id)
+                yield message
+        if len(page) < REPLAY_PAGE_SIZE:
+            return
+        after = page[-1].id
+
+
+async def _wait_for_terminal_event(
+    event_store: EventStore,
+    process_id: str,
+    position: int,
+    finished: asyncio.Event,
+) -> None:
+    try:
+        async with aclosing(
+            event_store.subscribe(process_id=process_id, after_position=position)
+        ) as events:
+            async for event in events:
+                if isinstance(event, TERMINAL_EVENT_TYPES):
+                    return
+    finally:
+        finished.set()
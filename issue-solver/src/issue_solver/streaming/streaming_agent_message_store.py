@@ -1,19 +1,116 @@
+import asyncio
 import json
+import logging
 from dataclasses import asdict
+from typing import Sequence
 
-from issue_solver.agents.agent_message_store import AgentMessageStore, AgentMessage
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+from redis.exceptions import RedisError
+
+from issue_solver.agents.agent_message_store import (
+    AgentMessageStore,
+    AgentMessage,
+    to_agent_message,
+)
 from issue_solver.models.supported_models import VersionedAIModel
 
 
+DEFAULT_MESSAGE_STREAM_MAX_LENGTH = 1000
+DEFAULT_MESSAGE_STREAM_TTL_SECONDS = 3600
+DEFAULT_PUBLISH_TIMEOUT_SECONDS = 1.0
+
+
 def get_messages_channel(process_id):
     return f"process:{process_id}:messages"
 
 
+def get_messages_stream(process_id):
+    return f"process:{process_id}:messages:stream"
+
+
+async def publish_agent_messages(
+    redis_client: Redis,
+    process_id: str,
+    agent_messages: Sequence[AgentMessage],
+    max_length: int = DEFAULT_MESSAGE_STREAM_MAX_LENGTH,
+    ttl_seconds: int = DEFAULT_MESSAGE_STREAM_TTL_SECONDS,
+) -> None:
+    """Publish messages to live subscribers and keep them in the process message stream.
+
+    The stream keeps about the last `max_length` messages, so viewers reconnecting
+    can resume from Redis, and expires `ttl_seconds` after the process stops writing.
+    All messages go out in one pipelined round trip.
+    """
+    pipeline = redis_client.pipeline(transaction=False)
+    for agent_message in agent_messages:
+        _queue_publication(pipeline, process_id, agent_message, max_length)
+    pipeline.expire(get_messages_stream(process_id), ttl_seconds)
+    await pipeline.execute()
+
+
+async def publish_agent_message_batch(
+    redis_client: Redis,
+    messages: Sequence[tuple[str, AgentMessage]],
+    max_length: int = DEFAULT_MESSAGE_STREAM_MAX_LENGTH,
+    ttl_seconds: int = DEFAULT_MESSAGE_STREAM_TTL_SECONDS,
+) -> list[str | None]:
+    """Publish `(process_id, message)` pairs of any processes in one pipelined round trip.
+
+    Returns the error of each message, if any, in the order they were given.
+    """
+    pipeline = redis_client.pipeline(transaction=False)
+    for process_id, agent_message in messages:
+        _queue_publication(pipeline, process_id, agent_message, max_length)
+    for process_id in dict.fromkeys(process_id for process_id, _ in messages):
+        pipeline.expire(get_messages_stream(process_id), ttl_seconds)
+    results = await pipeline.execute(raise_on_error=False)
+    errors: list[str | None] = []
+    for index in range(len(messages)):
+        published, added = results[2 * index : 2 * index + 2]
+        failure = next(
+            (r for r in (published, added) if isinstance(r, Exception)), None
+        )
+        errors.append(repr(failure) if failure else None)
+    return errors
+
+
+def _queue_publication(
+    pipeline: Pipeline, process_id: str, agent_message: AgentMessage, max_length: int
+) -> None:
+    data = json.dumps(asdict(agent_message))
+    pipeline.publish(get_messages_channel(process_id), data)
+    pipeline.xadd(
+        get_messages_stream(process_id),
+        {"message_id": agent_message.id, "message": data},
+        maxlen=max_length,
+        approximate=True,
+    )
+
+
 class StreamingAgentMessageStore(AgentMessageStore):
-    def __init__(self, message_store: AgentMessageStore, redis_client) -> None:
+    """Stores messages, then publishes them to Redis for live viewers.
+
+    Publishing is best effort: when Redis fails or takes longer than
+    `publish_timeout_seconds`, the message is stored and a warning is logged.
+    """
+
+    def __init__(
+        self,
+        message_store: AgentMessageStore,
+        redis_client: Redis,
+        max_stream_length: int = DEFAULT_MESSAGE_STREAM_MAX_LENGTH,
+        stream_ttl_seconds: int = DEFAULT_MESSAGE_STREAM_TTL_SECONDS,
+        publish_timeout_seconds: float = DEFAULT_PUBLISH_TIMEOUT_SECONDS,
+        logger: logging.Logger | logging.LoggerAdapter | None = None,
+    ) -> None:
         super().__init__()
         self.redis_client = redis_client
         self.message_store = message_store
+        self.max_stream_length = max_stream_length
+        self.stream_ttl_seconds = stream_ttl_seconds
+        self.publish_timeout_seconds = publish_timeout_seconds
+        self.logger = logger or logging.getLogger(__name__)
 
     async def append(
         self, process_id: str, model: VersionedAIModel, turn: int, message, agent
@@ -21,20 +118,40 @@ class StreamingAgentMessageStore(AgentMessageStore):
         message_id = await self.message_store.append(
             process_id, model, turn, message, agent
         )
-        agent_message = AgentMessage(
-            id=message_id,
-            type=message.__class__.__name__,
-            turn=turn,
-            agent=agent,
-            model=model,
-            payload=asdict(message),
+        await self._publish(
+            process_id, [to_agent_message(message_id, model, turn, message, agent)]
         )
+        return message_id
 
-        self.redis_client.publish(
-            get_messages_channel(process_id), json.dumps(asdict(agent_message))
-        )
+    async def append_many(
+        self, process_id: str, messages: Sequence[AgentMessage]
+    ) -> None:
+        await self.message_store.append_many(process_id, messages)
+        await self._publish(process_id, messages)
 
-        return message_id
+    async def get(
+        self, process_id, after: str | None = None, limit: int | None = None
+    ) -> list[AgentMessage]:
+        return await self.message_store.get(process_id, after, limit)
+
+    async def flush(self) -> None:
+        await self.message_store.flush()
 
-    async def get(self, process_id) -> list[AgentMessage]:
-        return await self.message_store.get(process_id)
+    async def _publish(
+        self, process_id: str, agent_messages: Sequence[AgentMessage]
+    ) -> None:
+        try:
+            await asyncio.wait_for(
+                publish_agent_messages(
+                    self.redis_client,
+                    process_id,
+                    agent_messages,
+                    self.max_stream_length,
+                    self.stream_ttl_seconds,
+                ),
+                timeout=self.publish_timeout_seconds,
+            )
+        except (RedisError, TimeoutError) as e:
+            self.logger.warning(
+                f"Failed to publish {len(agent_messages)} messages of process {process_id}: {e!r}"
+            )
@@ -1,16 +1,23 @@
+import asyncio
 import logging
 import os
 
 import asyncpg
 import boto3
 from fastapi import Header
-from redis import Redis
+from redis.asyncio import Redis
 
 from issue_solver.agents.agent_message_store import (
     AgentMessageStore,
 )
+from issue_solver.database.event_archive import init_event_archive
 from issue_solver.database.init_event_store import extract_direct_database_url
-from issue_solver.factories import init_event_store
+from issue_solver.factories import (
+    DEFAULT_POOL_MAX_SIZE,
+    DEFAULT_POOL_MIN_SIZE,
+    create_database_pool,
+    init_event_store,
+)
 
 from issue_solver.streaming.streaming_agent_message_store import (
     StreamingAgentMessageStore,
@@ -18,6 +25,7 @@ from issue_solver.streaming.streaming_agent_message_store import (
 from issue_solver.clock import Clock, UTCSystemClock
 from issue_solver.database.postgres_agent_message_store import PostgresAgentMessageStore
 from issue_solver.events.event_store import EventStore
+from issue_solver.queueing.sqs_events_publishing import SQSQueueingEventStore
 from issue_solver.git_operations.git_helper import (
     DefaultGitValidationService,
     GitValidationService,
@@ -41,7 +49,7 @@ def get_agent_message_store(request: Request) -> AgentMessageStore:
 
 
 def get_redis_client(request: Request) -> Redis:
-    return request.app.state.agent_message_store.redis_client
+    return request.app.state.redis_client
 
 
 async def get_user_id_or_default(
@@ -76,21 +84,40 @@ def get_knowledge_repository() -> KnowledgeRepository:
     )
 
 
-async def init_webapi_event_store() -> EventStore:
+async def init_database_pool() -> asyncpg.Pool:
+    return await create_database_pool(
+        extract_direct_database_url(),
+        min_size=int(os.environ.get("DATABASE_POOL_MIN_SIZE", DEFAULT_POOL_MIN_SIZE)),
+        max_size=int(os.environ.get("DATABASE_POOL_MAX_SIZE", DEFAULT_POOL_MAX_SIZE)),
+    )
+
+
+async def init_webapi_event_store(pool: asyncpg.Pool | None = None) -> EventStore:
     database_url = extract_direct_database_url()
     queue_url = os.environ["PROCESS_QUEUE_URL"]
-    return await init_event_store(database_url, queue_url)
+    return await init_event_store(
+        database_url, queue_url, pool=pool, archive=init_event_archive()
+    )
 
 
-async def init_agent_message_store() -> AgentMessageStore:
-    database_url = extract_direct_database_url()
+def start_outbox_relay(event_store: EventStore) -> asyncio.Task | None:
+    """Relay the outbox in the background so appends don't wait for SQS."""
+    if not isinstance(event_store, SQSQueueingEventStore) or not event_store.relay:
+        return None
+    return asyncio.create_task(event_store.relay.run())
+
+
+def init_redis_client() -> Redis:
+    """Client on a connection pool shared by every request of the API."""
+    return Redis.from_url(os.environ["REDIS_URL"], decode_responses=True)
+
+
+async def init_agent_message_store(
+    pool: asyncpg.Pool | None = None,
+    redis_client: Redis | None = None,
+) -> AgentMessageStore:
     agent_message_store = StreamingAgentMessageStore(
-        PostgresAgentMessageStore(
-            connection=await asyncpg.connect(
-                database_url,
-                statement_cache_size=0,
-            )
-        ),
-        redis_client=Redis.from_url(os.environ["REDIS_URL"]),
+        PostgresAgentMessageStore(pool or await init_database_pool()),
+        redis_client=redis_client or init_redis_client(),
     )
     return agent_message_store
@@ -1,12 +1,16 @@
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from typing import Annotated
 
 from fastapi import Depends, FastAPI
 from issue_solver.webapi.dependencies import (
     get_logger,
+    init_database_pool,
     init_webapi_event_store,
     init_agent_message_store,
+    init_redis_client,
+    start_outbox_relay,
 )
 from issue_solver.webapi.routers import (
     processes,
@@ -25,14 +29,29 @@ async def lifespan(fastapi_app: FastAPI):
     # Get the logger directly using the dependency function
     logger = get_logger("issue_solver.webapi.lifespan")
 
-    # Initialize the event store
-    fastapi_app.state.event_store = await init_webapi_event_store()
-    fastapi_app.state.agent_message_store = await init_agent_message_store()
+    # Initialize the stores on a shared database connection pool
+    database_pool = await init_database_pool()
+    fastapi_app.state.database_pool = database_pool
+    fastapi_app.state.event_store = await init_webapi_event_store(database_pool)
+    outbox_relay_task = start_outbox_relay(fastapi_app.state.event_store)
+    redis_client = init_redis_client()
+    fastapi_app.state.redis_client = redis_client
+    fastapi_app.state.agent_message_store = await init_agent_message_store(
+        database_pool, redis_client
+    )
     logger.info("Application started, event store initialized")
     yield
     # Cleanup
+    if outbox_relay_task:
+        outbox_relay_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await outbox_relay_task
     del fastapi_app.state.event_store
     del fastapi_app.state.agent_message_store
+    del fastapi_app.state.redis_client
+    await redis_client.aclose()
+    del fastapi_app.state.database_pool
+    await database_pool.close()
     logger.info("Application shutdown, event store cleaned up")
 
 
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel, Field, ConfigDict, AliasChoices
 from pydantic.alias_generators import to_camel
@@ -83,6 +84,16 @@ class AgentMessageNotification(BaseSchema):
     agent_message: AgentMessage
 
 
+class WebhookItemStatus(BaseSchema):
+    index: int
+    status: Literal["published", "failed"]
+    error: str | None = None
+
+    @classmethod
+    def of(cls, index: int, error: str | None) -> "WebhookItemStatus":
+        return cls(index=index, status="failed" if error else "published", error=error)
+
+
 class AutoDocumentationConfigRequest(BaseSchema):
     docs_prompts: dict[str, str] = Field(
         description="Mapping between documentation identifiers and the prompts used to generate them",
@@ -12,10 +12,7 @@ from starlette.responses import StreamingResponse
 from starlette.responses import Response as StarletteResponse
 
 from issue_solver.events.event_store import EventStore
-from issue_solver.events.code_repo_integration import (
-    get_access_token,
-    get_connected_repo_event,
-)
+from issue_solver.events.code_repo_integration import get_space_repo_credentials
 from issue_solver.webapi.dependencies import get_event_store, get_logger
 
 router = APIRouter()
@@ -74,17 +71,15 @@ async def proxy_code_repo_mcp(
                 detail="Missing space_id. MCP tools require a valid space context.",
             )
 
-        code_repo_was_connected = await get_connected_repo_event(event_store, space_id)
+        repo_credentials = await get_space_repo_credentials(event_store, space_id)
 
-        if not code_repo_was_connected:
+        if not repo_credentials:
             raise HTTPException(
                 status_code=404,
                 detail="No repository connected to this space. Please connect a Code repository to enable MCP tools.",
             )
 
-        access_token = await get_access_token(
-            event_store, code_repo_was_connected.process_id
-        )
+        access_token = repo_credentials.access_token
 
         if not access_token or access_token.strip() == "":
             raise HTTPException(
@@ -93,10 +88,10 @@ async def proxy_code_repo_mcp(
             )
 
         logger.info(
-            f"Using access token for repository: {code_repo_was_connected.url} (user: {user_id}, space: {space_id})"
+            f"Using access token for repository: {repo_credentials.url} (user: {user_id}, space: {space_id})"
         )
 
-        if "github.com" in code_repo_was_connected.url.lower():
+        if "github.com" in repo_credentials.url.lower():
             result, outgoing_session_id = await proxy_github_mcp(
                 access_token, payload, incoming_session_id
             )
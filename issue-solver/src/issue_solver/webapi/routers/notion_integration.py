@@ -14,7 +14,7 @@ from urllib.parse import urlencode, urljoin, urlparse
 import httpx
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import RedirectResponse
-from redis import Redis
+from redis.asyncio import Redis
 
 from issue_solver.clock import Clock
 from issue_solver.events.domain import (
@@ -185,7 +185,7 @@ async def start_notion_mcp_oauth_flow(
         "return_path": normalized_return_path,
     }
 
-    state, authorize_url = _initiate_oauth_flow(
+    state, authorize_url = await _initiate_oauth_flow(
         authorize_endpoint=settings.authorize_endpoint,
         base_params={
             "client_id": settings.client_id,
@@ -221,7 +221,7 @@ async def handle_notion_mcp_oauth_callback(
     error: str | None = None,
 ):
     settings = _load_mcp_settings()
-    state_payload = _read_oauth_state(
+    state_payload = await _read_oauth_state(
         redis_client=redis_client,
         state_cache_prefix=MCP_OAUTH_STATE_CACHE_PREFIX,
         state=state,
@@ -562,7 +562,7 @@ def _expires_at(clock: Clock, expires_in: Any) -> datetime | None:
     return None
 
 
-def _initiate_oauth_flow(
+async def _initiate_oauth_flow(
     *,
     authorize_endpoint: str,
     base_params: dict[str, Any],
@@ -572,7 +572,7 @@ def _initiate_oauth_flow(
     state_payload: dict[str, Any],
 ) -> tuple[str, str]:
     state = secrets.token_urlsafe(32)
-    redis_client.setex(
+    await redis_client.setex(
         f"{state_cache_prefix}{state}", state_ttl_seconds, json.dumps(state_payload)
     )
     params = dict(base_params)
@@ -581,7 +581,7 @@ def _initiate_oauth_flow(
     return state, authorize_url
 
 
-def _read_oauth_state(
+async def _read_oauth_state(
     *,
     redis_client: Redis,
     state_cache_prefix: str,
@@ -592,10 +592,10 @@ def _read_oauth_state(
         raise HTTPException(status_code=400, detail=missing_detail)
 
     cache_key = f"{state_cache_prefix}{state}"
-    cached_state_raw = redis_client.get(cache_key)
+    cached_state_raw = await redis_client.get(cache_key)
     if cached_state_raw is None:
         raise HTTPException(status_code=400, detail="Unknown or expired OAuth state.")
-    redis_client.delete(cache_key)
+    await redis_client.delete(cache_key)
 
     try:
         decoded = (
@@ -1,47 +1,42 @@
+import base64
 import json
 import logging
 from dataclasses import asdict
+from contextlib import aclosing
+from datetime import datetime
 from typing import Annotated, Self, AsyncGenerator
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from redis.asyncio import Redis
 from starlette.responses import StreamingResponse
 
 from issue_solver.agents.agent_message_store import AgentMessageStore, AgentMessage
 from issue_solver.events.domain import (
     AnyDomainEvent,
     CodeRepositoryConnected,
-    CodeRepositoryTokenRotated,
-    CodeRepositoryIndexed,
-    RepositoryIndexationRequested,
     IssueResolutionRequested,
-    IssueResolutionStarted,
-    IssueResolutionCompleted,
-    IssueResolutionFailed,
-    CodeRepositoryIntegrationFailed,
-    EnvironmentConfigurationProvided,
-    EnvironmentConfigurationValidated,
-    EnvironmentValidationFailed,
-    IssueResolutionEnvironmentPrepared,
     NotionIntegrationAuthorized,
-    NotionIntegrationTokenRefreshed,
-    NotionIntegrationAuthorizationFailed,
     DocumentationPromptsDefined,
     DocumentationPromptsRemoved,
     DocumentationGenerationRequested,
-    DocumentationGenerationStarted,
-    DocumentationGenerationCompleted,
-    DocumentationGenerationFailed,
 )
-from issue_solver.events.auto_documentation import AutoDocumentationSetup
-from issue_solver.events.event_store import EventStore
+from issue_solver.events.event_store import (
+    EventStore,
+    StreamCursor,
+    StreamFilter,
+)
+from issue_solver.events.payload_offloading import load_payloads
+from issue_solver.events.process_summary import ProcessSummary
 from issue_solver.events.serializable_records import (
     ProcessTimelineEventRecords,
     serialize,
 )
+from issue_solver.streaming.agent_message_stream import tail_agent_messages
 from issue_solver.webapi.dependencies import (
     get_event_store,
     get_logger,
     get_agent_message_store,
+    get_redis_client,
 )
 
 from issue_solver.webapi.payloads import BaseSchema
@@ -57,117 +52,33 @@ class ProcessTimelineView(BaseSchema):
     run_id: str | None = None
 
     @classmethod
-    def create_from(cls, process_id: str, events: list[AnyDomainEvent]) -> Self:
+    def create_from(
+        cls,
+        process_id: str,
+        events: list[AnyDomainEvent],
+        summary: ProcessSummary | None = None,
+    ) -> Self:
         event_records = []
         for one_event in events:
             event_records.append(serialize(one_event).safe_copy())
+        if summary is None:
+            summary = ProcessSummary.from_events(process_id, events)
         return cls(
             id=process_id,
-            type=cls.infer_process_type(events),
-            status=cls.to_status(events),
+            type=summary.type,
+            status=summary.status,
             events=event_records,
-            run_id=cls.extract_run_id(events),
+            run_id=summary.run_id,
         )
 
-    @classmethod
-    def infer_process_type(cls, events: list[AnyDomainEvent]) -> str:
-        if not events:
-            raise ValueError("No events provided to infer process type.")
-        first_event = events[0]
-        if isinstance(first_event, IssueResolutionRequested):
-            return "issue_resolution"
-        if isinstance(first_event, EnvironmentConfigurationProvided):
-            return "dev_environment_setup"
-        if isinstance(first_event, NotionIntegrationAuthorized):
-            return "notion_integration"
-        if isinstance(
-            first_event, (DocumentationPromptsDefined, DocumentationPromptsRemoved)
-        ):
-            return "docs_setup"
-        if isinstance(
-            first_event,
-            (
-                DocumentationGenerationRequested,
-                DocumentationGenerationStarted,
-                DocumentationGenerationCompleted,
-                DocumentationGenerationFailed,
-            ),
-        ):
-            return "docs_generation"
-        return "code_repository_integration"
 
-    @classmethod
-    def to_status(cls, events: list[AnyDomainEvent]) -> str:
-        status_affecting_events = [
-            event
-            for event in events
-            if not isinstance(event, CodeRepositoryTokenRotated)
-            and not isinstance(event, NotionIntegrationTokenRefreshed)
-        ]
-
-        if not status_affecting_events:
-            return "unknown"
-
-        status_affecting_events.sort(key=lambda event: event.occurred_at)
-        last_event = status_affecting_events[-1]
-        match last_event:
-            case CodeRepositoryConnected() | NotionIntegrationAuthorized():
-                status = "connected"
-            case CodeRepositoryIndexed():
-                status = "indexed"
-            case RepositoryIndexationRequested():
-                status = "indexing"
-            case IssueResolutionEnvironmentPrepared():
-                status = "starting"
-            case IssueResolutionRequested():
-                status = "requested"
-            case IssueResolutionStarted():
-                status = "in_progress"
-            case IssueResolutionCompleted():
-                status = "completed"
-            case (
-                IssueResolutionFailed()
-                | CodeRepositoryIntegrationFailed()
-                | EnvironmentValidationFailed()
-                | NotionIntegrationAuthorizationFailed()
-            ):
-                status = "failed"
-            case EnvironmentConfigurationProvided():
-                status = "configuring"
-            case EnvironmentConfigurationValidated():
-                status = "ready"
-            case DocumentationPromptsDefined():
-                status = "configured"
-            case DocumentationPromptsRemoved():
-                status = (
-                    "configured" if _auto_doc_prompts_remaining(events) else "removed"
-                )
-            case DocumentationGenerationRequested():
-                status = "requested"
-            case DocumentationGenerationStarted():
-                status = "in_progress"
-            case DocumentationGenerationCompleted():
-                status = "completed"
-            case DocumentationGenerationFailed():
-                status = "failed"
-            case _:
-                status = "unknown"
-        return status
-
-    @classmethod
-    def extract_run_id(cls, events: list[AnyDomainEvent]) -> str | None:
-        for event in events:
-            if isinstance(
-                event,
-                (
-                    DocumentationGenerationRequested,
-                    DocumentationGenerationStarted,
-                    DocumentationGenerationCompleted,
-                    DocumentationGenerationFailed,
-                ),
-            ):
-                return getattr(event, "run_id", None)
-        return None
+PROCESS_TYPE_ANCHOR_EVENTS: dict[str, tuple[type[AnyDomainEvent], ...]] = {
+    "code_repository_integration": (CodeRepositoryConnected,),
+    "notion_integration": (NotionIntegrationAuthorized,),
+    "issue_resolution": (IssueResolutionRequested,),
+    "docs_setup": (DocumentationPromptsDefined, DocumentationPromptsRemoved),
+    "docs_generation": (DocumentationGenerationRequested,),
+}
 
 
 class PaginatedProcessesResponse(BaseSchema):
@@ -175,6 +86,7 @@ class PaginatedProcessesResponse(BaseSchema):
     total: int
     limit: int
     offset: int
+    next_cursor: str | None = None
 
 
 @router.get("/")
@@ -189,210 +101,123 @@ async def list_processes(
     run_id: str | None = Query(None, description="Filter by run ID"),
     limit: int = Query(50, ge=1, le=100, description="Number of processes to return"),
     offset: int = Query(0, ge=0, description="Number of processes to skip"),
+    cursor: str | None = Query(
+        None, description="Resume after the next_cursor of a previous page"
+    ),
 ) -> PaginatedProcessesResponse:
-    """List processes with filtering and pagination."""
-
-    # Determine which processes to get based on filters
-    if space_id or knowledge_base_id:
-        processes = await _get_processes_by_criteria(
-            event_store, space_id, knowledge_base_id
-        )
-    else:
-        # If filtering by type or status only, get all processes
-        processes = await _get_all_processes(event_store)
-
-    # Apply additional filters
-    filtered_processes = _apply_filters(processes, process_type, status, run_id)
+    """List processes with filtering and pagination, most recent first."""
+    after, total = _decode_cursor(cursor) if cursor else (None, None)
+    filters = await _stream_filters(
+        event_store, space_id, knowledge_base_id, process_type, run_id
+    )
 
-    # Apply pagination
-    total = len(filtered_processes)
-    paginated_processes = filtered_processes[offset : offset + limit]
+    streams = await event_store.find_streams(
+        filters, limit=limit + 1, after=after, offset=offset, status=status
+    )
+    if total is None:
+        # Counted once for the first page, then carried along by the cursor.
+        total = await event_store.count_streams(filters, status=status)
+    has_more = len(streams) > limit
+    selected = await _timeline_views(event_store, streams[:limit])
 
     return PaginatedProcessesResponse(
-        processes=paginated_processes,
+        processes=[process for _, process in selected],
         total=total,
         limit=limit,
         offset=offset,
+        next_cursor=_encode_cursor(selected[-1][0], total) if has_more else None,
     )
 
 
-async def _get_processes_by_criteria(
-    event_store: EventStore, space_id: str | None, knowledge_base_id: str | None
-) -> list[ProcessTimelineView]:
-    """Get processes based on space_id or knowledge_base_id criteria."""
-    processes = []
+async def _timeline_views(
+    event_store: EventStore, streams: list[StreamCursor]
+) -> list[tuple[StreamCursor, ProcessTimelineView]]:
+    process_ids = [stream.process_id for stream in streams]
+    events_by_process_id = await event_store.get_many(process_ids)
+    await load_payloads(
+        event for events in events_by_process_id.values() for event in events
+    )
+    summaries = await event_store.get_summaries(process_ids)
+    return [
+        (
+            stream,
+            ProcessTimelineView.create_from(
+                stream.process_id, events, summaries.get(stream.process_id)
+            ),
+        )
+        for stream in streams
+        if (events := events_by_process_id[stream.process_id])
+    ]
+
 
+async def _stream_filters(
+    event_store: EventStore,
+    space_id: str | None,
+    knowledge_base_id: str | None,
+    process_type: str | None,
+    run_id: str | None,
+) -> list[StreamFilter]:
+    """Translate the listing filters into the events that start matching processes."""
+    filters: list[StreamFilter] = []
     if space_id:
+        filters.append(StreamFilter(CodeRepositoryConnected, {"space_id": space_id}))
+        filters.append(
+            StreamFilter(NotionIntegrationAuthorized, {"space_id": space_id})
+        )
         repo_events = await event_store.find(
             criteria={"space_id": space_id}, event_type=CodeRepositoryConnected
         )
-        processes.extend(await _convert_events_to_processes(event_store, repo_events))
-
-        notion_events = await event_store.find(
-            criteria={"space_id": space_id}, event_type=NotionIntegrationAuthorized
-        )
-        processes.extend(await _convert_events_to_processes(event_store, notion_events))
-
-        kb_ids = {event.knowledge_base_id for event in repo_events}
-        processes.extend(await _get_auto_documentation_processes(event_store, kb_ids))
-        processes.extend(await _get_doc_generation_processes(event_store, kb_ids))
+        for kb_id in dict.fromkeys(event.knowledge_base_id for event in repo_events):
+            filters.extend(_knowledge_base_documentation_filters(kb_id))
 
     if knowledge_base_id:
-        repo_events = await event_store.find(
-            criteria={"knowledge_base_id": knowledge_base_id},
-            event_type=CodeRepositoryConnected,
-        )
-        processes.extend(await _convert_events_to_processes(event_store, repo_events))
-
-        issue_events = await event_store.find(
-            criteria={"knowledge_base_id": knowledge_base_id},
-            event_type=IssueResolutionRequested,
-        )
-        processes.extend(await _convert_events_to_processes(event_store, issue_events))
-
-        processes.extend(
-            await _get_auto_documentation_processes(event_store, {knowledge_base_id})
-        )
-
-        processes.extend(
-            await _get_doc_generation_processes(event_store, {knowledge_base_id})
-        )
-
-    return processes
-
-
-def _apply_filters(
-    processes: list[ProcessTimelineView],
-    process_type: str | None,
-    status: str | None,
-    run_id: str | None,
-) -> list[ProcessTimelineView]:
-    """Apply type and status filters to processes."""
-    filtered = processes
+        criteria = {"knowledge_base_id": knowledge_base_id}
+        filters.append(StreamFilter(CodeRepositoryConnected, criteria))
+        filters.append(StreamFilter(IssueResolutionRequested, criteria))
+        filters.extend(_knowledge_base_documentation_filters(knowledge_base_id))
+
+    if not space_id and not knowledge_base_id:
+        filters = [
+            StreamFilter(event_type)
+            for anchor_events in PROCESS_TYPE_ANCHOR_EVENTS.values()
+            for event_type in anchor_events
+        ]
 
     if process_type:
-        filtered = [p for p in filtered if p.type == process_type]
-
-    if status:
-        filtered = [p for p in filtered if p.status == status]
+        anchor_events = PROCESS_TYPE_ANCHOR_EVENTS.get(process_type, ())
+        filters = [f for f in filters if f.event_type in anchor_events]
 
     if run_id:
-        filtered = [p for p in filtered if p.run_id == run_id]
+        filters = [
+            StreamFilter(f.event_type, {**f.criteria, "run_id": run_id})
+            for f in filters
+            if f.event_type is DocumentationGenerationRequested
+        ]
 
-    return filtered
+    return filters
 
 
-async def _get_all_processes(event_store: EventStore) -> list[ProcessTimelineView]:
-    """Get all processes from all event types."""
-    all_processes = []
+def _knowledge_base_documentation_filters(kb_id: str) -> list[StreamFilter]:
+    criteria = {"knowledge_base_id": kb_id}
+    return [
+        StreamFilter(DocumentationPromptsDefined, criteria),
+        StreamFilter(DocumentationPromptsRemoved, criteria),
+        StreamFilter(DocumentationGenerationRequested, criteria),
+    ]
 
-    # Get all repository processes
-    repo_events = await event_store.find(
-        criteria={}, event_type=CodeRepositoryConnected
-    )
-    all_processes.extend(await _convert_events_to_processes(event_store, repo_events))
 
-    # Get all Notion integration processes
-    notion_events = await event_store.find(
-        criteria={}, event_type=NotionIntegrationAuthorized
-    )
-    all_processes.extend(await _convert_events_to_processes(event_store, notion_events))
+def _encode_cursor(stream: StreamCursor, total: int) -> str:
+    payload = json.dumps([stream.anchored_at.isoformat(), stream.process_id, total])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
 
-    # Get all issue resolution processes
-    issue_events = await event_store.find(
-        criteria={}, event_type=IssueResolutionRequested
-    )
-    all_processes.extend(await _convert_events_to_processes(event_store, issue_events))
 
-    auto_doc_defined = await event_store.find(
-        criteria={}, event_type=DocumentationPromptsDefined
-    )
-    auto_doc_removed = await event_store.find(
-        criteria={}, event_type=DocumentationPromptsRemoved
-    )
-    all_processes.extend(
-        await _convert_events_to_processes(
-            event_store, [*auto_doc_defined, *auto_doc_removed]
-        )
-    )
-
-    all_processes.extend(await _get_doc_generation_processes(event_store, None))
-
-    return all_processes
-
-
-async def _convert_events_to_processes(
-    event_store: EventStore, events: list
-) -> list[ProcessTimelineView]:
-    """Convert domain events to process timeline views."""
-    processes = []
-    seen_processes: set[str] = set()
-    for event in events:
-        if event.process_id in seen_processes:
-            continue
-        process_events = await event_store.get(event.process_id)
-        if not process_events:
-            continue
-        process_view = ProcessTimelineView.create_from(event.process_id, process_events)
-        processes.append(process_view)
-        seen_processes.add(event.process_id)
-    return processes
-
-
-def _auto_doc_prompts_remaining(events: list[AnyDomainEvent]) -> bool:
-    doc_events = [
-        event
-        for event in events
-        if isinstance(event, (DocumentationPromptsDefined, DocumentationPromptsRemoved))
-    ]
-    if not doc_events:
-        return False
-    knowledge_base_id = doc_events[0].knowledge_base_id
-    setup = AutoDocumentationSetup.from_events(knowledge_base_id, doc_events)
-    return bool(setup.docs_prompts)
-
-
-async def _get_auto_documentation_processes(
-    event_store: EventStore, knowledge_base_ids: set[str]
-) -> list[ProcessTimelineView]:
-    if not knowledge_base_ids:
-        return []
-    auto_doc_events: list[AnyDomainEvent] = []
-    for kb_id in knowledge_base_ids:
-        auto_doc_events.extend(
-            await event_store.find(
-                criteria={"knowledge_base_id": kb_id},
-                event_type=DocumentationPromptsDefined,
-            )
-        )
-        auto_doc_events.extend(
-            await event_store.find(
-                criteria={"knowledge_base_id": kb_id},
-                event_type=DocumentationPromptsRemoved,
-            )
-        )
-    return await _convert_events_to_processes(event_store, auto_doc_events)
-
-
-async def _get_doc_generation_processes(
-    event_store: EventStore, knowledge_base_ids: set[str] | None
-) -> list[ProcessTimelineView]:
-    doc_events: list[AnyDomainEvent] = []
-    if knowledge_base_ids is None:
-        doc_events = await event_store.find(
-            criteria={}, event_type=DocumentationGenerationRequested
-        )
-    elif not knowledge_base_ids:
-        return []
-    else:
-        for kb_id in knowledge_base_ids:
-            doc_events.extend(
-                await event_store.find(
-                    criteria={"knowledge_base_id": kb_id},
-                    event_type=DocumentationGenerationRequested,
-                )
-            )
-    return await _convert_events_to_processes(event_store, doc_events)
+def _decode_cursor(cursor: str) -> tuple[StreamCursor, int | None]:
+    try:
+        anchored_at, process_id, *carried = json.loads(base64.urlsafe_b64decode(cursor))
+        total = int(carried[0]) if carried else None
+        return StreamCursor(process_id, datetime.fromisoformat(anchored_at)), total
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
 
 
 @router.get(
@@ -416,6 +241,7 @@ async def get_process(
     if not process_events:
         logger.warning(f"Process ID not found: {process_id}")
         raise HTTPException(status_code=404, detail="Process not found")
+    await load_payloads(process_events)
     process_timeline_view = ProcessTimelineView.create_from(process_id, process_events)
     logger.info(f"Found process with {len(process_events)} events")
     return process_timeline_view
@@ -427,11 +253,21 @@ async def get_process(
 async def get_process_messages(
     process_id: str,
     agent_message_store: Annotated[AgentMessageStore, Depends(get_agent_message_store)],
+    after: str | None = Query(
+        None, description="Return messages after the message with this ID"
+    ),
+    limit: int | None = Query(
+        None, ge=1, le=1000, description="Number of messages to return"
+    ),
 ) -> list[AgentMessage]:
-    """Get existing messages for a specific process."""
+    """Get existing messages for a specific process, in turn order.
+
+    Page through long transcripts by passing the ID of the last message received as `after`."""
 
     historical_messages = await agent_message_store.get(
         process_id=process_id,
+        after=after,
+        limit=limit,
     )
     return historical_messages
 
@@ -442,17 +278,30 @@ async def get_process_messages(
 async def stream_process_messages(
     process_id: str,
     agent_message_store: Annotated[AgentMessageStore, Depends(get_agent_message_store)],
+    event_store: Annotated[EventStore, Depends(get_event_store)],
+    redis_client: Annotated[Redis, Depends(get_redis_client)],
+    after: str | None = Query(
+        None, description="Resume after the message with this ID"
+    ),
+    last_event_id: str | None = Header(None, alias="Last-Event-ID"),
 ) -> StreamingResponse:
     """Stream messages for a specific process.
-    This endpoint returns a stream of messages in newline-delimited JSON format."""
+    This endpoint returns a stream of messages in newline-delimited JSON format:
+    the stored messages first, then new ones as the agent produces them, until the process ends.
+    Reconnect with the ID of the last message received as `Last-Event-ID` to resume."""
 
     async def message_generator() -> AsyncGenerator[str, None]:
-        historical_messages = await agent_message_store.get(
-            process_id=process_id,
-        )
-        for one_historical_message in historical_messages:
-            yield json.dumps(asdict(one_historical_message)) + "\n"
-        # subscribe
+        async with aclosing(
+            tail_agent_messages(
+                process_id,
+                agent_message_store,
+                event_store,
+                redis_client,
+                after=last_event_id or after,
+            )
+        ) as messages:
+            async for message in messages:
+                yield json.dumps(asdict(message)) + "\n"
 
     headers = {
         "Cache-Control": "no-cache",
@@ -13,7 +13,8 @@ from issue_solver.events.domain import (
     RepositoryIndexationRequested,
     EnvironmentConfigurationProvided,
 )
-from issue_solver.events.event_store import EventStore
+from issue_solver.events.event_store import EventStore, append_with_retry
+from issue_solver.events.snapshots import load_latest_events_and_version
 from issue_solver.git_operations.git_helper import (
     GitValidationError,
     GitValidationService,
@@ -210,7 +211,23 @@ async def rotate_token(
         process_id=repository_connection.process_id,
         token_permissions=token_permissions,
     )
-    await event_store.append(repository_connection.process_id, event)
+    # A rotation requested later by a concurrent call wins over this one.
+    latest_events, version = await load_latest_events_and_version(
+        event_store, repository_connection.process_id
+    )
+    await append_with_retry(
+        event_store,
+        repository_connection.process_id,
+        lambda history: []
+        if any(
+            isinstance(rotated, CodeRepositoryTokenRotated)
+            and rotated.occurred_at > event.occurred_at
+            for rotated in history
+        )
+        else [event],
+        history=latest_events,
+        version=version,
+    )
 
     logger.info(
         f"Token rotated successfully for knowledge base ID: {knowledge_base_id}"
@@ -700,10 +717,7 @@ def _normalize_doc_path(path: str) -> tuple[str, str] | None:
 async def _latest_indexed_commit(
     event_store: EventStore, knowledge_base_id: str
 ) -> str | None:
-    indexed_events = await event_store.find(
-        {"knowledge_base_id": knowledge_base_id}, CodeRepositoryIndexed
+    latest = await event_store.latest(
+        CodeRepositoryIndexed, criteria={"knowledge_base_id": knowledge_base_id}
     )
-    if not indexed_events:
-        return None
-    latest = max(indexed_events, key=lambda e: e.occurred_at)
-    return latest.commit_sha
+    return latest.commit_sha if latest else None
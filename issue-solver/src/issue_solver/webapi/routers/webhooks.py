@@ -1,16 +1,22 @@
-import json
+import asyncio
 import logging
-from dataclasses import asdict
+import os
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
-from redis import Redis
+from fastapi import APIRouter, Depends, HTTPException
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
 
 from issue_solver.events.serializable_records import ProcessTimelineEventRecords
-from issue_solver.queueing.sqs_events_publishing import publish
-from issue_solver.streaming.streaming_agent_message_store import get_messages_channel
+from issue_solver.queueing.sqs_events_publishing import publish, send_batch
+from issue_solver.streaming.streaming_agent_message_store import (
+    DEFAULT_PUBLISH_TIMEOUT_SECONDS,
+    get_messages_channel,
+    publish_agent_message_batch,
+    publish_agent_messages,
+)
 from issue_solver.webapi.dependencies import get_redis_client, get_logger
-from issue_solver.webapi.payloads import AgentMessageNotification
+from issue_solver.webapi.payloads import AgentMessageNotification, WebhookItemStatus
 
 router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 
@@ -19,7 +25,27 @@ router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 async def notify_event_received(event: ProcessTimelineEventRecords) -> None:
     """Endpoint to receive webhook events."""
     domain_event = event.to_domain_event()
-    publish(domain_event, logger=logging.getLogger(__name__))
+    await asyncio.to_thread(publish, domain_event, logging.getLogger(__name__))
+
+
+@router.post("/events:batch", status_code=200)
+async def notify_events_received(
+    events: list[ProcessTimelineEventRecords],
+) -> list[WebhookItemStatus]:
+    """Endpoint to receive several webhook events at once, published in batches to SQS."""
+    queue_url = os.environ.get("PROCESS_QUEUE_URL")
+    if not queue_url:
+        raise HTTPException(
+            status_code=500, detail="PROCESS_QUEUE_URL environment variable not set"
+        )
+    errors = await asyncio.to_thread(
+        send_batch, [event.to_domain_event() for event in events], queue_url
+    )
+    if any(errors):
+        logging.getLogger(__name__).error(
+            f"Failed to publish {sum(map(bool, errors))} of {len(events)} events"
+        )
+    return [WebhookItemStatus.of(index, error) for index, error in enumerate(errors)]
 
 
 @router.post("/messages", status_code=200)
@@ -42,4 +68,40 @@ async def notify_message_received(
 
     messages_channel = get_messages_channel(process_id)
     logger.info(f"Publishing message to channel {messages_channel}: {agent_message}")
-    redis_client.publish(messages_channel, json.dumps(asdict(agent_message)))
+    try:
+        await asyncio.wait_for(
+            publish_agent_messages(redis_client, process_id, [agent_message]),
+            timeout=DEFAULT_PUBLISH_TIMEOUT_SECONDS,
+        )
+    except (RedisError, TimeoutError) as e:
+        logger.warning(f"Failed to publish message to {messages_channel}: {e!r}")
+
+
+@router.post("/messages:batch", status_code=200)
+async def notify_messages_received(
+    agent_message_records: list[AgentMessageNotification],
+    redis_client: Annotated[Redis, Depends(get_redis_client)],
+    logger: Annotated[
+        logging.Logger | logging.LoggerAdapter,
+        Depends(
+            lambda: get_logger(
+                "issue_solver.webapi.routers.webhooks.notify_messages_received"
+            )
+        ),
+    ],
+) -> list[WebhookItemStatus]:
+    """Endpoint to receive several webhook messages at once, in one Redis round trip."""
+
+    messages = [
+        (record.process_id, record.agent_message) for record in agent_message_records
+    ]
+    logger.info(f"Publishing {len(messages)} messages")
+    try:
+        errors = await asyncio.wait_for(
+            publish_agent_message_batch(redis_client, messages),
+            timeout=DEFAULT_PUBLISH_TIMEOUT_SECONDS,
+        )
+    except (RedisError, TimeoutError) as e:
+        logger.warning(f"Failed to publish {len(messages)} messages: {e!r}")
+        errors = [repr(e)] * len(messages)
+    return [WebhookItemStatus.of(index, error) for index, error in enumerate(errors)]
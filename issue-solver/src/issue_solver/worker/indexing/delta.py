@@ -10,6 +10,8 @@ from issue_solver.events.domain import (
     CodeRepositoryConnected,
     CodeRepositoryIntegrationFailed,
 )
+from issue_solver.events.event_store import append_with_retry
+from issue_solver.events.snapshots import load_latest_events_and_version
 from issue_solver.git_operations.git_helper import (
     GitHelper,
     GitSettings,
@@ -44,7 +46,7 @@ async def index_new_changes_codebase(
         f"Processing repository indexation for process: {process_id}, knowledge_base_id: {knowledge_base_id}"
     )
     event_store = dependencies.event_store
-    events = await event_store.get(process_id)
+    events, version = await load_latest_events_and_version(event_store, process_id)
     last_indexed_event = most_recent_event(events, CodeRepositoryIndexed)
     code_repository_connected = most_recent_event(events, CodeRepositoryConnected)
     if last_indexed_event is None or code_repository_connected is None:
@@ -111,18 +113,28 @@ async def index_new_changes_codebase(
         )
         logger.info(f"Indexing stats: {json.dumps(stats)}")
 
-        # Store the updated repository indexation event
-        await event_store.append(
+        # Store the updated repository indexation event, unless another worker
+        # recorded a newer indexation since this one started from the last one.
+        indexed = CodeRepositoryIndexed(
+            branch=code_version.branch,
+            commit_sha=code_version.commit_sha,
+            stats=stats,
+            knowledge_base_id=knowledge_base_id,
+            process_id=process_id,
+            occurred_at=get_clock().now(),
+        )
+        appended = await append_with_retry(
+            event_store,
             process_id,
-            CodeRepositoryIndexed(
-                branch=code_version.branch,
-                commit_sha=code_version.commit_sha,
-                stats=stats,
-                knowledge_base_id=knowledge_base_id,
-                process_id=process_id,
-                occurred_at=get_clock().now(),
-            ),
+            lambda history: [indexed]
+            if most_recent_event(history, CodeRepositoryIndexed) == last_indexed_event
+            else [],
+            history=events,
+            version=version,
         )
+        if not appended:
+            logger.info("Repository was indexed concurrently, skipping this delta")
+            return
         logger.info(f"Successfully reindexed repository: {url}")
 
     except GitValidationError as e:
@@ -31,9 +31,12 @@ async def find_abandoned_indexing_processes(
         {}, CodeRepositoryConnected
     )
     stale: list[CodeRepositoryConnected] = []
+    events_by_process_id = await event_store.get_many(
+        {connection.process_id for connection in connections}
+    )
 
     for connection in connections:
-        events = await event_store.get(connection.process_id)
+        events = events_by_process_id[connection.process_id]
         if not events:
             continue
 
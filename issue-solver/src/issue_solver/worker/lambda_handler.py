@@ -9,20 +9,25 @@ import os
 import sys
 from typing import Any, Dict
 
+import asyncpg
 import boto3
 from morphcloud.api import MorphCloudClient
 
 from issue_solver.agents.claude_code_agent import ClaudeCodeAgent
 from issue_solver.agents.claude_code_docs_agent import ClaudeCodeDocsAgent
+from issue_solver.database.event_archive import init_event_archive
+from issue_solver.database.events_store_partitions import ensure_monthly_partitions
 from issue_solver.database.init_event_store import extract_direct_database_url
-from issue_solver.events.domain import AnyDomainEvent
-from issue_solver.events.serializable_records import deserialize
-from issue_solver.factories import init_event_store
-from issue_solver.git_operations.git_helper import GitClient
-from issue_solver.webapi.dependencies import (
-    get_clock,
+from issue_solver.events.event_store import EventStore
+from issue_solver.events.serializable_records import deserialize_from_storage
+from issue_solver.factories import (
+    create_database_pool,
     init_agent_message_store,
+    init_event_store,
 )
+from issue_solver.git_operations.git_helper import GitClient
+from issue_solver.queueing.sqs_events_publishing import SQSQueueingEventStore
+from issue_solver.webapi.dependencies import get_clock
 from issue_solver.worker.documenting.s3_knowledge_repository import (
     S3KnowledgeRepository,
 )
@@ -65,6 +70,16 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             asyncio.run(load_dependencies_and_recover_timed_out_indexing())
             return {"statusCode": 200, "body": "Recovery check complete"}
 
+        if event.get("source") == "scheduled.events.outbox-relay":
+            logger.info("Relaying pending outbox messages")
+            sent = asyncio.run(load_event_store_and_relay_outbox())
+            return {"statusCode": 200, "body": f"Relayed {sent} outbox messages"}
+
+        if event.get("source") == "scheduled.events.partitions":
+            logger.info("Creating upcoming events store partitions")
+            partitions = asyncio.run(ensure_upcoming_events_store_partitions())
+            return {"statusCode": 200, "body": f"Ensured partitions {partitions}"}
+
         # Process each record (message) from SQS
         for record in event.get("Records", []):
             # Extract the message body
@@ -76,8 +91,11 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             # Parse the message body
             try:
                 message = json.loads(message_body)
-                event_record = deserialize(message["type"], message_body)
-                asyncio.run(load_dependencies_and_process_event_message(event_record))
+                asyncio.run(
+                    load_dependencies_and_process_event_message(
+                        message["type"], message_body
+                    )
+                )
             except json.JSONDecodeError:
                 logger.error(f"Invalid JSON in message body: {message_body}")
                 continue
@@ -90,26 +108,69 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
 
 async def load_dependencies_and_process_event_message(
-    event_record: AnyDomainEvent,
+    event_type: str, message_body: str
 ) -> None:
-    dependencies = await load_dependencies()
-    await process_event_message(
-        event_record,
-        dependencies,
-    )
+    event_record = await deserialize_from_storage(event_type, message_body)
+    pool = await create_database_pool(extract_direct_database_url())
+    try:
+        dependencies = await load_dependencies(pool)
+        await process_event_message(
+            event_record,
+            dependencies,
+        )
+    finally:
+        await pool.close()
 
 
 async def load_dependencies_and_recover_timed_out_indexing():
-    dependencies = await load_dependencies()
-    await recover_timed_out_indexing(dependencies)
+    pool = await create_database_pool(extract_direct_database_url())
+    try:
+        dependencies = await load_dependencies(pool)
+        await recover_timed_out_indexing(dependencies)
+    finally:
+        await pool.close()
+
+
+async def load_event_store_and_relay_outbox() -> int:
+    """Send the outbox messages appends left behind, whichever process they belong to."""
+    pool = await create_database_pool(extract_direct_database_url())
+    try:
+        event_store = await init_worker_event_store(pool)
+        if not isinstance(event_store, SQSQueueingEventStore) or not event_store.relay:
+            return 0
+        return await event_store.relay.drain()
+    finally:
+        await pool.close()
+
 
+async def ensure_upcoming_events_store_partitions() -> list[str]:
+    pool = await create_database_pool(extract_direct_database_url())
+    try:
+        return await ensure_monthly_partitions(pool)
+    finally:
+        await pool.close()
 
-async def load_dependencies() -> Dependencies:
-    event_store = await init_event_store(
-        database_url=extract_direct_database_url(),
+
+async def init_worker_event_store(pool: asyncpg.Pool) -> EventStore:
+    return await init_event_store(
         queue_url=os.getenv("PROCESS_QUEUE_URL"),
+        pool=pool,
+        archive=init_event_archive(),
+    )
+
+
+async def load_dependencies(pool: asyncpg.Pool) -> Dependencies:
+    """Build the worker dependencies on `pool`, which the caller closes.
+
+    Each invocation runs in its own event loop, to which asyncpg pools are bound, so
+    a pool is opened and closed per invocation rather than kept by the container.
+    """
+    event_store = await init_worker_event_store(pool)
+    # Buffered: agents append a message per turn and flush when their run ends.
+    agent_message_store = await init_agent_message_store(
+        redis_url=os.environ["REDIS_URL"],
+        pool=pool,
     )
-    agent_message_store = await init_agent_message_store()
     is_dev_environment_service_enabled = bool(
         os.environ["DEV_ENVIRONMENT_SERVICE_ENABLED"]
     )
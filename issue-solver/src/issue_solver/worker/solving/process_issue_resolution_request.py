@@ -20,7 +20,6 @@ from issue_solver.events.domain import (
     IssueResolutionStarted,
     IssueResolutionCompleted,
     EnvironmentConfigurationProvided,
-    most_recent_event,
 )
 from issue_solver.events.event_store import EventStore
 from issue_solver.git_operations.git_helper import (
@@ -272,10 +271,7 @@ async def resolve_issue(
 async def fetch_environment_configuration(
     event_store: EventStore, knowledge_base_id: str
 ) -> EnvironmentConfigurationProvided | None:
-    environments_configurations = await event_store.find(
-        {"knowledge_base_id": knowledge_base_id}, EnvironmentConfigurationProvided
+    return await event_store.latest(
+        EnvironmentConfigurationProvided,
+        criteria={"knowledge_base_id": knowledge_base_id},
     )
-    most_recent_environment_configuration = most_recent_event(
-        environments_configurations, EnvironmentConfigurationProvided
-    )
-    return most_recent_environment_configuration
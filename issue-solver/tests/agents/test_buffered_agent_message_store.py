@@ -0,0 +1,123 @@
+import asyncio
+from typing import Sequence
+
+import pytest
+from claude_agent_sdk import SystemMessage
+
+from issue_solver.agents.agent_message_store import (
+    AgentMessage,
+    InMemoryAgentMessageStore,
+)
+from issue_solver.agents.buffered_agent_message_store import (
+    BufferedAgentMessageStore,
+)
+from issue_solver.models.supported_models import (
+    SupportedAnthropicModel,
+    VersionedAIModel,
+)
+
+MODEL = VersionedAIModel(SupportedAnthropicModel.CLAUDE_SONNET_4_5)
+
+
+class CountingAgentMessageStore(InMemoryAgentMessageStore):
+    def __init__(self):
+        super().__init__()
+        self.batches: list[tuple[str, int]] = []
+
+    async def append_many(
+        self, process_id: str, messages: Sequence[AgentMessage]
+    ) -> None:
+        self.batches.append((process_id, len(messages)))
+        await super().append_many(process_id, messages)
+
+
+async def append_turns(
+    store: BufferedAgentMessageStore, process_id: str, turns: range
+) -> list[str]:
+    return [
+        await store.append(
+            process_id,
+            MODEL,
+            turn,
+            SystemMessage(subtype="turn", data={"turn": turn}),
+            "CLAUDE_CODE",
+        )
+        for turn in turns
+    ]
+
+
+@pytest.mark.asyncio
+async def test_appends_should_be_written_in_batches_in_turn_order():
+    # Given
+    inner = CountingAgentMessageStore()
+    store = BufferedAgentMessageStore(inner, max_batch_size=10)
+
+    # When
+    message_ids = await append_turns(store, "process-1", range(1, 26))
+    await store.flush()
+
+    # Then
+    assert inner.batches == [("process-1", 10), ("process-1", 10), ("process-1", 5)]
+    messages = await inner.get("process-1")
+    assert [message.id for message in messages] == message_ids
+    assert [message.turn for message in messages] == list(range(1, 26))
+    assert messages[0].payload == {"subtype": "turn", "data": {"turn": 1}}
+
+
+@pytest.mark.asyncio
+async def test_pending_messages_should_be_flushed_after_the_interval():
+    # Given
+    inner = CountingAgentMessageStore()
+    store = BufferedAgentMessageStore(inner, flush_interval_seconds=0.01)
+
+    # When
+    await append_turns(store, "process-1", range(1, 4))
+    pending_before_interval = store.pending
+    await asyncio.sleep(0.05)
+
+    # Then
+    assert pending_before_interval == 3
+    assert store.pending == 0
+    assert inner.batches == [("process-1", 3)]
+
+
+@pytest.mark.asyncio
+async def test_flush_should_keep_each_process_in_its_own_batch():
+    # Given
+    inner = CountingAgentMessageStore()
+    store = BufferedAgentMessageStore(inner)
+    await append_turns(store, "process-1", range(1, 3))
+    await append_turns(store, "process-2", range(1, 2))
+    await append_turns(store, "process-1", range(3, 4))
+
+    # When
+    messages = await store.get("process-1")
+
+    # Then
+    assert [message.turn for message in messages] == [1, 2, 3]
+    assert inner.batches == [("process-1", 2), ("process-2", 1), ("process-1", 1)]
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_should_keep_messages_pending():
+    # Given
+    inner = CountingAgentMessageStore()
+    store = BufferedAgentMessageStore(inner)
+    await append_turns(store, "process-1", range(1, 3))
+    original_append_many = inner.append_many
+    inner.append_many = failing_append_many  # type: ignore[method-assign]
+
+    # When
+    with pytest.raises(ConnectionError):
+        await store.flush()
+    inner.append_many = original_append_many  # type: ignore[method-assign]
+    await store.flush()
+
+    # Then
+    assert [message.turn for message in await inner.get("process-1")] == [1, 2]
+
+
+async def failing_append_many(
+    process_id: str, messages: Sequence[AgentMessage]
+) -> None:
+    raise ConnectionError("database unavailable")
@@ -0,0 +1,29 @@
+import gzip
+
+import pytest
+
+from issue_solver.database.event_archive import ArchivedEvent, S3EventArchive
+from tests.blobs.conftest import KNOWLEDGE_BUCKET
+
+
+@pytest.mark.asyncio
+async def test_s3_event_archive_should_read_back_written_events(
+    s3_client, create_s3_bucket
+):
+    # Given
+    archive = S3EventArchive(s3_client, KNOWLEDGE_BUCKET)
+    events = [
+        ArchivedEvent(2, "issue_resolution_started", '{"process_id": "p"}'),
+        ArchivedEvent(3, "issue_resolution_completed", '{"process_id": "p"}'),
+    ]
+
+    # When
+    await archive.write("p/events_store_2021_01-2.jsonl.gz", events)
+
+    # Then
+    assert await archive.read("p/events_store_2021_01-2.jsonl.gz") == events
+    stored = s3_client.get_object(
+        Bucket=KNOWLEDGE_BUCKET,
+        Key="events-archive/p/events_store_2021_01-2.jsonl.gz",
+    )
+    assert gzip.decompress(stored["Body"].read()).decode().count("\n") == 2
@@ -0,0 +1,38 @@
+from unittest.mock import patch
+
+from issue_solver.events.payload_offloading import S3PayloadBlobStore
+from tests.blobs.conftest import KNOWLEDGE_BUCKET
+
+
+def test_s3_payload_blob_store_should_read_back_stored_payloads(
+    s3_client, create_s3_bucket
+):
+    # Given
+    blob_store = S3PayloadBlobStore(s3_client, KNOWLEDGE_BUCKET)
+
+    # When
+    blob_store.put("sha256/abc", b'{"files": 3}')
+
+    # Then
+    assert blob_store.get("sha256/abc") == b'{"files": 3}'
+    stored = s3_client.get_object(
+        Bucket=KNOWLEDGE_BUCKET, Key="event-payloads/sha256/abc"
+    )
+    assert stored["Body"].read() == b'{"files": 3}'
+
+
+def test_s3_payload_blob_store_should_not_write_stored_payloads_again(
+    s3_client, create_s3_bucket
+):
+    # Given
+    blob_store = S3PayloadBlobStore(s3_client, KNOWLEDGE_BUCKET)
+    blob_store.put("sha256/abc", b'{"files": 3}')
+
+    # When
+    with patch.object(
+        s3_client, "put_object", side_effect=AssertionError("written again")
+    ):
+        blob_store.put("sha256/abc", b'{"files": 3}')
+
+    # Then
+    assert blob_store.get("sha256/abc") == b'{"files": 3}'
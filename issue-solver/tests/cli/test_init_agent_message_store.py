@@ -1,4 +1,4 @@
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 from claude_agent_sdk import UserMessage
@@ -118,8 +118,8 @@ async def test_webhook_notifying_agent_message_store_should_append_and_get_messa
     message = UserMessage(
         content="Hello, can you solve this issue about serialization?"
     )
-    http_client_mock = Mock()
-    http_client_mock.post.return_value.status_code = 200
+    http_client_mock = AsyncMock()
+    http_client_mock.post.return_value = Mock(status_code=200)
 
     # Mock dependencies
     agent_message_store = WebhookNotifyingAgentMessageStore(
@@ -139,6 +139,7 @@ async def test_webhook_notifying_agent_message_store_should_append_and_get_messa
         turn=1,
         agent=SupportedAgent.CLAUDE_CODE,
     )
+    await agent_message_store.flush()
 
     # Then
     retrieved_messages = await agent_message_store.get(process_id)
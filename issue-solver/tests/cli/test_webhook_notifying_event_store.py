@@ -1,4 +1,4 @@
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 from tests.examples.happy_path_persona import examples_of_all_events
@@ -17,8 +17,8 @@ from issue_solver.queueing.sqs_events_publishing import SQSQueueingEventStore
 @pytest.mark.asyncio
 async def test_webhook_notifying_eventstore(event_type: str, event: AnyDomainEvent):
     # Given
-    http_client_mock = Mock()
-    http_client_mock.post.return_value.status_code = 200
+    http_client_mock = AsyncMock()
+    http_client_mock.post.return_value = Mock(status_code=200)
     event_store = WebhookNotifyingEventStore(
         event_store=InMemoryEventStore(),
         event_webhook_url="https://api.example.umans.ai/webhooks/events",
@@ -27,6 +27,7 @@ async def test_webhook_notifying_eventstore(event_type: str, event: AnyDomainEve
 
     # When
     await event_store.append(event.process_id, event)
+    await event_store.flush()
 
     # Then
     http_client_mock.post.assert_called_once()
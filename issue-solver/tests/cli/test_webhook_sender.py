@@ -0,0 +1,116 @@
+import json
+
+import httpx
+import pytest
+
+from issue_solver.cli.webhook_sender import WebhookSender
+
+WEBHOOK_URL = "https://api.example.umans.ai/webhooks/messages"
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, *statuses: int, body: object = None):
+        self.statuses = list(statuses)
+        self.body = body
+        self.requests: list[tuple[str, object]] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append((str(request.url), json.loads(request.content)))
+        status = self.statuses.pop(0) if self.statuses else 200
+        return httpx.Response(status, json=self.body, request=request)
+
+
+def sender_over(transport: RecordingTransport) -> WebhookSender:
+    return WebhookSender(
+        WEBHOOK_URL,
+        http_client=httpx.AsyncClient(transport=transport),
+        retry_base_delay_seconds=0.001,
+    )
+
+
+@pytest.mark.asyncio
+async def test_queued_payloads_should_be_posted_in_one_batch_request():
+    # Given
+    transport = RecordingTransport()
+    sender = sender_over(transport)
+
+    # When
+    for turn in range(1, 4):
+        await sender.send({"turn": turn})
+    await sender.flush()
+
+    # Then
+    assert transport.requests == [
+        (f"{WEBHOOK_URL}:batch", [{"turn": 1}, {"turn": 2}, {"turn": 3}])
+    ]
+
+
+@pytest.mark.asyncio
+async def test_a_single_payload_should_be_posted_to_the_webhook_itself():
+    # Given
+    transport = RecordingTransport()
+    sender = sender_over(transport)
+
+    # When
+    await sender.send({"turn": 1})
+    await sender.flush()
+
+    # Then
+    assert transport.requests == [(WEBHOOK_URL, {"turn": 1})]
+
+
+@pytest.mark.asyncio
+async def test_server_errors_should_be_retried():
+    # Given
+    transport = RecordingTransport(503, 502)
+    sender = sender_over(transport)
+
+    # When
+    await sender.send({"turn": 1})
+    await sender.flush()
+
+    # Then
+    assert transport.requests == [(WEBHOOK_URL, {"turn": 1})] * 3
+
+
+@pytest.mark.asyncio
+async def test_rejected_payloads_should_be_dropped_without_retry():
+    # Given
+    transport = RecordingTransport(422)
+    sender = sender_over(transport)
+
+    # When
+    await sender.send({"turn": 1})
+    await sender.flush()
+    await sender.send({"turn": 2})
+    await sender.flush()
+
+    # Then
+    assert transport.requests == [
+        (WEBHOOK_URL, {"turn": 1}),
+        (WEBHOOK_URL, {"turn": 2}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_items_reported_as_failed_by_the_batch_endpoint_should_be_logged(
+    caplog,
+):
+    # Given
+    transport = RecordingTransport(
+        body=[
+            {"index": 0, "status": "published", "error": None},
+            {"index": 1, "status": "failed", "error": "Throttled"},
+        ]
+    )
+    sender = sender_over(transport)
+
+    # When
+    await sender.send({"turn": 1})
+    await sender.send({"turn": 2})
+    await sender.flush()
+
+    # Then
+    assert len(transport.requests) == 1
+    assert "1 payloads were not published" in caplog.text
+    assert "Throttled" in caplog.text
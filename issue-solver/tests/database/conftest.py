@@ -13,6 +13,7 @@ from testcontainers.redis import RedisContainer
 from issue_solver.agents.agent_message_store import AgentMessageStore
 from issue_solver.database.init_event_store import extract_direct_database_url
 from issue_solver.events.event_store import EventStore
+from issue_solver.events import serializable_records
 from issue_solver.factories import init_event_store
 from issue_solver.webapi.dependencies import init_agent_message_store
 from testcontainers.postgres import PostgresContainer
@@ -96,6 +97,8 @@ async def agent_message_store(
 
 
 @pytest.fixture(scope="function")
-def generated_encryption_key() -> str:
+def generated_encryption_key(monkeypatch: pytest.MonkeyPatch) -> str:
     """Generate a random encryption key for testing."""
+    # The key is kept once read: let the test set it.
+    monkeypatch.setattr(serializable_records, "_fernet", None)
     return "hp6ocOWdpR69r8lRUzci2cCSjwmqpntBojmnhaIJD_M="
@@ -1,7 +1,10 @@
 import pytest
-from claude_agent_sdk import ResultMessage
+from claude_agent_sdk import ResultMessage, SystemMessage
 
 from issue_solver.agents.agent_message_store import AgentMessageStore
+from issue_solver.agents.buffered_agent_message_store import (
+    BufferedAgentMessageStore,
+)
 from issue_solver.models.supported_models import (
     VersionedAIModel,
     SupportedAnthropicModel,
@@ -62,3 +65,65 @@ async def test_agent_message_not_found(
 
     # Then
     assert not found_messages
+
+
+@pytest.mark.asyncio
+async def test_buffered_messages_should_be_copied_in_turn_order(
+    agent_message_store: AgentMessageStore,
+):
+    # Given
+    process_id = "test-process-id"
+    buffered_message_store = BufferedAgentMessageStore(
+        agent_message_store, max_batch_size=50
+    )
+    for turn in range(1, 121):
+        await buffered_message_store.append(
+            process_id,
+            model=VersionedAIModel(SupportedAnthropicModel.CLAUDE_SONNET_4_5),
+            turn=turn,
+            message=SystemMessage(subtype="turn", data={"turn": turn}),
+            agent="CLAUDE_CODE",
+        )
+
+    # When
+    await buffered_message_store.flush()
+    found_messages = await agent_message_store.get(process_id=process_id)
+
+    # Then
+    assert [message.turn for message in found_messages] == list(range(1, 121))
+    assert found_messages[0].payload == {"subtype": "turn", "data": {"turn": 1}}
+
+
+@pytest.mark.asyncio
+async def test_messages_should_be_paged_in_a_stable_order(
+    agent_message_store: AgentMessageStore,
+):
+    # Given
+    process_id = "test-process-id"
+    buffered_message_store = BufferedAgentMessageStore(agent_message_store)
+    message_ids = [
+        await buffered_message_store.append(
+            process_id,
+            model=VersionedAIModel(SupportedAnthropicModel.CLAUDE_SONNET_4_5),
+            turn=turn,
+            message=SystemMessage(subtype="turn", data={"index": index}),
+            agent="CLAUDE_CODE",
+        )
+        for index, turn in enumerate([1, 2, 2, 2, 3])
+    ]
+    await buffered_message_store.flush()
+
+    # When
+    first_page = await agent_message_store.get(process_id, limit=2)
+    second_page = await agent_message_store.get(
+        process_id, after=first_page[-1].id, limit=2
+    )
+    last_page = await agent_message_store.get(
+        process_id, after=second_page[-1].id, limit=2
+    )
+
+    # Then
+    assert [message.id for message in first_page + second_page + last_page] == (
+        message_ids
+    )
+    assert await agent_message_store.get(process_id, after=message_ids[-1]) == []
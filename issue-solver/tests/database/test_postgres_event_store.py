@@ -1,9 +1,13 @@
+import asyncio
 import os
-from datetime import datetime
+from contextlib import aclosing
+from dataclasses import replace
+from datetime import date, datetime, timedelta
 
 import pytest
 
 from issue_solver.agents.supported_agents import SupportedAgent
+from issue_solver.database.postgres_event_store import PostgresEventStore
 from issue_solver.env_setup.dev_environments_management import (
     ExecutionEnvironmentPreference,
 )
@@ -19,10 +23,35 @@ from issue_solver.events.domain import (
     EnvironmentConfigurationProvided,
     IssueResolutionEnvironmentPrepared,
 )
-from issue_solver.events.event_store import EventStore
+from issue_solver.database.event_archive import ArchivedEvent, InMemoryEventArchive
+from issue_solver.database.events_store_partitions import (
+    cold_partitions,
+    ensure_monthly_partitions,
+)
+from issue_solver.database.postgres_checkpoint_store import PostgresCheckpointStore
+from issue_solver.events.checkpoints import catch_up
+from issue_solver.events.code_repo_integration import (
+    RepoCredentials,
+    get_repo_credentials,
+    get_space_repo_credentials,
+)
+from issue_solver.events.notion_integration import (
+    NotionCredentials,
+    get_notion_credentials,
+)
+from issue_solver.events.event_store import (
+    LOG_START,
+    ConcurrencyError,
+    EventStore,
+    GlobalPosition,
+    RecordedEvent,
+    StreamFilter,
+)
+from issue_solver.events.serializable_records import serialize
+from issue_solver.events.process_summary import ProcessSummary
 from issue_solver.issues.issue import IssueInfo
 from issue_solver.models.supported_models import SupportedOpenAIModel
-from tests.examples.happy_path_persona import examples_of_all_events
+from tests.examples.happy_path_persona import BriceDeNice, examples_of_all_events
 
 
 @pytest.mark.parametrize(
@@ -395,3 +424,889 @@ async def test_find_event_issue_resolution_environment_prepared(
 
     # Then
     assert events == [appended_event]
+
+
+@pytest.mark.asyncio
+async def test_append_should_keep_stream_order_across_successive_batches(
+    event_store: EventStore,
+):
+    # Given
+    first_batch: list[AnyDomainEvent] = [
+        IssueResolutionRequested(
+            occurred_at=datetime.fromisoformat("2021-01-01T00:00:00"),
+            knowledge_base_id="knowledge-base-id",
+            process_id="test-process-id",
+            issue=IssueInfo(description="test issue"),
+            user_id="test-user-id",
+        ),
+        IssueResolutionStarted(
+            occurred_at=datetime.fromisoformat("2021-01-01T01:00:00"),
+            process_id="test-process-id",
+        ),
+    ]
+    second_batch: list[AnyDomainEvent] = [
+        IssueResolutionFailed(
+            occurred_at=datetime.fromisoformat("2021-01-01T02:00:00"),
+            process_id="test-process-id",
+            reason="test reason",
+            error_message="test error message",
+        ),
+    ]
+    await event_store.append("test-process-id", *first_batch)
+
+    # When
+    await event_store.append("test-process-id", *second_batch)
+    await event_store.append("test-process-id")
+
+    # Then
+    retrieved_events = await event_store.get("test-process-id")
+    assert retrieved_events == [*first_batch, *second_batch]
+
+
+@pytest.mark.asyncio
+async def test_append_should_accept_expected_version_matching_the_stream(
+    event_store: EventStore,
+):
+    # Given
+    requested = IssueResolutionRequested(
+        occurred_at=datetime.fromisoformat("2021-01-01T00:00:00"),
+        knowledge_base_id="knowledge-base-id",
+        process_id="test-process-id",
+        issue=IssueInfo(description="test issue"),
+        user_id="test-user-id",
+    )
+    started = IssueResolutionStarted(
+        occurred_at=datetime.fromisoformat("2021-01-01T01:00:00"),
+        process_id="test-process-id",
+    )
+    await event_store.append("test-process-id", requested, expected_version=0)
+
+    # When
+    await event_store.append("test-process-id", started, expected_version=1)
+
+    # Then
+    assert await event_store.get("test-process-id") == [requested, started]
+
+
+@pytest.mark.asyncio
+async def test_append_should_raise_concurrency_error_when_expected_version_is_stale(
+    event_store: EventStore,
+):
+    # Given
+    requested = IssueResolutionRequested(
+        occurred_at=datetime.fromisoformat("2021-01-01T00:00:00"),
+        knowledge_base_id="knowledge-base-id",
+        process_id="test-process-id",
+        issue=IssueInfo(description="test issue"),
+        user_id="test-user-id",
+    )
+    started = IssueResolutionStarted(
+        occurred_at=datetime.fromisoformat("2021-01-01T01:00:00"),
+        process_id="test-process-id",
+    )
+    await event_store.append("test-process-id", requested)
+
+    # When
+    with pytest.raises(ConcurrencyError) as error:
+        await event_store.append("test-process-id", started, expected_version=0)
+
+    # Then
+    assert error.value.actual_version == 1
+    assert await event_store.get("test-process-id") == [requested]
+
+
+@pytest.mark.asyncio
+async def test_event_store_should_serve_concurrent_operations(
+    event_store: EventStore,
+):
+    # Given
+    process_ids = [f"test-process-id-{i}" for i in range(5)]
+    events = [
+        IssueResolutionStarted(
+            occurred_at=datetime.fromisoformat("2021-01-01T01:00:00"),
+            process_id=process_id,
+        )
+        for process_id in process_ids
+    ]
+
+    # When
+    await asyncio.gather(
+        *(event_store.append(event.process_id, event) for event in events)
+    )
+    retrieved_streams = await asyncio.gather(
+        *(event_store.get(process_id) for process_id in process_ids)
+    )
+
+    # Then
+    assert retrieved_streams == [[event] for event in events]
+
+
+@pytest.mark.asyncio
+async def test_find_should_reject_criteria_keys_that_are_not_identifiers(
+    event_store: EventStore,
+):
+    # When / Then
+    with pytest.raises(ValueError):
+        await event_store.find(
+            criteria={"space_id' OR '1'='1": "test-space-id"},
+            event_type=CodeRepositoryConnected,
+        )
+
+
+@pytest.mark.asyncio
+async def test_get_many_should_return_each_requested_stream_in_order(
+    event_store: EventStore,
+):
+    # Given
+    first_stream: list[AnyDomainEvent] = [
+        IssueResolutionRequested(
+            occurred_at=datetime.fromisoformat("2021-01-01T00:00:00"),
+            knowledge_base_id="knowledge-base-id",
+            process_id="first-process-id",
+            issue=IssueInfo(description="test issue"),
+            user_id="test-user-id",
+        ),
+        IssueResolutionStarted(
+            occurred_at=datetime.fromisoformat("2021-01-01T01:00:00"),
+            process_id="first-process-id",
+        ),
+    ]
+    second_stream: list[AnyDomainEvent] = [
+        IssueResolutionStarted(
+            occurred_at=datetime.fromisoformat("2021-01-02T01:00:00"),
+            process_id="second-process-id",
+        ),
+    ]
+    await event_store.append("first-process-id", *first_stream)
+    await event_store.append("second-process-id", *second_stream)
+
+    # When
+    streams = await event_store.get_many(
+        ["second-process-id", "first-process-id", "unknown-process-id"]
+    )
+
+    # Then
+    assert streams == {
+        "first-process-id": first_stream,
+        "second-process-id": second_stream,
+        "unknown-process-id": [],
+    }
+
+
+@pytest.mark.asyncio
+async def test_find_streams_should_page_matching_streams_most_recent_first(
+    event_store: EventStore,
+):
+    # Given
+    for day in range(1, 6):
+        process_id = f"process-{day}"
+        await event_store.append(
+            process_id,
+            IssueResolutionRequested(
+                occurred_at=datetime.fromisoformat(f"2021-01-0{day}T00:00:00"),
+                knowledge_base_id="other-kb" if day == 3 else "knowledge-base-id",
+                process_id=process_id,
+                issue=IssueInfo(description="test issue"),
+                user_id="test-user-id",
+            ),
+            IssueResolutionStarted(
+                occurred_at=datetime.fromisoformat(f"2021-01-0{day}T01:00:00"),
+                process_id=process_id,
+            ),
+        )
+    filters = [
+        StreamFilter(
+            IssueResolutionRequested, {"knowledge_base_id": "knowledge-base-id"}
+        )
+    ]
+
+    # When
+    first_page = await event_store.find_streams(filters, limit=2)
+    second_page = await event_store.find_streams(filters, limit=2, after=first_page[-1])
+    third_page = await event_store.find_streams(filters, limit=2, after=second_page[-1])
+
+    # Then
+    assert [s.process_id for s in first_page] == ["process-5", "process-4"]
+    assert [s.process_id for s in second_page] == ["process-2", "process-1"]
+    assert third_page == []
+    assert await event_store.count_streams(filters) == 4
+
+
+@pytest.mark.asyncio
+async def test_append_should_keep_process_summary_up_to_date(
+    event_store: EventStore,
+):
+    # Given
+    await event_store.append(
+        "process-id",
+        IssueResolutionRequested(
+            occurred_at=datetime.fromisoformat("2021-01-01T00:00:00+00:00"),
+            knowledge_base_id="knowledge-base-id",
+            process_id="process-id",
+            issue=IssueInfo(description="test issue"),
+            user_id="test-user-id",
+        ),
+    )
+
+    # When
+    await event_store.append(
+        "process-id",
+        IssueResolutionStarted(
+            occurred_at=datetime.fromisoformat("2021-01-01T01:00:00+00:00"),
+            process_id="process-id",
+        ),
+    )
+
+    # Then
+    summaries = await event_store.get_summaries(["process-id", "unknown-id"])
+    assert summaries == {
+        "process-id": ProcessSummary(
+            process_id="process-id",
+            type="issue_resolution",
+            status="in_progress",
+            run_id=None,
+            space_id=None,
+            knowledge_base_id="knowledge-base-id",
+            created_at=datetime.fromisoformat("2021-01-01T00:00:00+00:00"),
+            updated_at=datetime.fromisoformat("2021-01-01T01:00:00+00:00"),
+            event_count=2,
+            status_at=datetime.fromisoformat("2021-01-01T01:00:00+00:00"),
+        )
+    }
+
+
+@pytest.mark.asyncio
+async def test_find_streams_should_filter_by_summary_status(
+    event_store: EventStore,
+):
+    # Given
+    for process_id, started in [("started-id", True), ("requested-id", False)]:
+        await event_store.append(
+            process_id,
+            IssueResolutionRequested(
+                occurred_at=datetime.fromisoformat("2021-01-01T00:00:00"),
+                knowledge_base_id="knowledge-base-id",
+                process_id=process_id,
+                issue=IssueInfo(description="test issue"),
+                user_id="test-user-id",
+            ),
+        )
+        if started:
+            await event_store.append(
+                process_id,
+                IssueResolutionStarted(
+                    occurred_at=datetime.fromisoformat("2021-01-01T01:00:00"),
+                    process_id=process_id,
+                ),
+            )
+
+    # When
+    filters = [StreamFilter(IssueResolutionRequested)]
+    page = await event_store.find_streams(filters, status="in_progress")
+
+    # Then
+    assert [s.process_id for s in page] == ["started-id"]
+    assert await event_store.count_streams(filters, status="in_progress") == 1
+
+
+@pytest.mark.asyncio
+async def test_rebuild_summaries_should_restore_every_process_summary(
+    event_store: PostgresEventStore,
+):
+    # Given
+    for i in range(3):
+        await event_store.append(
+            f"process-{i}",
+            IssueResolutionRequested(
+                occurred_at=datetime.fromisoformat("2021-01-01T00:00:00"),
+                knowledge_base_id="knowledge-base-id",
+                process_id=f"process-{i}",
+                issue=IssueInfo(description="test issue"),
+                user_id="test-user-id",
+            ),
+        )
+    expected = await event_store.get_summaries([f"process-{i}" for i in range(3)])
+    await event_store.pool.execute("DELETE FROM process_summaries")
+
+    # When
+    rebuilt = await event_store.rebuild_summaries(batch_size=2)
+
+    # Then
+    assert rebuilt == 3
+    assert await event_store.get_summaries(list(expected)) == expected
+
+
+@pytest.mark.asyncio
+async def test_append_should_snapshot_latest_events_every_interval(
+    event_store: PostgresEventStore,
+):
+    # Given
+    snapshotting_store = PostgresEventStore(event_store.pool, snapshot_interval=3)
+    started = [
+        IssueResolutionStarted(
+            occurred_at=datetime.fromisoformat(f"2021-01-01T0{hour}:00:00"),
+            process_id="process-id",
+        )
+        for hour in range(1, 6)
+    ]
+    await snapshotting_store.append(
+        "process-id",
+        IssueResolutionRequested(
+            occurred_at=datetime.fromisoformat("2021-01-01T00:00:00"),
+            knowledge_base_id="knowledge-base-id",
+            process_id="process-id",
+            issue=IssueInfo(description="test issue"),
+            user_id="test-user-id",
+        ),
+    )
+
+    # When
+    for event in started:
+        await snapshotting_store.append("process-id", event)
+
+    # Then
+    snapshot = await snapshotting_store.get_snapshot("process-id")
+    assert snapshot is not None
+    assert snapshot.position == 6
+    assert [type(e) for e in snapshot.events] == [
+        IssueResolutionRequested,
+        IssueResolutionStarted,
+    ]
+    assert snapshot.events[-1] == started[-1]
+    assert await snapshotting_store.get_since("process-id", 4) == started[-2:]
+
+
+@pytest.mark.asyncio
+async def test_latest_should_return_most_recent_event_of_type(
+    event_store: EventStore,
+):
+    # Given
+    for process_id, day in [("process-1", 2), ("process-2", 3), ("process-3", 1)]:
+        await event_store.append(
+            process_id,
+            CodeRepositoryIndexed(
+                branch="main",
+                commit_sha=f"sha-{process_id}",
+                stats={"files": 1},
+                knowledge_base_id="knowledge-base-id",
+                process_id=process_id,
+                occurred_at=datetime.fromisoformat(f"2021-01-0{day}T00:00:00"),
+            ),
+        )
+
+    # When
+    across_streams = await event_store.latest(
+        CodeRepositoryIndexed, criteria={"knowledge_base_id": "knowledge-base-id"}
+    )
+    in_stream = await event_store.latest(CodeRepositoryIndexed, process_id="process-3")
+    missing = await event_store.latest(CodeRepositoryConnected, process_id="process-3")
+
+    # Then
+    assert across_streams is not None
+    assert across_streams.commit_sha == "sha-process-2"
+    assert in_stream is not None
+    assert in_stream.commit_sha == "sha-process-3"
+    assert missing is None
+
+
+@pytest.mark.asyncio
+async def test_subscribe_should_push_events_appended_to_the_stream(
+    event_store: EventStore,
+):
+    # Given
+    requested, indexed = indexation_events("process-1")
+    await event_store.append("process-1", requested)
+
+    # When
+    async with aclosing(event_store.subscribe(process_id="process-1")) as events:
+        replayed = await anext(events)
+        pending = asyncio.ensure_future(anext(events))
+        await event_store.append("process-2", *indexation_events("process-2"))
+        await event_store.append("process-1", indexed)
+        pushed = await asyncio.wait_for(pending, timeout=2)
+
+    # Then
+    assert replayed == requested
+    assert pushed == indexed
+
+
+@pytest.mark.asyncio
+async def test_subscribe_should_catch_up_on_appends_missed_while_disconnected(
+    event_store: PostgresEventStore,
+):
+    # Given
+    requested, indexed = indexation_events("process-1")
+    async with aclosing(
+        event_store.subscribe(StreamFilter(CodeRepositoryIndexed), "process-1")
+    ) as events:
+        pending = asyncio.ensure_future(anext(events))
+        await asyncio.sleep(0.1)
+
+        # When
+        await event_store.pool.execute(
+            """
+            SELECT pg_terminate_backend(pid)
+            FROM pg_stat_activity
+            WHERE query LIKE 'LISTEN%'
+            """
+        )
+        await event_store.append("process-1", requested, indexed)
+        pushed = await asyncio.wait_for(pending, timeout=2)
+
+    # Then
+    assert pushed == indexed
+
+
+@pytest.mark.asyncio
+async def test_subscribe_should_catch_up_on_streams_first_appended_while_disconnected(
+    event_store: PostgresEventStore,
+):
+    # Given
+    requested, indexed = indexation_events("process-1")
+    await event_store.append("process-1", requested)
+    async with aclosing(
+        event_store.subscribe(StreamFilter(CodeRepositoryIndexed))
+    ) as events:
+        pending = asyncio.ensure_future(anext(events))
+        await asyncio.sleep(0.1)
+
+        # When
+        await event_store.pool.execute(
+            """
+            SELECT pg_terminate_backend(pid)
+            FROM pg_stat_activity
+            WHERE query LIKE 'LISTEN%'
+            """
+        )
+        await event_store.append("process-2", *indexation_events("process-2"))
+        await event_store.append("process-1", indexed)
+        first = await asyncio.wait_for(pending, timeout=2)
+        second = await asyncio.wait_for(anext(events), timeout=2)
+
+    # Then
+    assert [first.process_id, second.process_id] == ["process-2", "process-1"]
+
+
+def indexation_events(
+    process_id: str,
+) -> tuple[RepositoryIndexationRequested, CodeRepositoryIndexed]:
+    return (
+        RepositoryIndexationRequested(
+            knowledge_base_id="knowledge-base-id",
+            user_id="test-user-id",
+            process_id=process_id,
+            occurred_at=datetime.fromisoformat("2021-01-01T00:00:00"),
+        ),
+        CodeRepositoryIndexed(
+            branch="main",
+            commit_sha="sha",
+            stats={"files": 1},
+            knowledge_base_id="knowledge-base-id",
+            process_id=process_id,
+            occurred_at=datetime.fromisoformat("2021-01-01T01:00:00"),
+        ),
+    )
+
+
+async def read_all(
+    event_store: EventStore, from_checkpoint: GlobalPosition = LOG_START
+) -> list:
+    async with aclosing(event_store.read_all(from_checkpoint, batch_size=2)) as events:
+        return [recorded async for recorded in events]
+
+
+@pytest.mark.asyncio
+async def test_read_all_should_return_events_of_all_streams_in_recorded_order(
+    event_store: EventStore,
+):
+    # Given
+    requested_1, indexed_1 = indexation_events("process-1")
+    requested_2, indexed_2 = indexation_events("process-2")
+    await event_store.append("process-1", requested_1)
+    await event_store.append("process-2", requested_2, indexed_2)
+    await event_store.append("process-1", indexed_1)
+
+    # When
+    recorded = await read_all(event_store)
+    recorded_after_checkpoint = await read_all(event_store, recorded[1].global_position)
+
+    # Then
+    assert [(r.process_id, r.event) for r in recorded] == [
+        ("process-1", requested_1),
+        ("process-2", requested_2),
+        ("process-2", indexed_2),
+        ("process-1", indexed_1),
+    ]
+    assert [r.global_position for r in recorded] == sorted(
+        r.global_position for r in recorded
+    )
+    assert recorded_after_checkpoint == recorded[2:]
+
+
+@pytest.mark.asyncio
+async def test_read_all_should_wait_for_transactions_holding_lower_positions(
+    event_store: PostgresEventStore,
+):
+    # Given
+    requested, indexed = indexation_events("process-1")
+    async with event_store.pool.acquire() as connection:
+        slow_append = connection.transaction()
+        await slow_append.start()
+        await connection.execute(
+            """
+            INSERT INTO events_store (event_id, activity_id, position, event_type, data, metadata, occured_at)
+            VALUES ('slow-event', 'process-1', 1, $1, $2::jsonb, '{}'::jsonb, $3)
+            """,
+            serialize(requested).type,
+            serialize(requested).model_dump_json(),
+            requested.occurred_at,
+        )
+        await event_store.append("process-2", *indexation_events("process-2"))
+
+        # When
+        while_in_flight = await read_all(event_store)
+        await slow_append.commit()
+        once_committed = await read_all(event_store)
+
+    # Then
+    assert while_in_flight == []
+    assert [r.process_id for r in once_committed] == [
+        "process-1",
+        "process-2",
+        "process-2",
+    ]
+
+
+async def insert_in_flight(
+    connection, event_id: str, process_id: str, event: AnyDomainEvent
+) -> None:
+    await connection.execute(
+        """
+        INSERT INTO events_store (event_id, activity_id, position, event_type, data, metadata, occured_at)
+        VALUES ($1, $2, 1, $3, $4::jsonb, '{}'::jsonb, $5)
+        """,
+        event_id,
+        process_id,
+        serialize(event).type,
+        serialize(event).model_dump_json(),
+        event.occurred_at,
+    )
+
+
+@pytest.mark.asyncio
+async def test_read_all_should_not_skip_lower_positions_committed_later(
+    event_store: PostgresEventStore,
+):
+    # Given
+    requested_1, _ = indexation_events("process-1")
+    requested_2, _ = indexation_events("process-2")
+    async with (
+        event_store.pool.acquire() as older_transaction,
+        event_store.pool.acquire() as newer_transaction,
+    ):
+        older, newer = older_transaction.transaction(), newer_transaction.transaction()
+        await older.start()
+        await older_transaction.execute("SELECT pg_current_xact_id()")
+        await newer.start()
+        await newer_transaction.execute("SELECT pg_current_xact_id()")
+        await insert_in_flight(
+            newer_transaction, "newer-event", "process-1", requested_1
+        )
+        await insert_in_flight(
+            older_transaction, "older-event", "process-2", requested_2
+        )
+        await older.commit()
+        first_read = await read_all(event_store)
+
+        # When
+        await newer.commit()
+        second_read = await read_all(event_store, first_read[-1].global_position)
+
+    # Then
+    assert [r.process_id for r in first_read] == ["process-2"]
+    assert [r.process_id for r in second_read] == ["process-1"]
+    assert (
+        second_read[0].global_position.position < first_read[0].global_position.position
+    )
+
+
+@pytest.mark.asyncio
+async def test_catch_up_should_resume_from_the_subscriber_checkpoint(
+    event_store: PostgresEventStore,
+):
+    # Given
+    checkpoints = PostgresCheckpointStore(event_store.pool)
+    handled = []
+
+    async def handle(recorded_event: RecordedEvent) -> None:
+        handled.append(recorded_event.event)
+
+    await event_store.append("process-1", *indexation_events("process-1"))
+    await catch_up(event_store, checkpoints, "read-model", handle, batch_size=1)
+    await event_store.append("process-2", *indexation_events("process-2"))
+
+    # When
+    caught_up = await catch_up(event_store, checkpoints, "read-model", handle)
+
+    # Then
+    assert caught_up == 2
+    assert handled == [*indexation_events("process-1"), *indexation_events("process-2")]
+    assert (
+        await checkpoints.get("read-model")
+        == (await read_all(event_store))[-1].global_position
+    )
+    assert await checkpoints.get("another-read-model") == LOG_START
+
+
+def issue_resolution_events(process_id: str, finished: bool) -> list[AnyDomainEvent]:
+    events: list[AnyDomainEvent] = [
+        IssueResolutionRequested(
+            occurred_at=datetime.fromisoformat("2021-01-01T00:00:00"),
+            knowledge_base_id="knowledge-base-id",
+            process_id=process_id,
+            issue=IssueInfo(description="test issue"),
+            user_id="test-user-id",
+        ),
+        IssueResolutionStarted(
+            occurred_at=datetime.fromisoformat("2021-01-01T01:00:00"),
+            process_id=process_id,
+        ),
+    ]
+    if finished:
+        events.append(
+            IssueResolutionCompleted(
+                occurred_at=datetime.fromisoformat("2021-01-01T02:00:00"),
+                process_id=process_id,
+                pr_number=123,
+                pr_url="https://github.com/test/repo/pull/123",
+            )
+        )
+    return events
+
+
+async def partitions_of(event_store: PostgresEventStore, process_id: str) -> list[str]:
+    rows = await event_store.pool.fetch(
+        """
+        SELECT tableoid::regclass::text AS partition_name
+        FROM events_store
+        WHERE activity_id = $1
+        ORDER BY position
+        """,
+        process_id,
+    )
+    return [row["partition_name"] for row in rows]
+
+
+@pytest.mark.asyncio
+async def test_ensure_monthly_partitions_should_move_events_out_of_the_default_partition(
+    event_store: PostgresEventStore,
+):
+    # Given
+    events = issue_resolution_events("process-1", finished=True)
+    await event_store.append("process-1", *events)
+    in_default_partition = await partitions_of(event_store, "process-1")
+
+    # When
+    created = await ensure_monthly_partitions(
+        event_store.pool, months_ahead=1, today=date(2021, 1, 15)
+    )
+
+    # Then
+    assert created == ["events_store_2021_01", "events_store_2021_02"]
+    assert in_default_partition == ["events_store_default"] * 3
+    assert await partitions_of(event_store, "process-1") == ["events_store_2021_01"] * 3
+    assert await event_store.get("process-1") == events
+    assert await cold_partitions(event_store.pool, before=date(2021, 2, 1)) == [
+        "events_store_2021_01"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_archive_partition_should_read_archived_events_through(
+    event_store: PostgresEventStore,
+):
+    # Given
+    await ensure_monthly_partitions(
+        event_store.pool, months_ahead=0, today=date(2021, 1, 1)
+    )
+    archiving_store = PostgresEventStore(
+        event_store.pool, archive=InMemoryEventArchive()
+    )
+    finished = issue_resolution_events("finished-process", finished=True)
+    running = issue_resolution_events("running-process", finished=False)
+    await archiving_store.append("finished-process", *finished)
+    await archiving_store.append("running-process", *running)
+
+    # When
+    archived = await archiving_store.archive_partition("events_store_2021_01")
+
+    # Then
+    assert archived == 2
+    assert await partitions_of(archiving_store, "finished-process") == [
+        "events_store_2021_01"
+    ]
+    assert len(await partitions_of(archiving_store, "running-process")) == 2
+    assert await archiving_store.get("finished-process") == finished
+    assert await archiving_store.get_since("finished-process", 2) == finished[2:]
+    assert await archiving_store.get_many(["finished-process", "running-process"]) == {
+        "finished-process": finished,
+        "running-process": running,
+    }
+    with pytest.raises(RuntimeError):
+        await event_store.get("finished-process")
+
+
+@pytest.mark.asyncio
+async def test_archive_partition_should_archive_nothing_without_archivable_statuses(
+    event_store: PostgresEventStore,
+):
+    # Given
+    await ensure_monthly_partitions(
+        event_store.pool, months_ahead=0, today=date(2021, 1, 1)
+    )
+    archiving_store = PostgresEventStore(
+        event_store.pool, archive=InMemoryEventArchive()
+    )
+    finished = issue_resolution_events("finished-process", finished=True)
+    await archiving_store.append("finished-process", *finished)
+    nothing_archivable: list[dict[str, tuple[str, ...]]] = [
+        {},
+        {"issue_resolution": ()},
+    ]
+
+    # When
+    archived = [
+        await archiving_store.archive_partition(
+            "events_store_2021_01", archivable_statuses=archivable_statuses
+        )
+        for archivable_statuses in nothing_archivable
+    ]
+
+    # Then
+    assert archived == [0, 0]
+    assert len(await partitions_of(archiving_store, "finished-process")) == 3
+    assert await event_store.get("finished-process") == finished
+
+
+@pytest.mark.asyncio
+async def test_archive_partition_should_keep_events_appended_while_writing_the_archive(
+    event_store: PostgresEventStore,
+):
+    # Given
+    await ensure_monthly_partitions(
+        event_store.pool, months_ahead=0, today=date(2021, 1, 1)
+    )
+    finished = issue_resolution_events("finished-process", finished=True)
+    appended = IssueResolutionStarted(
+        occurred_at=datetime.fromisoformat("2021-01-01T03:00:00"),
+        process_id="finished-process",
+    )
+
+    class AppendingEventArchive(InMemoryEventArchive):
+        async def write(self, object_key: str, events: list[ArchivedEvent]) -> None:
+            await super().write(object_key, events)
+            await event_store.append("finished-process", appended)
+
+    archiving_store = PostgresEventStore(
+        event_store.pool, archive=AppendingEventArchive()
+    )
+    await archiving_store.append("finished-process", *finished)
+
+    # When
+    archived = await archiving_store.archive_partition("events_store_2021_01")
+
+    # Then
+    assert archived == 2
+    assert await archiving_store.get("finished-process") == [*finished, appended]
+
+
+@pytest.mark.asyncio
+async def test_append_to_an_archived_stream_should_carry_on_from_archived_positions(
+    event_store: PostgresEventStore,
+):
+    # Given
+    await ensure_monthly_partitions(
+        event_store.pool, months_ahead=0, today=date(2021, 1, 1)
+    )
+    archiving_store = PostgresEventStore(
+        event_store.pool, archive=InMemoryEventArchive()
+    )
+    finished = issue_resolution_events("finished-process", finished=True)
+    await archiving_store.append("finished-process", *finished)
+    await archiving_store.archive_partition("events_store_2021_01")
+    resumed = IssueResolutionStarted(
+        occurred_at=datetime.fromisoformat("2021-01-01T03:00:00"),
+        process_id="finished-process",
+    )
+
+    # When
+    await archiving_store.append(
+        "finished-process", resumed, expected_version=len(finished)
+    )
+
+    # Then
+    assert await archiving_store.get("finished-process") == [*finished, resumed]
+    assert await archiving_store.get_since("finished-process", len(finished)) == [
+        resumed
+    ]
+
+
+@pytest.mark.asyncio
+async def test_credentials_should_be_projected_on_append(event_store: EventStore):
+    # Given
+    connected = BriceDeNice.got_his_first_repo_connected()
+    rotated = replace(
+        BriceDeNice.got_his_token_rotated(), process_id=connected.process_id
+    )
+    await event_store.append(connected.process_id, connected)
+    await event_store.append(connected.process_id, rotated)
+    await event_store.append(
+        BriceDeNice.notion_integration_process_id(),
+        BriceDeNice.connected_notion_workspace(),
+        BriceDeNice.rotated_notion_token(),
+    )
+
+    # When
+    by_knowledge_base = await get_repo_credentials(
+        event_store, connected.knowledge_base_id
+    )
+    by_space = await get_space_repo_credentials(event_store, connected.space_id)
+    notion_credentials = await get_notion_credentials(
+        event_store, BriceDeNice.team_space_id()
+    )
+
+    # Then
+    assert (
+        by_knowledge_base
+        == by_space
+        == RepoCredentials(url=connected.url, access_token=rotated.new_access_token)
+    )
+    assert notion_credentials == NotionCredentials.create_from(
+        BriceDeNice.rotated_notion_token()
+    )
+    assert await get_repo_credentials(event_store, "unknown-kb") is None
+
+
+@pytest.mark.asyncio
+async def test_credentials_should_come_from_the_most_recent_connection_of_a_space(
+    event_store: EventStore,
+):
+    # Given
+    older = BriceDeNice.got_his_first_repo_connected()
+    newer = replace(
+        older,
+        process_id="brice-code-integration-process-002",
+        knowledge_base_id="brice-kb-002",
+        url="https://github.com/brice/other-repo.git",
+        occurred_at=older.occurred_at + timedelta(days=1),
+    )
+    await event_store.append(newer.process_id, newer)
+    await event_store.append(older.process_id, older)
+
+    # When
+    credentials = await get_space_repo_credentials(event_store, older.space_id)
+
+    # Then
+    assert credentials == RepoCredentials(
+        url=newer.url, access_token=newer.access_token
+    )
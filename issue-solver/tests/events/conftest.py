@@ -1,7 +1,14 @@
 import pytest
 from issue_solver.events.event_store import EventStore, InMemoryEventStore
+from issue_solver.events import serializable_records
 
 
 @pytest.fixture
 def event_store() -> EventStore:
     return InMemoryEventStore()
+
+
+@pytest.fixture(autouse=True)
+def reset_token_encryption_key(monkeypatch: pytest.MonkeyPatch):
+    """The key is kept once read: let each test set its own."""
+    monkeypatch.setattr(serializable_records, "_fernet", None)
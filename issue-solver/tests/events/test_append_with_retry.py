@@ -0,0 +1,152 @@
+from datetime import datetime
+
+import pytest
+
+from issue_solver.events.domain import (
+    AnyDomainEvent,
+    IssueResolutionFailed,
+    IssueResolutionRequested,
+    IssueResolutionStarted,
+)
+from issue_solver.events.event_store import (
+    ConcurrencyError,
+    EventStore,
+    InMemoryEventStore,
+    append_with_retry,
+)
+from issue_solver.issues.issue import IssueInfo
+
+PROCESS_ID = "test-process-id"
+
+
+def resolution_requested() -> IssueResolutionRequested:
+    return IssueResolutionRequested(
+        occurred_at=datetime.fromisoformat("2021-01-01T00:00:00"),
+        knowledge_base_id="knowledge-base-id",
+        process_id=PROCESS_ID,
+        issue=IssueInfo(description="test issue"),
+        user_id="test-user-id",
+    )
+
+
+def resolution_started() -> IssueResolutionStarted:
+    return IssueResolutionStarted(
+        occurred_at=datetime.fromisoformat("2021-01-01T01:00:00"),
+        process_id=PROCESS_ID,
+    )
+
+
+def resolution_failed() -> IssueResolutionFailed:
+    return IssueResolutionFailed(
+        occurred_at=datetime.fromisoformat("2021-01-01T02:00:00"),
+        process_id=PROCESS_ID,
+        reason="timeout",
+        error_message="took too long",
+    )
+
+
+class RacingEventStore(InMemoryEventStore):
+    """Lets another writer append right after the first `races` reads of the stream."""
+
+    def __init__(self, concurrent_event: AnyDomainEvent, races: int = 1):
+        super().__init__()
+        self.concurrent_event = concurrent_event
+        self.races = races
+        self.reads: list[str] = []
+
+    async def get(self, process_id: str) -> list[AnyDomainEvent]:
+        self.reads.append("get")
+        return await self._race(process_id, await super().get(process_id))
+
+    async def get_since(self, process_id: str, position: int) -> list[AnyDomainEvent]:
+        self.reads.append(f"get_since {position}")
+        return await self._race(
+            process_id, await super().get_since(process_id, position)
+        )
+
+    async def _race(
+        self, process_id: str, events: list[AnyDomainEvent]
+    ) -> list[AnyDomainEvent]:
+        events = list(events)
+        if self.races:
+            self.races -= 1
+            await super().append(process_id, self.concurrent_event)
+        return events
+
+
+@pytest.mark.asyncio
+async def test_append_should_raise_concurrency_error_when_expected_version_is_stale(
+    event_store: EventStore,
+):
+    # Given
+    await event_store.append(PROCESS_ID, resolution_requested())
+
+    # When / Then
+    with pytest.raises(ConcurrencyError):
+        await event_store.append(PROCESS_ID, resolution_started(), expected_version=0)
+
+
+@pytest.mark.asyncio
+async def test_append_with_retry_should_replay_decision_after_concurrent_append():
+    # Given
+    event_store = RacingEventStore(concurrent_event=resolution_started())
+    await event_store.append(PROCESS_ID, resolution_requested())
+
+    # When
+    seen_histories: list[list[AnyDomainEvent]] = []
+    appended = await append_with_retry(
+        event_store,
+        PROCESS_ID,
+        lambda history: seen_histories.append(list(history)) or [resolution_failed()],
+    )
+
+    # Then
+    assert appended == [resolution_failed()]
+    assert seen_histories == [
+        [resolution_requested()],
+        [resolution_requested(), resolution_started()],
+    ]
+    assert await event_store.get(PROCESS_ID) == [
+        resolution_requested(),
+        resolution_started(),
+        resolution_failed(),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_append_with_retry_should_give_up_after_max_attempts():
+    # Given
+    event_store = RacingEventStore(concurrent_event=resolution_started(), races=3)
+    await event_store.append(PROCESS_ID, resolution_requested())
+
+    # When / Then
+    with pytest.raises(ConcurrencyError):
+        await append_with_retry(
+            event_store, PROCESS_ID, lambda history: [resolution_failed()]
+        )
+
+
+@pytest.mark.asyncio
+async def test_append_with_retry_should_only_read_what_was_appended_since_the_given_history():
+    # Given
+    event_store = RacingEventStore(concurrent_event=resolution_started(), races=0)
+    await event_store.append(PROCESS_ID, resolution_requested())
+    await event_store.append(PROCESS_ID, resolution_started())
+
+    # When
+    seen_histories: list[list[AnyDomainEvent]] = []
+    appended = await append_with_retry(
+        event_store,
+        PROCESS_ID,
+        lambda history: seen_histories.append(list(history)) or [resolution_failed()],
+        history=[resolution_requested()],
+        version=1,
+    )
+
+    # Then
+    assert appended == [resolution_failed()]
+    assert seen_histories == [
+        [resolution_requested()],
+        [resolution_requested(), resolution_started()],
+    ]
+    assert event_store.reads == ["get_since 1"]
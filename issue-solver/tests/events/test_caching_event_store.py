@@ -0,0 +1,288 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+from typing import Any, Type
+from unittest.mock import patch
+
+import pytest
+
+from issue_solver.events.caching_event_store import CachingEventStore
+from issue_solver.events.domain import (
+    AnyDomainEvent,
+    CodeRepositoryConnected,
+    CodeRepositoryTokenRotated,
+    T,
+)
+from issue_solver.events.event_store import ConcurrencyError, InMemoryEventStore
+from issue_solver.factories import with_cache
+
+PROCESS_ID = "test-process-id"
+CONNECTED_AT = datetime.fromisoformat("2021-01-01T00:00:00")
+TTL_SECONDS = 60
+
+
+def repository_connected(process_id: str = PROCESS_ID) -> CodeRepositoryConnected:
+    return CodeRepositoryConnected(
+        url="https://github.com/test/repo",
+        access_token="initial-token",
+        user_id="test-user-id",
+        space_id="test-space-id",
+        knowledge_base_id=f"kb-{process_id}",
+        process_id=process_id,
+        occurred_at=CONNECTED_AT,
+    )
+
+
+def token_rotated(i: int) -> CodeRepositoryTokenRotated:
+    return CodeRepositoryTokenRotated(
+        knowledge_base_id=f"kb-{PROCESS_ID}",
+        new_access_token=f"token-{i}",
+        user_id="test-user-id",
+        process_id=PROCESS_ID,
+        occurred_at=CONNECTED_AT + timedelta(hours=i),
+    )
+
+
+class CountingEventStore(InMemoryEventStore):
+    def __init__(self):
+        super().__init__()
+        self.reads: list[str] = []
+
+    async def get_since(self, process_id: str, position: int) -> list[AnyDomainEvent]:
+        self.reads.append(f"get_since {process_id} {position}")
+        return await super().get_since(process_id, position)
+
+    async def get_many(self, process_ids) -> dict[str, list[AnyDomainEvent]]:
+        self.reads.append(f"get_many {sorted(process_ids)}")
+        return await super().get_many(process_ids)
+
+    async def latest(
+        self,
+        event_type: Type[T],
+        process_id: str | None = None,
+        criteria: dict[str, Any] | None = None,
+    ) -> T | None:
+        self.reads.append(f"latest {event_type.__name__}")
+        return await super().latest(event_type, process_id, criteria)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_get_should_read_a_stream_once():
+    # Given
+    inner = CountingEventStore()
+    await inner.append(PROCESS_ID, repository_connected(), token_rotated(1))
+    event_store = CachingEventStore(inner, TTL_SECONDS)
+
+    # When
+    first = await event_store.get(PROCESS_ID)
+    second = await event_store.get(PROCESS_ID)
+    tail = await event_store.get_since(PROCESS_ID, 1)
+
+    # Then
+    assert first == second == [repository_connected(), token_rotated(1)]
+    assert tail == [token_rotated(1)]
+    assert inner.reads == [f"get_since {PROCESS_ID} 0"]
+    assert event_store.metrics.hits == 2
+    assert event_store.metrics.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_append_at_the_cached_version_should_extend_the_cached_stream():
+    # Given
+    inner = CountingEventStore()
+    event_store = CachingEventStore(inner, TTL_SECONDS)
+    await event_store.append(PROCESS_ID, repository_connected())
+    await event_store.get(PROCESS_ID)
+
+    # When
+    await event_store.append(PROCESS_ID, token_rotated(1), expected_version=1)
+
+    # Then
+    assert await event_store.get(PROCESS_ID) == [
+        repository_connected(),
+        token_rotated(1),
+    ]
+    assert inner.reads == [f"get_since {PROCESS_ID} 0"]
+
+
+@pytest.mark.asyncio
+async def test_append_without_version_should_only_fetch_events_after_the_cached_ones():
+    # Given
+    inner = CountingEventStore()
+    event_store = CachingEventStore(inner, TTL_SECONDS)
+    await event_store.append(PROCESS_ID, repository_connected())
+    await event_store.get(PROCESS_ID)
+
+    # When
+    await event_store.append(PROCESS_ID, token_rotated(1))
+
+    # Then
+    assert await event_store.get(PROCESS_ID) == [
+        repository_connected(),
+        token_rotated(1),
+    ]
+    assert inner.reads == [f"get_since {PROCESS_ID} 0", f"get_since {PROCESS_ID} 1"]
+    assert event_store.metrics.refreshes == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrency_error_should_refresh_the_cached_stream():
+    # Given
+    inner = CountingEventStore()
+    event_store = CachingEventStore(inner, TTL_SECONDS)
+    await event_store.append(PROCESS_ID, repository_connected())
+    await event_store.get(PROCESS_ID)
+    await inner.append(PROCESS_ID, token_rotated(1))
+
+    # When
+    with pytest.raises(ConcurrencyError):
+        await event_store.append(PROCESS_ID, token_rotated(2), expected_version=1)
+
+    # Then
+    assert await event_store.get(PROCESS_ID) == [
+        repository_connected(),
+        token_rotated(1),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_ttl_should_bound_staleness_of_appends_made_elsewhere():
+    # Given
+    inner = CountingEventStore()
+    clock = FakeClock()
+    event_store = CachingEventStore(inner, ttl_seconds=5, clock=clock)
+    await inner.append(PROCESS_ID, repository_connected())
+    await event_store.get(PROCESS_ID)
+    await inner.append(PROCESS_ID, token_rotated(1))
+
+    # When
+    clock.now = 4
+    before_expiry = await event_store.get(PROCESS_ID)
+    clock.now = 5
+    after_expiry = await event_store.get(PROCESS_ID)
+
+    # Then
+    assert before_expiry == [repository_connected()]
+    assert after_expiry == [repository_connected(), token_rotated(1)]
+
+
+class SlowEventStore(InMemoryEventStore):
+    async def get_since(self, process_id: str, position: int) -> list[AnyDomainEvent]:
+        events = await super().get_since(process_id, position)
+        await asyncio.sleep(0.01)
+        return events
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_should_not_duplicate_events():
+    # Given
+    inner = SlowEventStore()
+    event_store = CachingEventStore(inner, TTL_SECONDS)
+    await event_store.append(PROCESS_ID, repository_connected())
+    await event_store.get(PROCESS_ID)
+    await event_store.append(PROCESS_ID, token_rotated(1))
+
+    # When
+    first, second = await asyncio.gather(
+        event_store.get(PROCESS_ID), event_store.get(PROCESS_ID)
+    )
+
+    # Then
+    expected = [repository_connected(), token_rotated(1)]
+    assert first == second == expected
+    assert await event_store.get(PROCESS_ID) == expected
+
+
+@pytest.mark.asyncio
+async def test_lookups_should_be_cached_until_the_next_append():
+    # Given
+    inner = CountingEventStore()
+    event_store = CachingEventStore(inner, TTL_SECONDS)
+    await event_store.append(PROCESS_ID, repository_connected())
+    criteria = {"knowledge_base_id": f"kb-{PROCESS_ID}"}
+
+    # When
+    await event_store.latest(CodeRepositoryTokenRotated, criteria=criteria)
+    await event_store.latest(CodeRepositoryTokenRotated, criteria=criteria)
+    await event_store.append(PROCESS_ID, token_rotated(1))
+    latest = await event_store.latest(CodeRepositoryTokenRotated, criteria=criteria)
+
+    # Then
+    assert latest == token_rotated(1)
+    assert inner.reads == ["latest CodeRepositoryTokenRotated"] * 2
+
+
+@pytest.mark.asyncio
+async def test_appends_should_only_drop_the_lookups_they_may_change():
+    # Given
+    inner = CountingEventStore()
+    event_store = CachingEventStore(inner, TTL_SECONDS)
+    await event_store.append(PROCESS_ID, repository_connected())
+    await event_store.latest(CodeRepositoryTokenRotated, process_id=PROCESS_ID)
+    await event_store.latest(CodeRepositoryConnected)
+    await event_store.get_credentials(CodeRepositoryConnected, "test-space-id")
+
+    # When
+    await event_store.append("other-process-id", token_rotated(1))
+    await event_store.append(PROCESS_ID, token_rotated(2))
+    await event_store.latest(CodeRepositoryTokenRotated, process_id=PROCESS_ID)
+    await event_store.latest(CodeRepositoryConnected)
+    credentials = await event_store.get_credentials(
+        CodeRepositoryConnected, "test-space-id"
+    )
+
+    # Then
+    assert inner.reads == [
+        "latest CodeRepositoryTokenRotated",
+        "latest CodeRepositoryConnected",
+        "latest CodeRepositoryTokenRotated",
+    ]
+    assert credentials is not None
+    assert credentials.rotated == token_rotated(2)
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_streams_should_be_evicted():
+    # Given
+    inner = CountingEventStore()
+    for process_id in ("a", "b", "c"):
+        await inner.append(process_id, repository_connected(process_id))
+    event_store = CachingEventStore(inner, TTL_SECONDS, max_entries=2)
+    await event_store.get_many(["a", "b"])
+    await event_store.get("a")
+
+    # When
+    await event_store.get("c")
+    await event_store.get_many(["a", "b"])
+
+    # Then
+    assert event_store.metrics.evictions == 2
+    assert inner.reads == [
+        "get_many ['a', 'b']",
+        "get_since c 0",
+        "get_many ['b']",
+    ]
+
+
+def test_cache_should_require_a_ttl():
+    # Given
+    inner = InMemoryEventStore()
+    with pytest.raises(ValueError):
+        CachingEventStore(inner, ttl_seconds=0)
+
+    # When
+    with patch.dict(os.environ, {"EVENT_STORE_CACHE_TTL_SECONDS": ""}):
+        # Then
+        with pytest.raises(ValueError, match="EVENT_STORE_CACHE_TTL_SECONDS"):
+            with_cache(inner, max_entries=10)
+    assert isinstance(
+        with_cache(inner, max_entries=10, ttl_seconds=5), CachingEventStore
+    )
@@ -0,0 +1,76 @@
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from issue_solver.events.domain import AnyDomainEvent
+from issue_solver.events.serializable_records import (
+    RECORD_CLASSES_BY_RECORD_TYPE,
+    deserialize,
+    serialize,
+)
+from tests.examples.happy_path_persona import examples_of_all_events
+
+EVENTS_TO_REPLAY = 100_000
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("RUN_BENCHMARKS"),
+    reason="Benchmark: set RUN_BENCHMARKS=1 to run it",
+)
+
+
+def replay_stream() -> tuple[list[AnyDomainEvent], list[tuple[str, str]]]:
+    events = [event for _, event in examples_of_all_events()]
+    rows: list[tuple[str, str]] = [
+        (record.type, record.model_dump_json())
+        for record in (serialize(event) for event in events)
+    ]
+    repeats = EVENTS_TO_REPLAY // len(rows) + 1
+    return (events * repeats)[:EVENTS_TO_REPLAY], (rows * repeats)[:EVENTS_TO_REPLAY]
+
+
+def scan_record_classes(record_type: str) -> type:
+    """Dispatch as the former `match` statement did: one comparison per case."""
+    for candidate, record_class in RECORD_CLASSES_BY_RECORD_TYPE.items():
+        if candidate == record_type:
+            return record_class
+    raise Exception(f"Unknown event type: {record_type}")
+
+
+def test_deserialize_should_replay_100k_events():
+    # Given
+    with patch.dict(
+        os.environ,
+        {"TOKEN_ENCRYPTION_KEY": "hp6ocOWdpR69r8lRUzci2cCSjwmqpntBojmnhaIJD_M="},
+    ):
+        expected, stream = replay_stream()
+
+        # When
+        started = time.perf_counter()
+        replayed = [deserialize(event_type, data) for event_type, data in stream]
+        elapsed = time.perf_counter() - started
+
+    # Then
+    print(f"\nReplayed {EVENTS_TO_REPLAY} events at {EVENTS_TO_REPLAY / elapsed:.0f}/s")
+    assert replayed == expected
+
+
+def test_registry_should_dispatch_faster_than_scanning_record_types():
+    # Given
+    record_types = [event_type for event_type, _ in replay_stream()[1]]
+
+    # When
+    started = time.perf_counter()
+    scanned = [scan_record_classes(record_type) for record_type in record_types]
+    scanning = time.perf_counter() - started
+    started = time.perf_counter()
+    looked_up = [
+        RECORD_CLASSES_BY_RECORD_TYPE[record_type] for record_type in record_types
+    ]
+    registry = time.perf_counter() - started
+
+    # Then
+    print(f"\nDispatch: registry {registry:.4f}s, scan {scanning:.4f}s")
+    assert looked_up == scanned
+    assert registry < scanning
@@ -0,0 +1,113 @@
+import asyncio
+from contextlib import aclosing
+from datetime import datetime
+
+import pytest
+
+from issue_solver.events.domain import (
+    CodeRepositoryIndexed,
+    RepositoryIndexationRequested,
+)
+from issue_solver.events.checkpoints import InMemoryCheckpointStore, catch_up
+from issue_solver.events.event_store import (
+    GlobalPosition,
+    InMemoryEventStore,
+    RecordedEvent,
+    StreamFilter,
+)
+
+
+def indexation_requested(process_id: str) -> RepositoryIndexationRequested:
+    return RepositoryIndexationRequested(
+        knowledge_base_id="knowledge-base-id",
+        user_id="test-user-id",
+        process_id=process_id,
+        occurred_at=datetime.fromisoformat("2021-01-01T00:00:00"),
+    )
+
+
+def repository_indexed(process_id: str) -> CodeRepositoryIndexed:
+    return CodeRepositoryIndexed(
+        branch="main",
+        commit_sha="sha",
+        stats={"files": 1},
+        knowledge_base_id="knowledge-base-id",
+        process_id=process_id,
+        occurred_at=datetime.fromisoformat("2021-01-01T01:00:00"),
+    )
+
+
+@pytest.mark.asyncio
+async def test_subscribe_should_replay_stream_then_push_appended_events(
+    event_store: InMemoryEventStore,
+):
+    # Given
+    await event_store.append("process-1", indexation_requested("process-1"))
+
+    # When
+    async with aclosing(event_store.subscribe(process_id="process-1")) as events:
+        replayed = await anext(events)
+        await event_store.append("process-2", indexation_requested("process-2"))
+        await event_store.append("process-1", repository_indexed("process-1"))
+        pushed = await asyncio.wait_for(anext(events), timeout=1)
+
+    # Then
+    assert replayed == indexation_requested("process-1")
+    assert pushed == repository_indexed("process-1")
+    assert event_store.subscribers == []
+
+
+@pytest.mark.asyncio
+async def test_subscribe_should_fan_out_events_matching_the_filter(
+    event_store: InMemoryEventStore,
+):
+    # Given
+    indexed = StreamFilter(
+        CodeRepositoryIndexed, {"knowledge_base_id": "knowledge-base-id"}
+    )
+
+    # When
+    async with (
+        aclosing(event_store.subscribe(indexed)) as first,
+        aclosing(event_store.subscribe(indexed)) as second,
+    ):
+        first_pending = asyncio.ensure_future(anext(first))
+        second_pending = asyncio.ensure_future(anext(second))
+        await asyncio.sleep(0)
+        await event_store.append("process-1", indexation_requested("process-1"))
+        await event_store.append("process-1", repository_indexed("process-1"))
+        received = await asyncio.wait_for(
+            asyncio.gather(first_pending, second_pending), timeout=1
+        )
+
+    # Then
+    assert received == [repository_indexed("process-1")] * 2
+
+
+@pytest.mark.asyncio
+async def test_catch_up_should_handle_each_recorded_event_once(
+    event_store: InMemoryEventStore,
+):
+    # Given
+    checkpoints = InMemoryCheckpointStore()
+    handled = []
+
+    async def handle(recorded_event: RecordedEvent) -> None:
+        handled.append((recorded_event.global_position, recorded_event.process_id))
+
+    await event_store.append("process-1", indexation_requested("process-1"))
+    await catch_up(event_store, checkpoints, "read-model", handle)
+    await event_store.append("process-2", indexation_requested("process-2"))
+    await event_store.append("process-1", repository_indexed("process-1"))
+
+    # When
+    caught_up = await catch_up(event_store, checkpoints, "read-model", handle)
+
+    # Then
+    assert caught_up == 2
+    assert handled == [
+        (GlobalPosition(0, 1), "process-1"),
+        (GlobalPosition(0, 2), "process-2"),
+        (GlobalPosition(0, 3), "process-1"),
+    ]
+    assert await checkpoints.get("read-model") == GlobalPosition(0, 3)
@@ -5,6 +5,8 @@ import pytest
 
 from issue_solver.events.domain import CodeRepositoryConnected
 from issue_solver.events.code_repo_integration import get_connected_repo_event
+from issue_solver.events.credentials import IntegrationCredentials
+from issue_solver.events.event_store import InMemoryEventStore
 
 
 @pytest.mark.asyncio
@@ -25,7 +27,9 @@ async def test_get_connected_repo_event_space_only_filtering():
         occurred_at=datetime(2023, 1, 1, 12, 0, 0),
     )
 
-    mock_event_store.find.return_value = [connected_event]
+    mock_event_store.get_credentials.return_value = IntegrationCredentials(
+        connected_event
+    )
 
     # Act
     result = await get_connected_repo_event(mock_event_store, space_id)
@@ -38,8 +42,8 @@ async def test_get_connected_repo_event_space_only_filtering():
     )  # Should find repo connected by different user
 
     # Verify that the query only uses space_id, not user_id
-    mock_event_store.find.assert_called_once_with(
-        {"space_id": space_id}, CodeRepositoryConnected
+    mock_event_store.get_credentials.assert_called_once_with(
+        CodeRepositoryConnected, space_id=space_id
     )
 
 
@@ -55,7 +59,7 @@ async def test_get_connected_repo_event_no_space_id():
 
     # Assert
     assert result is None
-    mock_event_store.find.assert_not_called()
+    mock_event_store.get_credentials.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -65,15 +69,15 @@ async def test_get_connected_repo_event_no_repo_found():
     mock_event_store = AsyncMock()
     space_id = "space-123"
 
-    mock_event_store.find.return_value = []  # No repository connected
+    mock_event_store.get_credentials.return_value = None  # No repository connected
 
     # Act
     result = await get_connected_repo_event(mock_event_store, space_id)
 
     # Assert
     assert result is None
-    mock_event_store.find.assert_called_once_with(
-        {"space_id": space_id}, CodeRepositoryConnected
+    mock_event_store.get_credentials.assert_called_once_with(
+        CodeRepositoryConnected, space_id=space_id
     )
 
 
@@ -81,7 +85,7 @@ async def test_get_connected_repo_event_no_repo_found():
 async def test_get_connected_repo_event_multiple_repos_returns_most_recent():
     """Test that get_connected_repo_event returns the most recent repository when multiple exist."""
     # Arrange
-    mock_event_store = AsyncMock()
+    event_store = InMemoryEventStore()
     space_id = "space-123"
 
     older_event = CodeRepositoryConnected(
@@ -104,15 +108,13 @@ async def test_get_connected_repo_event_multiple_repos_returns_most_recent():
         occurred_at=datetime(2023, 1, 2, 12, 0, 0),  # More recent
     )
 
-    mock_event_store.find.return_value = [older_event, newer_event]
+    await event_store.append("process-new", newer_event)
+    await event_store.append("process-old", older_event)
 
     # Act
-    result = await get_connected_repo_event(mock_event_store, space_id)
+    result = await get_connected_repo_event(event_store, space_id)
 
     # Assert
     assert result is not None
     assert result.url == "https://github.com/example/new-repo"
     assert result.process_id == "process-new"
-    mock_event_store.find.assert_called_once_with(
-        {"space_id": space_id}, CodeRepositoryConnected
-    )
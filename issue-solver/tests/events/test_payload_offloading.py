@@ -0,0 +1,260 @@
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from issue_solver.events.domain import (
+    CodeRepositoryIndexed,
+    EnvironmentConfigurationValidated,
+)
+from issue_solver.events.payload_offloading import (
+    BlobReference,
+    LocalPayloadBlobStore,
+    OffloadedDict,
+    OffloadedStr,
+    load_payloads,
+)
+from issue_solver.events.serializable_records import (
+    deserialize,
+    deserialize_from_storage,
+    serialize,
+    serialize_for_storage,
+)
+
+THRESHOLD = 1024
+
+
+@pytest.fixture
+def payloads_directory(tmp_path: Path):
+    with patch.dict(
+        os.environ,
+        {
+            "EVENT_PAYLOADS_DIRECTORY": str(tmp_path),
+            "EVENT_PAYLOAD_OFFLOAD_THRESHOLD": str(THRESHOLD),
+        },
+    ):
+        yield tmp_path
+
+
+def repository_indexed(stats: dict) -> CodeRepositoryIndexed:
+    return CodeRepositoryIndexed(
+        branch="main",
+        commit_sha="abc123",
+        stats=stats,
+        knowledge_base_id="knowledge-base-id",
+        process_id="process-id",
+        occurred_at=datetime.fromisoformat("2025-01-01T00:00:00"),
+    )
+
+
+def environment_validated(stdout: str) -> EnvironmentConfigurationValidated:
+    return EnvironmentConfigurationValidated(
+        snapshot_id="snapshot-id",
+        stdout=stdout,
+        stderr="",
+        return_code=0,
+        process_id="process-id",
+        occurred_at=datetime.fromisoformat("2025-01-01T00:00:00"),
+    )
+
+
+def large_stats() -> dict:
+    return {f"file_{i}.py": {"lines": i, "chunks": i * 2} for i in range(200)}
+
+
+@pytest.mark.asyncio
+async def test_small_fields_should_stay_inline(payloads_directory: Path):
+    # Given
+    event = repository_indexed({"files": 3})
+
+    # When
+    record = await serialize_for_storage(event)
+
+    # Then
+    assert record.stats == {"files": 3}  # type: ignore[union-attr]
+    assert list(payloads_directory.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_large_fields_should_be_stored_once_by_content_hash(
+    payloads_directory: Path,
+):
+    # Given
+    event = repository_indexed(large_stats())
+
+    # When
+    first = await serialize_for_storage(event)
+    second = await serialize_for_storage(event)
+
+    # Then
+    assert isinstance(first.stats, BlobReference)  # type: ignore[union-attr]
+    assert first.stats == second.stats  # type: ignore[union-attr]
+    assert first.stats.blob_key.startswith("sha256/")  # type: ignore[union-attr]
+    assert len(list((payloads_directory / "sha256").iterdir())) == 1
+    assert len(first.model_dump_json()) < THRESHOLD
+
+
+def test_serialize_should_keep_fields_inline(payloads_directory: Path):
+    # Given
+    event = repository_indexed(large_stats())
+
+    # When
+    record = serialize(event)
+
+    # Then
+    assert record.stats == event.stats  # type: ignore[union-attr]
+    assert list(payloads_directory.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_offloaded_fields_should_be_fetched_back_from_storage(
+    payloads_directory: Path,
+):
+    # Given
+    stats = large_stats()
+    stdout = "installing dependencies\n" * 100
+    indexed = await serialize_for_storage(repository_indexed(stats))
+    validated = await serialize_for_storage(environment_validated(stdout))
+
+    # When
+    indexed_event = await deserialize_from_storage(
+        "repository_indexed", indexed.model_dump_json()
+    )
+    validated_event = await deserialize_from_storage(
+        "environment_configuration_validated", validated.model_dump_json()
+    )
+
+    # Then
+    assert isinstance(indexed_event, CodeRepositoryIndexed)
+    assert indexed_event.stats == stats
+    assert isinstance(validated_event, EnvironmentConfigurationValidated)
+    assert validated_event.stdout == stdout
+    assert validated_event.stdout.splitlines()[0] == "installing dependencies"
+
+
+@pytest.mark.asyncio
+async def test_storing_a_stored_event_again_should_keep_its_reference(
+    payloads_directory: Path,
+):
+    # Given
+    stored = await serialize_for_storage(repository_indexed(large_stats()))
+    event = await deserialize_from_storage(
+        "repository_indexed", stored.model_dump_json()
+    )
+    assert isinstance(event, CodeRepositoryIndexed)
+
+    # When
+    with (
+        patch.object(
+            LocalPayloadBlobStore, "put", side_effect=AssertionError("stored again")
+        ),
+        patch.object(
+            LocalPayloadBlobStore, "get", side_effect=AssertionError("fetched")
+        ),
+    ):
+        record = await serialize_for_storage(event)
+
+    # Then
+    assert record.stats == stored.stats  # type: ignore[union-attr]
+    assert isinstance(event.stats, OffloadedDict)
+
+
+@pytest.mark.asyncio
+async def test_safe_copy_should_keep_fields_of_stored_events_inline(
+    payloads_directory: Path,
+):
+    # Given
+    stdout = "x" * (THRESHOLD + 1)
+    stored = await serialize_for_storage(environment_validated(stdout))
+    event = await deserialize_from_storage(
+        "environment_configuration_validated", stored.model_dump_json()
+    )
+
+    # When
+    safe_record = serialize(event).safe_copy()
+
+    # Then
+    assert safe_record.stdout == stdout  # type: ignore[union-attr]
+    assert isinstance(event.stdout, OffloadedStr)  # type: ignore[union-attr]
+
+
+def test_deserialize_should_refuse_unresolved_fields(payloads_directory: Path):
+    # Given
+    reference = BlobReference(blob_key="sha256/abc", size=THRESHOLD + 1)
+    record = serialize(repository_indexed({})).model_copy(update={"stats": reference})
+
+    # When / Then
+    with pytest.raises(RuntimeError, match="has not been resolved"):
+        deserialize("repository_indexed", record.model_dump_json())
+
+
+@pytest.mark.asyncio
+async def test_offloaded_field_without_blob_store_should_fail_on_read(
+    payloads_directory: Path,
+):
+    # Given
+    stored = await serialize_for_storage(repository_indexed(large_stats()))
+
+    # When
+    with patch.dict(os.environ, {"EVENT_PAYLOADS_DIRECTORY": ""}):
+        # Then
+        with pytest.raises(RuntimeError, match="no payload blob store"):
+            await deserialize_from_storage(
+                "repository_indexed", stored.model_dump_json()
+            )
+
+
+@pytest.mark.asyncio
+async def test_offloaded_mappings_should_only_be_fetched_when_read(
+    payloads_directory: Path,
+):
+    # Given
+    stats = large_stats()
+    stored = await serialize_for_storage(repository_indexed(stats))
+
+    with patch.object(
+        LocalPayloadBlobStore,
+        "get",
+        autospec=True,
+        side_effect=LocalPayloadBlobStore.get,
+    ) as get:
+        # When
+        event = await deserialize_from_storage(
+            "repository_indexed", stored.model_dump_json()
+        )
+        fetched_on_read = get.call_count
+        assert isinstance(event, CodeRepositoryIndexed)
+        first_file = event.stats["file_0.py"]
+
+    # Then
+    assert fetched_on_read == 0
+    assert get.call_count == 1
+    assert first_file == {"lines": 0, "chunks": 0}
+    assert json.loads(json.dumps(event.stats)) == stats
+    assert dict(event.stats) == stats
+
+
+@pytest.mark.asyncio
+async def test_load_payloads_should_fetch_mappings_before_serializing(
+    payloads_directory: Path,
+):
+    # Given
+    stats = large_stats()
+    stored = await serialize_for_storage(repository_indexed(stats))
+    events = [
+        await deserialize_from_storage("repository_indexed", stored.model_dump_json())
+        for _ in range(3)
+    ]
+
+    # When
+    await load_payloads(events)
+    with patch.object(
+        LocalPayloadBlobStore, "get", side_effect=AssertionError("fetched on read")
+    ):
+        records = [serialize(event) for event in events]
+
+    # Then
+    assert [record.stats for record in records] == [stats] * 3  # type: ignore[union-attr]
@@ -0,0 +1,172 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from issue_solver.events.domain import (
+    AnyDomainEvent,
+    CodeRepositoryConnected,
+    CodeRepositoryIndexed,
+    CodeRepositoryTokenRotated,
+    DocumentationPromptsDefined,
+    DocumentationPromptsRemoved,
+    RepositoryIndexationRequested,
+)
+from issue_solver.events.process_summary import ProcessSummary
+
+PROCESS_ID = "test-process-id"
+STARTED_AT = datetime.fromisoformat("2021-01-01T00:00:00+00:00")
+
+
+def at(hours: int) -> datetime:
+    return STARTED_AT + timedelta(hours=hours)
+
+
+def repository_connected(hours: int) -> CodeRepositoryConnected:
+    return CodeRepositoryConnected(
+        url="https://github.com/test/repo",
+        access_token="test-token",
+        user_id="test-user-id",
+        space_id="test-space-id",
+        knowledge_base_id="knowledge-base-id",
+        process_id=PROCESS_ID,
+        occurred_at=at(hours),
+    )
+
+
+def repository_indexed(hours: int) -> CodeRepositoryIndexed:
+    return CodeRepositoryIndexed(
+        branch="main",
+        commit_sha=f"sha-{hours}",
+        stats={},
+        knowledge_base_id="knowledge-base-id",
+        process_id=PROCESS_ID,
+        occurred_at=at(hours),
+    )
+
+
+def indexation_requested(hours: int) -> RepositoryIndexationRequested:
+    return RepositoryIndexationRequested(
+        knowledge_base_id="knowledge-base-id",
+        user_id="test-user-id",
+        process_id=PROCESS_ID,
+        occurred_at=at(hours),
+    )
+
+
+def token_rotated(hours: int) -> CodeRepositoryTokenRotated:
+    return CodeRepositoryTokenRotated(
+        knowledge_base_id="knowledge-base-id",
+        new_access_token=f"token-{hours}",
+        user_id="test-user-id",
+        process_id=PROCESS_ID,
+        occurred_at=at(hours),
+    )
+
+
+def prompts_defined(hours: int, *prompt_ids: str) -> DocumentationPromptsDefined:
+    return DocumentationPromptsDefined(
+        knowledge_base_id="knowledge-base-id",
+        user_id="test-user-id",
+        docs_prompts={prompt_id: f"Document {prompt_id}" for prompt_id in prompt_ids},
+        process_id=PROCESS_ID,
+        occurred_at=at(hours),
+    )
+
+
+def prompts_removed(hours: int, *prompt_ids: str) -> DocumentationPromptsRemoved:
+    return DocumentationPromptsRemoved(
+        knowledge_base_id="knowledge-base-id",
+        user_id="test-user-id",
+        prompt_ids=set(prompt_ids),
+        process_id=PROCESS_ID,
+        occurred_at=at(hours),
+    )
+
+
+STREAMS: list[list[AnyDomainEvent]] = [
+    [
+        repository_connected(0),
+        indexation_requested(1),
+        repository_indexed(2),
+        token_rotated(3),
+        indexation_requested(4),
+    ],
+    # Appended late: occurred before the stream's latest status.
+    [
+        repository_connected(0),
+        indexation_requested(3),
+        repository_indexed(2),
+        token_rotated(4),
+        repository_indexed(1),
+    ],
+    # Ties go to the event appended last.
+    [repository_connected(0), indexation_requested(1), repository_indexed(1)],
+    [token_rotated(0), token_rotated(1), repository_connected(2)],
+    [
+        prompts_defined(0, "overview", "api"),
+        prompts_defined(1, "glossary"),
+        prompts_removed(2, "api"),
+        prompts_removed(3, "overview"),
+    ],
+]
+
+
+@pytest.mark.parametrize("stream", STREAMS)
+def test_apply_should_summarize_as_from_events_or_refuse(
+    stream: list[AnyDomainEvent],
+):
+    for split in range(1, len(stream)):
+        # Given
+        previous = ProcessSummary.from_events(PROCESS_ID, stream[:split])
+        appended = stream[split:]
+
+        # When / Then
+        if previous.can_apply(appended):
+            assert previous.apply(appended) == ProcessSummary.from_events(
+                PROCESS_ID, stream
+            )
+        else:
+            with pytest.raises(ValueError):
+                previous.apply(appended)
+
+
+def test_apply_should_keep_the_latest_status_when_an_older_event_is_appended():
+    # Given
+    previous = ProcessSummary.from_events(
+        PROCESS_ID, [repository_connected(0), indexation_requested(2)]
+    )
+
+    # When
+    summary = previous.apply([repository_indexed(1)])
+
+    # Then
+    assert summary.status == "indexing"
+    assert summary.status_at == at(2)
+
+
+def test_apply_should_need_the_whole_stream_to_tell_remaining_prompts():
+    # Given
+    previous = ProcessSummary.from_events(
+        PROCESS_ID, [prompts_defined(0, "overview"), prompts_defined(1, "api")]
+    )
+
+    # When / Then
+    assert not previous.can_apply([prompts_removed(2, "api")])
+
+
+def test_apply_should_refuse_summaries_stored_without_status_time():
+    # Given
+    previous = ProcessSummary(
+        process_id=PROCESS_ID,
+        type="code_repository_integration",
+        status="indexing",
+        run_id=None,
+        space_id="test-space-id",
+        knowledge_base_id="knowledge-base-id",
+        created_at=at(0),
+        updated_at=at(2),
+        event_count=2,
+    )
+
+    # When / Then
+    assert not previous.can_apply([repository_indexed(1)])
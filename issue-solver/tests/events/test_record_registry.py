@@ -0,0 +1,40 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from issue_solver.events.serializable_records import (
+    RECORD_CLASSES_BY_EVENT_TYPE,
+    RECORD_CLASSES_BY_RECORD_TYPE,
+    deserialize,
+    serialize,
+)
+from tests.examples.happy_path_persona import examples_of_all_events
+
+
+@pytest.mark.parametrize("event_type,event", examples_of_all_events())
+def test_deserialize_should_dispatch_each_record_type_back_to_its_event(
+    event_type, event
+):
+    # Given
+    with patch.dict(
+        os.environ,
+        {"TOKEN_ENCRYPTION_KEY": "hp6ocOWdpR69r8lRUzci2cCSjwmqpntBojmnhaIJD_M="},
+    ):
+        record = serialize(event)
+
+        # When
+        replayed = deserialize(record.type, record.model_dump_json())
+
+    # Then
+    assert isinstance(record, RECORD_CLASSES_BY_EVENT_TYPE[event_type])
+    assert replayed == event
+
+
+def test_registry_should_give_each_event_type_its_own_record_type():
+    assert len(RECORD_CLASSES_BY_RECORD_TYPE) == len(RECORD_CLASSES_BY_EVENT_TYPE)
+
+
+def test_deserialize_should_reject_unknown_record_types():
+    with pytest.raises(Exception, match="Unknown event type: unknown_event"):
+        deserialize("unknown_event", "{}")
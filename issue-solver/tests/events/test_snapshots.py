@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from issue_solver.events.code_repo_integration import get_access_token
+from issue_solver.events.domain import (
+    AnyDomainEvent,
+    CodeRepositoryConnected,
+    CodeRepositoryTokenRotated,
+)
+from issue_solver.events.event_store import InMemoryEventStore
+from issue_solver.events.snapshots import load_latest_events
+
+PROCESS_ID = "test-process-id"
+CONNECTED_AT = datetime.fromisoformat("2021-01-01T00:00:00")
+
+
+def repository_connected() -> CodeRepositoryConnected:
+    return CodeRepositoryConnected(
+        url="https://github.com/test/repo",
+        access_token="initial-token",
+        user_id="test-user-id",
+        space_id="test-space-id",
+        knowledge_base_id="knowledge-base-id",
+        process_id=PROCESS_ID,
+        occurred_at=CONNECTED_AT,
+    )
+
+
+def token_rotated(i: int) -> CodeRepositoryTokenRotated:
+    return CodeRepositoryTokenRotated(
+        knowledge_base_id="knowledge-base-id",
+        new_access_token=f"token-{i}",
+        user_id="test-user-id",
+        process_id=PROCESS_ID,
+        occurred_at=CONNECTED_AT + timedelta(hours=i),
+    )
+
+
+class CountingEventStore(InMemoryEventStore):
+    def __init__(self, snapshot_interval: int):
+        super().__init__(snapshot_interval=snapshot_interval)
+        self.loaded_events = 0
+
+    async def get(self, process_id: str) -> list[AnyDomainEvent]:
+        events = await super().get(process_id)
+        self.loaded_events += len(events)
+        return events
+
+    async def get_since(self, process_id: str, position: int) -> list[AnyDomainEvent]:
+        events = await super().get_since(process_id, position)
+        self.loaded_events += len(events)
+        return events
+
+
+@pytest.mark.asyncio
+async def test_append_should_snapshot_stream_every_interval():
+    # Given
+    event_store = InMemoryEventStore(snapshot_interval=4)
+    await event_store.append(PROCESS_ID, repository_connected())
+
+    # When
+    for i in range(1, 10):
+        await event_store.append(PROCESS_ID, token_rotated(i))
+
+    # Then
+    snapshot = await event_store.get_snapshot(PROCESS_ID)
+    assert snapshot is not None
+    assert snapshot.position == 8
+    assert snapshot.events == [repository_connected(), token_rotated(7)]
+
+
+@pytest.mark.asyncio
+async def test_get_since_should_return_events_after_position(
+    event_store: InMemoryEventStore,
+):
+    # Given
+    await event_store.append(
+        PROCESS_ID, repository_connected(), token_rotated(1), token_rotated(2)
+    )
+
+    # When
+    events = await event_store.get_since(PROCESS_ID, 1)
+
+    # Then
+    assert events == [token_rotated(1), token_rotated(2)]
+
+
+@pytest.mark.asyncio
+async def test_load_latest_events_should_read_only_events_after_snapshot():
+    # Given
+    event_store = CountingEventStore(snapshot_interval=50)
+    await event_store.append(PROCESS_ID, repository_connected())
+    for i in range(1, 102):
+        await event_store.append(PROCESS_ID, token_rotated(i))
+    event_store.loaded_events = 0
+
+    # When
+    events = await load_latest_events(event_store, PROCESS_ID)
+
+    # Then
+    assert events == [repository_connected(), token_rotated(101)]
+    assert event_store.loaded_events == 2
+
+
+@pytest.mark.asyncio
+async def test_get_access_token_should_use_latest_rotation_after_snapshot():
+    # Given
+    event_store = InMemoryEventStore(snapshot_interval=3)
+    await event_store.append(PROCESS_ID, repository_connected())
+    for i in range(1, 8):
+        await event_store.append(PROCESS_ID, token_rotated(i))
+
+    # When
+    access_token = await get_access_token(event_store, PROCESS_ID)
+
+    # Then
+    assert access_token == "token-7"
@@ -8,6 +8,7 @@ from issue_solver.events.domain import (
     NotionIntegrationAuthorized,
     NotionIntegrationTokenRefreshed,
 )
+from issue_solver.events import serializable_records
 from issue_solver.events.serializable_records import (
     CodeRepositoryConnectedRecord,
     _encrypt_token,
@@ -177,7 +178,7 @@ def test_backward_compatibility_mixed_tokens(encryption_key):
         )  # Encrypted token decrypted
 
 
-def test_different_keys_produce_different_encryption():
+def test_different_keys_produce_different_encryption(monkeypatch: pytest.MonkeyPatch):
     """Test that different keys produce different encrypted results."""
     token = "ghp_test123456789"
     key1 = "hp6ocOWdpR69r8lRUzci2cCSjwmqpntBojmnhaIJD_M="
@@ -186,6 +187,7 @@ def test_different_keys_produce_different_encryption():
     with patch.dict(os.environ, {"TOKEN_ENCRYPTION_KEY": key1}):
         encrypted1 = _encrypt_token(token)
 
+    monkeypatch.setattr(serializable_records, "_fernet", None)
     with patch.dict(os.environ, {"TOKEN_ENCRYPTION_KEY": key2}):
         encrypted2 = _encrypt_token(token)
 
@@ -334,3 +336,22 @@ def test_notion_integration_token_refreshed_record_encryption(
         assert safe_record.mcp_refresh_token
         assert safe_record.mcp_refresh_token.endswith(serialized.mcp_refresh_token[-4:])
         assert "*" in safe_record.mcp_refresh_token
+
+
+def test_key_set_after_a_first_token_should_encrypt_the_next_ones():
+    # Given
+    token = "ghp_test123456789"
+    with patch.dict(os.environ, {"TOKEN_ENCRYPTION_KEY": ""}):
+        before_key = _encrypt_token(token)
+
+    # When
+    with patch.dict(
+        os.environ,
+        {"TOKEN_ENCRYPTION_KEY": "hp6ocOWdpR69r8lRUzci2cCSjwmqpntBojmnhaIJD_M="},
+    ):
+        after_key = _encrypt_token(token)
+
+    # Then
+    assert before_key == token
+    assert after_key != token
+    assert _decrypt_token(after_key) == token
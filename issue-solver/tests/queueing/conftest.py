@@ -17,7 +17,6 @@ from testcontainers.postgres import PostgresContainer
 from tests.fixtures import ALEMBIC_INI_LOCATION, MIGRATIONS_PATH
 
 from issue_solver.factories import init_event_store
-from issue_solver.queueing.sqs_events_publishing import SQSQueueingEventStore
 
 
 @pytest.fixture(scope="module")
@@ -67,11 +66,10 @@ async def event_store(
     postgres_container: PostgresContainer, run_migrations, sqs_queue
 ) -> EventStore:
     """Initialize and return an EventStore instance."""
-    store = await init_event_store(
+    return await init_event_store(
         database_url=extract_direct_database_url(),
-        queue_url=os.environ["PROCESS_QUEUE_URL"],
+        queue_url=sqs_queue.get("queue_url"),
     )
-    return SQSQueueingEventStore(store, sqs_queue.get("queue_url"))
 
 
 @pytest.fixture(scope="module")
@@ -0,0 +1,179 @@
+import asyncio
+import json
+from datetime import datetime
+from unittest.mock import Mock
+
+import asyncpg
+import pytest
+import pytest_asyncio
+
+from issue_solver.database.init_event_store import extract_direct_database_url
+from issue_solver.database.postgres_event_store import PostgresEventStore
+from issue_solver.events.domain import IssueResolutionCompleted
+from issue_solver.events.event_store import ConcurrencyError
+from issue_solver.queueing.outbox import OutboxRelay
+
+
+@pytest_asyncio.fixture
+async def pool(run_migrations):
+    pool = await asyncpg.create_pool(extract_direct_database_url())
+    yield pool
+    await pool.close()
+
+
+def completed(process_id: str, pr_number: int) -> IssueResolutionCompleted:
+    return IssueResolutionCompleted(
+        process_id=process_id,
+        occurred_at=datetime.fromisoformat("2023-10-01T00:00:00Z"),
+        pr_number=pr_number,
+        pr_url=f"https://example.com/pr/{pr_number}",
+    )
+
+
+def receive_all_messages(sqs_client, queue_url: str) -> list[dict]:
+    messages: list[dict] = []
+    while True:
+        response = sqs_client.receive_message(
+            QueueUrl=queue_url, MaxNumberOfMessages=10, WaitTimeSeconds=1
+        )
+        if "Messages" not in response:
+            return messages
+        messages.extend(json.loads(m["Body"]) for m in response["Messages"])
+
+
+async def count_outbox_messages(pool: asyncpg.Pool) -> int:
+    return await pool.fetchval("SELECT COUNT(*) FROM events_outbox")
+
+
+@pytest.mark.asyncio
+async def test_outbox_messages_should_be_written_with_the_events(pool, sqs_queue):
+    # Given
+    event_store = PostgresEventStore(pool, outbox=True)
+    await event_store.append("process-1", completed("process-1", 1))
+
+    # When
+    with pytest.raises(ConcurrencyError):
+        await event_store.append(
+            "process-1", completed("process-1", 2), expected_version=0
+        )
+
+    # Then
+    assert await count_outbox_messages(pool) == 1
+
+
+@pytest.mark.asyncio
+async def test_relay_should_drain_the_outbox_in_batches_of_ten(
+    pool, sqs_queue, sqs_client
+):
+    # Given
+    event_store = PostgresEventStore(pool, outbox=True)
+    await event_store.append(
+        "process-1", *[completed("process-1", i) for i in range(25)]
+    )
+    spied_client = Mock(wraps=sqs_client)
+    relay = OutboxRelay(pool, sqs_queue["queue_url"], sqs_client=spied_client)
+
+    # When
+    sent = await relay.drain()
+
+    # Then
+    assert sent == 25
+    assert spied_client.send_message_batch.call_count == 3
+    assert await count_outbox_messages(pool) == 0
+    messages = receive_all_messages(sqs_client, sqs_queue["queue_url"])
+    assert sorted(m["pr_number"] for m in messages) == list(range(25))
+
+
+@pytest.mark.asyncio
+async def test_relay_should_keep_messages_that_failed_to_be_sent(pool, sqs_queue):
+    # Given
+    event_store = PostgresEventStore(pool, outbox=True)
+    await event_store.append(
+        "process-1", completed("process-1", 1), completed("process-1", 2)
+    )
+    failing_client = Mock()
+    failing_client.send_message_batch.return_value = {
+        "Successful": [{"Id": "0", "MessageId": "m-0"}],
+        "Failed": [{"Id": "1", "SenderFault": False, "Code": "InternalError"}],
+    }
+    relay = OutboxRelay(pool, sqs_queue["queue_url"], sqs_client=failing_client)
+
+    # When
+    sent = await relay.drain()
+
+    # Then
+    assert sent == 1
+    remaining = await pool.fetch("SELECT body FROM events_outbox")
+    assert [json.loads(row["body"])["pr_number"] for row in remaining] == [2]
+
+
+@pytest.mark.asyncio
+async def test_relay_should_keep_messages_when_sqs_is_unavailable(pool, sqs_queue):
+    # Given
+    event_store = PostgresEventStore(pool, outbox=True)
+    await event_store.append("process-1", completed("process-1", 1))
+    failing_client = Mock()
+    failing_client.send_message_batch.side_effect = ConnectionError("unreachable")
+    relay = OutboxRelay(pool, sqs_queue["queue_url"], sqs_client=failing_client)
+
+    # When
+    with pytest.raises(ConnectionError):
+        await relay.drain()
+
+    # Then
+    assert await count_outbox_messages(pool) == 1
+
+
+@pytest.mark.asyncio
+async def test_relay_should_not_hold_locks_while_sending(pool, sqs_queue, sqs_client):
+    # Given
+    event_store = PostgresEventStore(pool, outbox=True)
+    await event_store.append("process-1", completed("process-1", 1))
+    loop = asyncio.get_running_loop()
+    other_relay = OutboxRelay(pool, sqs_queue["queue_url"], sqs_client=sqs_client)
+    observed: dict[str, object] = {}
+
+    def send_message_batch(**kwargs):
+        observed["locked_rows"] = asyncio.run_coroutine_threadsafe(
+            pool.fetchval(
+                "SELECT COUNT(*) FROM (SELECT id FROM events_outbox FOR UPDATE NOWAIT) AS rows"
+            ),
+            loop,
+        ).result()
+        observed["other_relay"] = asyncio.run_coroutine_threadsafe(
+            other_relay.relay_once(), loop
+        ).result()
+        return sqs_client.send_message_batch(**kwargs)
+
+    spied_client = Mock()
+    spied_client.send_message_batch.side_effect = send_message_batch
+    relay = OutboxRelay(pool, sqs_queue["queue_url"], sqs_client=spied_client)
+
+    # When
+    sent = await relay.drain()
+
+    # Then
+    assert sent == 1
+    assert observed == {"locked_rows": 1, "other_relay": (0, 0)}
+    assert await count_outbox_messages(pool) == 0
+
+
+@pytest.mark.asyncio
+async def test_relay_should_only_send_the_messages_of_the_given_process(
+    pool, sqs_queue, sqs_client
+):
+    # Given
+    event_store = PostgresEventStore(pool, outbox=True)
+    await event_store.append("process-1", completed("process-1", 1))
+    await event_store.append("process-2", completed("process-2", 2))
+    relay = OutboxRelay(pool, sqs_queue["queue_url"], sqs_client=sqs_client)
+
+    # When
+    sent = await relay.drain("process-2")
+
+    # Then
+    assert sent == 1
+    messages = receive_all_messages(sqs_client, sqs_queue["queue_url"])
+    assert [m["process_id"] for m in messages] == ["process-2"]
+    remaining = await pool.fetch("SELECT process_id FROM events_outbox")
+    assert [row["process_id"] for row in remaining] == ["process-1"]
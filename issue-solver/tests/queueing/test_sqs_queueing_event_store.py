@@ -1,9 +1,12 @@
 import json
 from datetime import datetime
+from unittest.mock import Mock
 
 import pytest
+from botocore.exceptions import EndpointConnectionError
 
 from issue_solver.events.domain import IssueResolutionCompleted
+from issue_solver.queueing.sqs_events_publishing import send_batch
 from tests.queueing.conftest import receive_event_message
 
 
@@ -32,3 +35,28 @@ async def test_append_should_append_event_to_event_store_and_publish_to_sqs(
     assert message_body["pr_number"] == 123
     assert message_body["pr_url"] == "https://example.com/pr/123"
     assert message_body["occurred_at"] == "2023-10-01T00:00:00Z"
+
+
+def test_send_batch_should_report_network_errors_for_every_event_of_the_batch():
+    # Given
+    events = [
+        IssueResolutionCompleted(
+            process_id="test_process_id",
+            occurred_at=datetime.fromisoformat("2023-10-01T00:00:00Z"),
+            pr_number=pr_number,
+            pr_url=f"https://example.com/pr/{pr_number}",
+        )
+        for pr_number in range(12)
+    ]
+    sqs_client = Mock()
+    sqs_client.send_message_batch.side_effect = [
+        EndpointConnectionError(endpoint_url="https://sqs.example.com"),
+        {"Successful": [{"Id": "10"}, {"Id": "11"}], "Failed": []},
+    ]
+
+    # When
+    errors = send_batch(events, "queue-url", sqs_client=sqs_client)
+
+    # Then
+    assert all(errors[:10])
+    assert errors[10:] == [None, None]
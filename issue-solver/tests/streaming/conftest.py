@@ -1,7 +1,9 @@
-from typing import Generator, Any
+from typing import AsyncGenerator, Generator, Any
 
 import pytest
+import pytest_asyncio
 from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
 from testcontainers.redis import RedisContainer
 
 
@@ -24,3 +26,16 @@ def redis_client(
     yield redis_client
     redis_client.flushall()
     redis_client.close()
+
+
+@pytest_asyncio.fixture(scope="function")
+async def async_redis_client(
+    redis_container: RedisContainer,
+) -> AsyncGenerator[AsyncRedis, None]:
+    async_redis_client = AsyncRedis(
+        host=redis_container.get_container_host_ip(),
+        port=int(redis_container.get_exposed_port(6379)),
+        decode_responses=True,
+    )
+    yield async_redis_client
+    await async_redis_client.aclose()
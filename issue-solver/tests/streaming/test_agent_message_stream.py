@@ -0,0 +1,175 @@
+from datetime import datetime
+
+import pytest
+from claude_agent_sdk import SystemMessage
+
+from issue_solver.agents.agent_message_store import InMemoryAgentMessageStore
+from issue_solver.events.domain import IssueResolutionCompleted, IssueResolutionStarted
+from issue_solver.events.event_store import InMemoryEventStore
+from issue_solver.models.supported_models import (
+    SupportedAnthropicModel,
+    VersionedAIModel,
+)
+from issue_solver.streaming.agent_message_stream import tail_agent_messages
+from issue_solver.streaming.streaming_agent_message_store import (
+    StreamingAgentMessageStore,
+    get_messages_stream,
+    publish_agent_messages,
+)
+
+PROCESS_ID = "resolve-issue-123"
+STARTED_AT = datetime.fromisoformat("2025-01-01T10:00:00")
+
+
+async def append_turn(store: StreamingAgentMessageStore, turn: int) -> str:
+    return await store.append(
+        PROCESS_ID,
+        VersionedAIModel(SupportedAnthropicModel.CLAUDE_SONNET_4_5, "20250929"),
+        turn,
+        SystemMessage(subtype="turn", data={"turn": turn}),
+        "CLAUDE_CODE",
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_should_replay_then_tail_messages_until_the_process_ends(
+    redis_client, async_redis_client
+):
+    # Given
+    message_store = InMemoryAgentMessageStore()
+    streaming_store = StreamingAgentMessageStore(message_store, async_redis_client)
+    event_store = InMemoryEventStore()
+    await event_store.append(
+        PROCESS_ID,
+        IssueResolutionStarted(process_id=PROCESS_ID, occurred_at=STARTED_AT),
+    )
+    first_id = await append_turn(streaming_store, 1)
+    messages = tail_agent_messages(
+        PROCESS_ID,
+        message_store,
+        event_store,
+        async_redis_client,
+        poll_interval_seconds=0.05,
+    )
+
+    # When
+    replayed = await anext(messages)
+    await publish_agent_messages(async_redis_client, PROCESS_ID, [replayed])
+    second_id = await append_turn(streaming_store, 2)
+    await event_store.append(
+        PROCESS_ID,
+        IssueResolutionCompleted(
+            pr_url="https://github.com/test/repo/pull/1",
+            pr_number=1,
+            process_id=PROCESS_ID,
+            occurred_at=STARTED_AT,
+        ),
+    )
+    tailed = [message async for message in messages]
+
+    # Then
+    assert [message.id for message in [replayed, *tailed]] == [first_id, second_id]
+    assert str(tailed[0].model) == "claude-sonnet-4-5-20250929"
+
+
+@pytest.mark.asyncio
+async def test_stream_should_resume_from_redis_after_the_last_message_received(
+    redis_client, async_redis_client
+):
+    # Given
+    streaming_store = StreamingAgentMessageStore(
+        InMemoryAgentMessageStore(), async_redis_client
+    )
+    message_ids = [await append_turn(streaming_store, turn) for turn in range(1, 4)]
+
+    # When
+    resumed = [
+        message
+        async for message in tail_agent_messages(
+            PROCESS_ID,
+            InMemoryAgentMessageStore(),
+            InMemoryEventStore(),
+            async_redis_client,
+            after=message_ids[0],
+        )
+    ]
+
+    # Then
+    assert [message.id for message in resumed] == message_ids[1:]
+
+
+@pytest.mark.asyncio
+async def test_stream_should_resume_from_the_store_once_the_redis_stream_expired(
+    redis_client, async_redis_client
+):
+    # Given
+    message_store = InMemoryAgentMessageStore()
+    streaming_store = StreamingAgentMessageStore(message_store, async_redis_client)
+    message_ids = [await append_turn(streaming_store, turn) for turn in range(1, 4)]
+    redis_client.delete(get_messages_stream(PROCESS_ID))
+
+    # When
+    resumed = [
+        message
+        async for message in tail_agent_messages(
+            PROCESS_ID,
+            message_store,
+            InMemoryEventStore(),
+            async_redis_client,
+            after=message_ids[0],
+        )
+    ]
+
+    # Then
+    assert [message.id for message in resumed] == message_ids[1:]
+
+
+@pytest.mark.asyncio
+async def test_stream_should_pick_up_stored_messages_that_were_not_published(
+    redis_client, async_redis_client
+):
+    # Given
+    message_store = InMemoryAgentMessageStore()
+    streaming_store = StreamingAgentMessageStore(message_store, async_redis_client)
+    event_store = InMemoryEventStore()
+    await event_store.append(
+        PROCESS_ID,
+        IssueResolutionStarted(process_id=PROCESS_ID, occurred_at=STARTED_AT),
+    )
+    first_id = await append_turn(streaming_store, 1)
+    messages = tail_agent_messages(
+        PROCESS_ID,
+        message_store,
+        event_store,
+        async_redis_client,
+        poll_interval_seconds=0.05,
+    )
+    replayed = await anext(messages)
+
+    # When
+    unpublished_id = await message_store.append(
+        PROCESS_ID,
+        VersionedAIModel(SupportedAnthropicModel.CLAUDE_SONNET_4_5, "20250929"),
+        2,
+        SystemMessage(subtype="turn", data={"turn": 2}),
+        "CLAUDE_CODE",
+    )
+    published_id = await append_turn(streaming_store, 3)
+    streamed = await anext(messages)
+    await event_store.append(
+        PROCESS_ID,
+        IssueResolutionCompleted(
+            pr_url="https://github.com/test/repo/pull/1",
+            pr_number=1,
+            process_id=PROCESS_ID,
+            occurred_at=STARTED_AT,
+        ),
+    )
+    rest = [message async for message in messages]
+
+    # Then
+    assert [message.id for message in [replayed, streamed, *rest]] == [
+        first_id,
+        published_id,
+        unpublished_id,
+    ]
@@ -2,6 +2,7 @@ import json
 
 import pytest
 from claude_agent_sdk import AssistantMessage, TextBlock
+from redis.asyncio import Redis as AsyncRedis
 from redis.client import PubSub
 
 from issue_solver.agents.agent_message_store import (
@@ -16,15 +17,18 @@ from issue_solver.models.supported_models import (
 )
 from issue_solver.streaming.streaming_agent_message_store import (
     StreamingAgentMessageStore,
+    get_messages_stream,
 )
 
 
 @pytest.mark.asyncio
-async def test_streaming_agent_message_store_should_append_and_publish(redis_client):
+async def test_streaming_agent_message_store_should_append_and_publish(
+    redis_client, async_redis_client
+):
     # Given
     agent_message_store = InMemoryAgentMessageStore()
     streaming_agent_message_store = StreamingAgentMessageStore(
-        message_store=agent_message_store, redis_client=redis_client
+        message_store=agent_message_store, redis_client=async_redis_client
     )
     subscriber = redis_client.pubsub()
     subscriber.subscribe("process:resolve-issue-123:messages")
@@ -72,6 +76,63 @@ async def test_streaming_agent_message_store_should_append_and_publish(redis_cli
     assert data["model"] == {"ai_model": "claude-sonnet-4-5", "version": "20250929"}
 
 
+@pytest.mark.asyncio
+async def test_streaming_agent_message_store_should_keep_a_capped_expiring_stream(
+    redis_client, async_redis_client
+):
+    # Given
+    streaming_agent_message_store = StreamingAgentMessageStore(
+        message_store=InMemoryAgentMessageStore(),
+        redis_client=async_redis_client,
+        max_stream_length=10,
+        stream_ttl_seconds=60,
+    )
+
+    # When
+    for turn in range(1, 301):
+        await streaming_agent_message_store.append(
+            process_id="resolve-issue-123",
+            model=VersionedAIModel(SupportedAnthropicModel.CLAUDE_SONNET_4_5),
+            turn=turn,
+            agent=SupportedAgent.CLAUDE_CODE,
+            message=AssistantMessage(
+                content=[TextBlock(text=f"Turn {turn}")],
+                model="claude-sonnet-4-5-20250929",
+            ),
+        )
+
+    # Then
+    stream = get_messages_stream("resolve-issue-123")
+    assert redis_client.xlen(stream) < 300
+    assert 0 < redis_client.ttl(stream) <= 60
+
+
+@pytest.mark.asyncio
+async def test_streaming_agent_message_store_should_store_messages_when_redis_is_down():
+    # Given
+    agent_message_store = InMemoryAgentMessageStore()
+    unreachable_redis_client = AsyncRedis(host="127.0.0.1", port=1)
+    streaming_agent_message_store = StreamingAgentMessageStore(
+        message_store=agent_message_store, redis_client=unreachable_redis_client
+    )
+
+    # When
+    message_id = await streaming_agent_message_store.append(
+        process_id="resolve-issue-123",
+        model=VersionedAIModel(SupportedAnthropicModel.CLAUDE_SONNET_4_5),
+        turn=1,
+        agent=SupportedAgent.CLAUDE_CODE,
+        message=AssistantMessage(
+            content=[TextBlock(text="Redis is down.")],
+            model="claude-sonnet-4-5-20250929",
+        ),
+    )
+
+    # Then
+    process_messages = await agent_message_store.get(process_id="resolve-issue-123")
+    assert [message.id for message in process_messages] == [message_id]
+
+
 def get_first_published_message(subscriber: PubSub) -> dict | None:
     published_message = subscriber.get_message(timeout=1)
     while published_message:
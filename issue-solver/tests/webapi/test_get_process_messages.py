@@ -169,3 +169,31 @@ async def first_system_message():
         "apiKeySource": "ANTHROPIC_API_KEY",
         "permissionMode": "bypassPermissions",
     }
+
+
+@pytest.mark.asyncio
+async def test_get_process_messages_should_page_after_a_message(
+    agent_message_store: AgentMessageStore, api_client
+):
+    # Given
+    process_id = "process-4"
+    message_ids = [
+        await agent_message_store.append(
+            process_id=process_id,
+            model=VersionedAIModel(SupportedAnthropicModel.CLAUDE_SONNET_4_5),
+            turn=turn,
+            message=SystemMessage(data={"turn": turn}, subtype="turn"),
+            agent="CLAUDE_CODE",
+        )
+        for turn in range(1, 6)
+    ]
+
+    # When
+    response = api_client.get(
+        f"/processes/{process_id}/messages",
+        params={"after": message_ids[1], "limit": 2},
+    )
+
+    # Then
+    assert response.status_code == 200, response.text
+    assert [message["id"] for message in response.json()] == message_ids[2:4]
@@ -1,5 +1,7 @@
 from datetime import datetime, timedelta
 
+import pytest
+
 from issue_solver.events.domain import (
     CodeRepositoryConnected,
     CodeRepositoryTokenRotated,
@@ -17,6 +19,7 @@ from issue_solver.events.domain import (
     DocumentationGenerationCompleted,
     DocumentationGenerationFailed,
 )
+from issue_solver.events.event_store import InMemoryEventStore, StreamFilter
 from issue_solver.issues.issue import IssueInfo
 from issue_solver.webapi.routers import processes as processes_router
 from issue_solver.webapi.routers.processes import ProcessTimelineView
@@ -434,29 +437,17 @@ def test_doc_generation_process_should_report_failed_status():
     assert process_timeline_view.run_id == run_id
 
 
-def test_apply_filters_should_filter_by_run_id():
-    processes = [
-        ProcessTimelineView(
-            id="doc-run-1",
-            type="docs_generation",
-            status="completed",
-            run_id="run-123",
-            events=[],
-        ),
-        ProcessTimelineView(
-            id="doc-run-2",
-            type="docs_generation",
-            status="completed",
-            run_id="run-456",
-            events=[],
-        ),
-    ]
-
-    filtered = processes_router._apply_filters(
-        processes, "docs_generation", None, "run-123"
+@pytest.mark.asyncio
+async def test_stream_filters_should_filter_by_run_id():
+    # When
+    filters = await processes_router._stream_filters(
+        InMemoryEventStore(), None, None, "docs_generation", "run-123"
     )
 
-    assert [p.id for p in filtered] == ["doc-run-1"]
+    # Then
+    assert filters == [
+        StreamFilter(DocumentationGenerationRequested, {"run_id": "run-123"})
+    ]
 
 
 def test_status_should_remain_connected_after_token_rotation():
@@ -620,6 +620,45 @@ def test_returns_processes_with_both_limit_and_offset(api_client, time_under_con
     assert data["offset"] == 8
 
 
+def test_returns_processes_page_after_cursor(api_client, time_under_control):
+    # Given
+    for i in range(5):
+        time_under_control.set_from_iso_format(f"2021-01-01T00:00:0{i}")
+        api_client.post(
+            "/repositories/",
+            json={
+                "url": f"https://github.com/test/repo{i}",
+                "access_token": "test-access-token",
+                "user_id": "test-user-id",
+                "space_id": "test-space-id",
+            },
+        )
+
+    # When
+    first_page = api_client.get("/processes?space_id=test-space-id&limit=3").json()
+    second_page = api_client.get(
+        f"/processes?space_id=test-space-id&limit=3&cursor={first_page['nextCursor']}"
+    ).json()
+
+    # Then
+    assert first_page["total"] == 5
+    assert second_page["total"] == 5
+    assert second_page["nextCursor"] is None
+    urls = [
+        process["events"][0]["url"]
+        for process in first_page["processes"] + second_page["processes"]
+    ]
+    assert urls == [f"https://github.com/test/repo{i}" for i in reversed(range(5))]
+
+
+def test_rejects_invalid_cursor(api_client):
+    # When
+    response = api_client.get("/processes?cursor=not-a-cursor")
+
+    # Then
+    assert response.status_code == 400
+
+
 def test_handles_non_existent_knowledge_base_id_gracefully(
     api_client, time_under_control
 ):
@@ -64,6 +64,77 @@ def test_agent_messages_webhook_should_publish_message_to_redis_channel(
     assert data["payload"] == agent_message_payload
 
 
+def test_webhook_events_batch_should_publish_every_event(
+    api_client, sqs_client, sqs_queue
+):
+    # Given
+    events = [event for _, event in examples_of_all_events()[:3]]
+
+    # When
+    response = api_client.post(
+        "/webhooks/events:batch",
+        json=[serialize(event).model_dump(mode="json") for event in events],
+    )
+
+    # Then
+    assert response.status_code == 200
+    assert response.json() == [
+        {"index": index, "status": "published", "error": None}
+        for index in range(len(events))
+    ]
+    published_events = []
+    while len(published_events) < len(events):
+        messages = receive_event_message(sqs_client, sqs_queue)
+        assert "Messages" in messages
+        body = messages["Messages"][0]["Body"]
+        published_events.append(deserialize(json.loads(body)["type"], body))
+    assert all(event in published_events for event in events)
+
+
+def test_agent_messages_batch_webhook_should_publish_messages_in_order(
+    redis_client, api_client
+):
+    # Given
+    subscriber = redis_client.pubsub()
+    subscriber.subscribe("process:test-process-id:messages")
+
+    # When
+    response = api_client.post(
+        "/webhooks/messages:batch",
+        json=[
+            {
+                "process_id": process_id,
+                "agentMessage": {
+                    "id": f"message-id-{turn}",
+                    "payload": {"turn": turn},
+                    "model": {"ai_model": "claude-opus-4", "version": "20250514"},
+                    "turn": turn,
+                    "agent": "claude-code",
+                    "type": "SystemMessage",
+                },
+            }
+            for process_id, turn in [
+                ("test-process-id", 1),
+                ("other-process-id", 1),
+                ("test-process-id", 2),
+            ]
+        ],
+    )
+
+    # Then
+    assert response.status_code == 200
+    assert response.json() == [
+        {"index": index, "status": "published", "error": None} for index in range(3)
+    ]
+    published_ids = [
+        json.loads(get_first_published_message(subscriber)["data"])["id"]
+        for _ in range(2)
+    ]
+    assert published_ids == ["message-id-1", "message-id-2"]
+    assert redis_client.xlen("process:test-process-id:messages:stream") == 2
+    assert redis_client.xlen("process:other-process-id:messages:stream") == 1
+
+
 def get_first_published_message(subscriber: PubSub) -> dict | None:
     published_message = subscriber.get_message(timeout=1)
     while published_message:
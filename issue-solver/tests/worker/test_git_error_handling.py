@@ -120,6 +120,7 @@ async def test_index_new_changes_codebase_git_validation_error():
         ),
     ]
     mock_event_store.get.return_value = mock_events
+    mock_event_store.get_snapshot.return_value = None
 
     # Mock a GitValidationError when pulling the repository
     mock_pull = MagicMock(
@@ -213,6 +214,7 @@ async def test_index_new_changes_codebase_clone_git_validation_error():
         ),
     ]
     mock_event_store.get.return_value = mock_events
+    mock_event_store.get_snapshot.return_value = None
 
     # Mock a GitValidationError when cloning the repository
     mock_clone = MagicMock(
@@ -1,3 +1,5 @@
+from dataclasses import replace
+from datetime import datetime
 from pathlib import Path
 from typing import Any, Callable, cast
 from unittest.mock import AsyncMock, Mock, patch
@@ -12,6 +14,7 @@ from morphcloud.api import (
 )
 
 from issue_solver.events.domain import RepositoryIndexationRequested
+from issue_solver.events.event_store import InMemoryEventStore
 from issue_solver.cli.index_repository_command import IndexRepositoryCommandSettings
 from issue_solver.git_operations.git_helper import CodeVersion, GitDiffFiles
 from issue_solver.worker.dependencies import Dependencies
@@ -187,6 +190,64 @@ async def test_small_delta_runs_locally_even_with_microvm_available(
     repository_indexer.apply_delta.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_delta_is_not_recorded_when_another_worker_indexed_meanwhile(
+    event_store: InMemoryEventStore,
+    git_helper: Mock,
+    time_under_control,
+    worker_dependencies_with_microvm: Dependencies,
+    repository_indexer: Mock,
+):
+    # Given
+    process_id = BriceDeNice.first_repo_integration_process_id()
+    repo_connected = BriceDeNice.got_his_first_repo_connected()
+    repo_indexed = BriceDeNice.got_his_first_repo_indexed()
+    await event_store.append(process_id, repo_connected)
+    await event_store.append(process_id, repo_indexed)
+    concurrently_indexed = replace(
+        repo_indexed,
+        commit_sha="newer-head-sha",
+        occurred_at=datetime.fromisoformat("2025-01-02T12:00:00Z"),
+    )
+
+    def index_while_another_worker_records_its_delta(**kwargs: Any) -> dict:
+        event_store.events_by_process_id[process_id].append(concurrently_indexed)
+        return {"ok": 1}
+
+    repository_indexer.apply_delta.side_effect = (
+        index_while_another_worker_records_its_delta
+    )
+    git_helper.clone_repository.return_value = CodeVersion(
+        branch="main", commit_sha="new-head-sha"
+    )
+    git_helper.pull_repository.return_value = CodeVersion(
+        branch="main", commit_sha="new-head-sha"
+    )
+    git_helper.get_changed_files_commit.return_value = GitDiffFiles(
+        repo_path=Path(f"/tmp/repo/{process_id}"),
+        added_files=[Path("src/new.py")],
+        deleted_files=[],
+        modified_files=[],
+        renamed_files=[],
+    )
+    message = RepositoryIndexationRequested(
+        knowledge_base_id=repo_connected.knowledge_base_id,
+        user_id=repo_connected.user_id,
+        process_id=process_id,
+        occurred_at=time_under_control.now(),
+    )
+
+    # When
+    await process_event_message(message, worker_dependencies_with_microvm)
+
+    # Then
+    assert await event_store.get(process_id) == [
+        repo_connected,
+        repo_indexed,
+        concurrently_indexed,
+    ]
+
+
 @pytest.mark.asyncio
 async def test_large_delta_stays_local_when_microvm_unavailable(
     event_store, git_helper: Mock, time_under_control, repository_indexer
@@ -89,3 +89,45 @@ resource "aws_lambda_permission" "allow_events_indexing_timeout_recovery" {
   principal     = "events.amazonaws.com"
   source_arn    = aws_cloudwatch_event_rule.indexing_timeout_recovery.arn
 }
+
+# Scheduled relay of the outbox messages appends could not send
+resource "aws_cloudwatch_event_rule" "events_outbox_relay" {
+  name                = "events-outbox-relay${local.environment_name_suffix}"
+  schedule_expression = "rate(1 minute)"
+}
+
+resource "aws_cloudwatch_event_target" "events_outbox_relay" {
+  rule      = aws_cloudwatch_event_rule.events_outbox_relay.name
+  target_id = "worker-outbox-relay"
+  arn       = aws_lambda_function.worker.arn
+  input     = jsonencode({ source = "scheduled.events.outbox-relay" })
+}
+
+resource "aws_lambda_permission" "allow_events_outbox_relay" {
+  statement_id  = "AllowExecutionFromEventBridgeOutboxRelay"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.worker.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.events_outbox_relay.arn
+}
+
+# Scheduled creation of the upcoming monthly events store partitions
+resource "aws_cloudwatch_event_rule" "events_store_partitions" {
+  name                = "events-store-partitions${local.environment_name_suffix}"
+  schedule_expression = "rate(1 day)"
+}
+
+resource "aws_cloudwatch_event_target" "events_store_partitions" {
+  rule      = aws_cloudwatch_event_rule.events_store_partitions.name
+  target_id = "worker-events-store-partitions"
+  arn       = aws_lambda_function.worker.arn
+  input     = jsonencode({ source = "scheduled.events.partitions" })
+}
+
+resource "aws_lambda_permission" "allow_events_store_partitions" {
+  statement_id  = "AllowExecutionFromEventBridgeEventsStorePartitions"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.worker.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.events_store_partitions.arn
+}